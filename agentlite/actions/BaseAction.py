@@ -1,5 +1,8 @@
+import asyncio
 from inspect import signature
 
+from agentlite.commons.CircuitBreaker import CircuitBreaker
+
 
 class BaseAction:
     """
@@ -10,8 +13,29 @@ class BaseAction:
     - action_desc
     - params_doc
     Agent will use these three property to understand how to use this action.
+
+    Set parallel_safe to True for the actions which may run in several threads at once,
+    e.g. stateless lookups. An agent with multi_call runs the calls of such actions
+    concurrently when the llm emits several of them in one step.
+
+    The agent guards the calls with the following attributes, see BaseAgent.forward:
+    - timeout: seconds before a call is abandoned and a timeout observation is returned, None for no limit
+    - max_retries: the calls repeated after a timeout or a retry_on exception. Only retry idempotent actions.
+    - retry_on: the transient exceptions, e.g. connection errors, which are retried and
+      count as failures of the circuit breaker. Other exceptions are returned as the
+      observation at once.
+    - failure_threshold: the consecutive failures opening the circuit breaker of the action,
+      None for no breaker. While open, calls return at once, see CircuitBreaker.
+    - reset_timeout: seconds before an open circuit lets a trial call through
     """
 
+    parallel_safe = False
+    timeout: float = None
+    max_retries: int = 0
+    retry_on: tuple = (ConnectionError,)
+    failure_threshold: int = None
+    reset_timeout: float = 30.0
+
     def __init__(
         self,
         action_name: str,
@@ -29,6 +53,9 @@ class BaseAction:
         self.action_name = action_name
         self.action_desc = action_desc
         self.params_doc = params_doc
+        self.circuit_breaker = None
+        if self.failure_threshold:
+            self.circuit_breaker = CircuitBreaker(self.failure_threshold, self.reset_timeout)
 
     def __call__(self, **kwargs) -> str:
         """
@@ -36,5 +63,13 @@ class BaseAction:
         """
         raise NotImplementedError
 
+    async def __acall__(self, **kwargs) -> str:
+        """
+        the awaitable version of __call__. By default the blocking __call__
+        is executed in a worker thread so that the event loop is not blocked.
+        Override it for actions with a native asyncio implementation.
+        """
+        return await asyncio.to_thread(self.__call__, **kwargs)
+
     def __get_kwargs__(self):
         return signature(self.__call__)
@@ -0,0 +1,153 @@
+import copy
+import functools
+import hashlib
+import json
+from typing import Any, Callable
+
+from agentlite.actions.BaseAction import BaseAction
+from agentlite.commons.CacheStore import (
+    CACHE_MISS,
+    CacheStats,
+    LRUCacheStore,
+    SQLiteCacheStore,
+)
+
+
+def cache_key(name: str, args: tuple = (), kwargs: dict = None) -> str:
+    """the key of a call, the sha256 of its name and arguments. Keyword arguments are
+    sorted, so the key does not depend on the order the llm wrote them in."""
+    payload = json.dumps([name, list(args), kwargs or {}], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def build_cache_store(max_size: int = 1024, ttl: float = None, cache_path: str = None):
+    """a SQLiteCacheStore at cache_path if given, otherwise an LRUCacheStore"""
+    if cache_path:
+        return SQLiteCacheStore(cache_path, table="action_cache", ttl=ttl)
+    return LRUCacheStore(max_size=max_size, ttl=ttl)
+
+
+def cached_call(
+    max_size: int = 1024,
+    ttl: float = None,
+    cache_path: str = None,
+    method: bool = False,
+    cache_if: Callable[[Any], bool] = None,
+):
+    """decorator caching the results of an idempotent function, e.g. a tool lookup.
+    The store and the hit/miss counters are exposed as the cache_store and cache_stats
+    attributes of the decorated function. Calls raising an exception are not cached.
+    Results are copied in and out of the cache, so a caller mutating a result, e.g. a
+    returned dict, does not change the cached one.
+
+    :param max_size: the maximum number of in-memory entries, defaults to 1024
+    :type max_size: int, optional
+    :param ttl: seconds before an entry expires, defaults to None (never)
+    :type ttl: float, optional
+    :param cache_path: a SQLite file to persist the results in, defaults to None (in-memory).
+        Persisted results must be JSON serializable.
+    :type cache_path: str, optional
+    :param method: the function is a method, its first argument (self) is not part of the key, defaults to False
+    :type method: bool, optional
+    :param cache_if: only results for which it returns True are cached, defaults to None (all)
+    :type cache_if: Callable[[Any], bool], optional
+    """
+
+    def decorator(func):
+        store = build_cache_store(max_size, ttl, cache_path)
+        stats = CacheStats()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = cache_key(func.__qualname__, args[1:] if method else args, kwargs)
+            result = store.get(key)
+            if result is not CACHE_MISS:
+                stats.hit(result)
+                return copy.deepcopy(result)
+            stats.miss()
+            result = func(*args, **kwargs)
+            if cache_if is None or cache_if(result):
+                store.set(key, copy.deepcopy(result))
+            return result
+
+        wrapper.cache_store = store
+        wrapper.cache_stats = stats
+        return wrapper
+
+    return decorator
+
+
+def cacheable_action(
+    max_size: int = 1024,
+    ttl: float = None,
+    cache_path: str = None,
+    cache_if: Callable[[Any], bool] = None,
+):
+    """class decorator caching the observations of an idempotent BaseAction, e.g. a search
+    or a lookup API. The cache is keyed by the action name and the call arguments and is
+    shared by the instances of the class. Both __call__ and __acall__ go through it, so
+    an async agent hits the same entries. The store and the counters are the cache_store
+    and cache_stats class attributes. Like cached_call, the observations are copied in and
+    out of the cache.
+
+    Example::
+
+        @cacheable_action(max_size=4096, ttl=24 * 3600)
+        class WikipediaSearch(BaseAction):
+            ...
+
+    :param max_size: the maximum number of in-memory entries, defaults to 1024
+    :type max_size: int, optional
+    :param ttl: seconds before an entry expires, defaults to None (never)
+    :type ttl: float, optional
+    :param cache_path: a SQLite file to persist the observations in, defaults to None (in-memory)
+    :type cache_path: str, optional
+    :param cache_if: only observations for which it returns True are cached, defaults to None (all)
+    :type cache_if: Callable[[Any], bool], optional
+    """
+
+    def decorator(cls):
+        store = build_cache_store(max_size, ttl, cache_path)
+        stats = CacheStats()
+        call = cls.__call__
+        acall = cls.__acall__
+
+        def lookup(action, kwargs: dict):
+            key = cache_key(action.action_name, kwargs=kwargs)
+            result = store.get(key)
+            if result is CACHE_MISS:
+                stats.miss()
+                return key, result
+            stats.hit(result)
+            return key, copy.deepcopy(result)
+
+        def save(key: str, result: Any):
+            if cache_if is None or cache_if(result):
+                store.set(key, copy.deepcopy(result))
+
+        @functools.wraps(call)
+        def __call__(self, **kwargs):
+            key, result = lookup(self, kwargs)
+            if result is CACHE_MISS:
+                result = call(self, **kwargs)
+                save(key, result)
+            return result
+
+        @functools.wraps(acall)
+        async def __acall__(self, **kwargs):
+            key, result = lookup(self, kwargs)
+            if result is CACHE_MISS:
+                result = await acall(self, **kwargs)
+                save(key, result)
+            return result
+
+        cls.__call__ = __call__
+        if acall is not BaseAction.__acall__:
+            # the default __acall__ already runs the cached __call__ in a thread
+            cls.__acall__ = __acall__
+        cls.cache_store = store
+        cls.cache_stats = stats
+        return cls
+
+    return decorator
+
@@ -21,6 +21,10 @@ class ThinkAction(BaseAction):
     def __call__(self, **kwargs):
         return DEF_INNER_ACT_OBS
 
+    async def __acall__(self, **kwargs):
+        # inner actions are cheap, no need for a worker thread
+        return self.__call__(**kwargs)
+
 
 class FinishAction(BaseAction):
     def __init__(self) -> None:
@@ -38,6 +42,9 @@ class FinishAction(BaseAction):
     def __call__(self, response):
         return response
 
+    async def __acall__(self, **kwargs):
+        return self.__call__(**kwargs)
+
 
 class PlanAction(BaseAction):
     def __init__(self) -> None:
@@ -54,3 +61,7 @@ class PlanAction(BaseAction):
 
     def __call__(self, **kwargs):
         return DEF_INNER_ACT_OBS
+
+    async def __acall__(self, **kwargs):
+        # inner actions are cheap, no need for a worker thread
+        return self.__call__(**kwargs)
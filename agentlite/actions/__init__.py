@@ -1,4 +1,5 @@
 from .BaseAction import BaseAction
+from .CachedAction import cacheable_action, cached_call
 from .InnerActions import FinishAction, PlanAction, ThinkAction
 
 ThinkAct = ThinkAction()
@@ -1,23 +1,53 @@
-from typing import List
+from collections import OrderedDict
+from typing import Callable, List
 
 from agentlite.actions.BaseAction import BaseAction
+from agentlite.agent_prompts.ContextManager import ContextManager
 from agentlite.agent_prompts.prompt_utils import (
     DEFAULT_PROMPT,
     PROMPT_TOKENS,
+    act_obs_format,
     action_chain_format,
     format_act_params_example,
     format_agent_call_example,
     task_chain_format,
 )
 from agentlite.commons import AgentAct, TaskPackage
+from agentlite.memory.AgentLTMemory import AgentLTMemory
 
 
 class PromptGen:
     """Prompt Generator Class"""
 
+    MAX_CACHED_SELECTIONS = 256
+
     def __init__(self) -> None:
         self.prompt_type = "BasePrompt"
         self.examples: dict[str, list] = {}
+        self.example_keys: dict[str, list] = {}  # the task instruction of every example
+        self.examples_version = 0  # bumped on every add_example, invalidates cached prompts
+        self.example_memory: AgentLTMemory = None
+        self.example_top_k: int = None
+        self.example_selections: OrderedDict[tuple, List[int]] = OrderedDict()
+
+    def set_example_retrieval(self, top_k: int = 3, embedder=None):
+        """put only the top_k examples most similar to the task into the prompt,
+        instead of all of them. The examples are indexed by their task instruction.
+
+        :param top_k: the number of examples per prompt, defaults to 3. None puts all the examples
+        :type top_k: int, optional
+        :param embedder: the text embedder, defaults to the HashingEmbedder of AgentLTMemory
+        :type embedder: Callable[[List[str]], np.ndarray], optional
+        """
+        self.example_top_k = top_k
+        self.example_selections.clear()
+        if top_k is None:
+            self.example_memory = None
+            return
+        self.example_memory = AgentLTMemory(embedder=embedder)
+        for example_type, keys in self.example_keys.items():
+            for idx, key in enumerate(keys):
+                self.example_memory.add(key, idx, memory_type=example_type)
 
     def add_example(
         self,
@@ -28,8 +58,36 @@ class PromptGen:
         example_context = task_chain_format(task, action_chain)
         if example_type in self.examples:
             self.examples[example_type].append(example_context)
+            self.example_keys[example_type].append(task.instruction)
         else:
             self.examples[example_type] = [example_context]
+            self.example_keys[example_type] = [task.instruction]
+        if self.example_memory is not None:
+            self.example_memory.add(
+                task.instruction,
+                len(self.examples[example_type]) - 1,
+                memory_type=example_type,
+            )
+        self.examples_version += 1
+
+    def __select_examples__(self, task: TaskPackage, example_type: str) -> List[int]:
+        """the indices of the examples retrieved for task, None if all the examples are used.
+        The selection is cached, it is computed once per task and not at every step."""
+        if self.example_memory is None or example_type not in self.examples:
+            return None
+        key = (task.task_id, task.instruction, example_type, self.examples_version)
+        indices = self.example_selections.get(key)
+        if indices is None:
+            indices = [
+                idx
+                for idx, _ in self.example_memory.search(
+                    task.instruction, self.example_top_k, memory_type=example_type
+                )
+            ]
+            self.example_selections[key] = indices
+            if len(self.example_selections) > self.MAX_CACHED_SELECTIONS:
+                self.example_selections.popitem(last=False)
+        return indices
 
     def __get_example__(self, example_type: str, index: int = -1):
         if example_type in self.examples:
@@ -53,25 +111,46 @@ class PromptGen:
 class BasePromptGen(PromptGen):
     """
     this is the BasePrompt for agent to use.
+    The static prefix of the action prompt (instruction, role, constraint and action doc)
+    is computed once per action set, the examples part once per example selection, and the
+    execution history of each task is extended with the newest Action/Observation pairs only.
     """
 
+    MAX_CACHED_PREFIXES = 8
+    MAX_CACHED_EXAMPLES = 256
+    MAX_CACHED_HISTORIES = 256
+
     def __init__(
         self,
         agent_role: str = None,
         constraint: str = DEFAULT_PROMPT["constraint"],
         instruction: str = DEFAULT_PROMPT["agent_instruction"],
+        max_cached_prefixes: int = None,
     ):
         """Prompt Generator for Base Agent
         :param agent_role: the role of this agent, defaults to None
         :type agent_role: str, optional
         :param constraint: the constraint of this agent, defaults to None
         :type constraint: str, optional
+        :param max_cached_prefixes: the number of static prefixes kept, e.g. one per action set, defaults to MAX_CACHED_PREFIXES
+        :type max_cached_prefixes: int, optional
         """
         super().__init__()
         self.prompt_type = "BaseAgentPrompt"
         self.agent_role = agent_role
         self.constraint = constraint
         self.instruction = instruction
+        self.max_cached_prefixes = max_cached_prefixes or self.MAX_CACHED_PREFIXES
+        self.prefix_cache: OrderedDict[tuple, str] = OrderedDict()
+        self.examples_cache: OrderedDict[tuple, str] = OrderedDict()
+        # task_id -> [chain id, formatted pairs, instruction, history]
+        self.history_cache: OrderedDict[str, list] = OrderedDict()
+
+    def reset_cache(self):
+        """drop the cached prompt pieces, e.g. after modifying an action doc in place"""
+        self.prefix_cache.clear()
+        self.examples_cache.clear()
+        self.history_cache.clear()
 
     def __get_role_ins__(self):
         """use as the start of every action prompt. Highlight the role of this agent"""
@@ -122,6 +201,8 @@ class BasePromptGen(PromptGen):
         action_chain: List[tuple[AgentAct, str]],
         example_type: str = "action",
         example: str = None,
+        context_manager: ContextManager = None,
+        multi_call: bool = False,
         **kwargs,
     ) -> str:
         """return the action generation prompt for agent
@@ -137,35 +218,154 @@ class BasePromptGen(PromptGen):
         :type example_type: str, optional
         :param example: the example string, defaults to None
         :type example: str, optional
+        :param context_manager: keeps the prompt within the context window, defaults to None
+        :type context_manager: ContextManager, optional
+        :param multi_call: whether to tell the agent it can take several actions in one step, defaults to False
+        :type multi_call: bool, optional
         :return: the prompt for agent to take action
         :rtype: str
         """
+        example_indices = None if example else self.__select_examples__(task, example_type)
+        prefix = self.__cached__(
+            self.prefix_cache,
+            self.__prefix_key__(actions, multi_call),
+            lambda: self.__static_prefix__(actions, multi_call),
+            self.max_cached_prefixes,
+        )
+        prefix += self.__cached__(
+            self.examples_cache,
+            self.__examples_key__(actions, example_type, example, example_indices),
+            lambda: self.__examples_prompt__(
+                example_type,
+                example,
+                example_indices,
+                lambda: format_act_params_example(actions),
+            ),
+            self.MAX_CACHED_EXAMPLES,
+        )
+        return prefix + self.__session_prompt__(
+            task, action_chain, prefix, context_manager
+        )
+
+    def __static_prefix__(self, actions: List[BaseAction], multi_call: bool = False) -> str:
+        """the part of the action prompt which is the same for all the tasks and steps"""
         # adding roles into prompt
         prompt = f"""{self.instruction}\n{self.__role_prompt__(self.agent_role)}\n"""
         # adding constraint into prompt
         prompt += f"""{self.__constraint_prompt__()}\n"""
+        if multi_call:
+            prompt += f"""{DEFAULT_PROMPT["multi_action"]}\n"""
         # adding action doc into prompt
         prompt += (
             f"""{self.__act_doc_prompt__(actions=actions, params_doc_flag=True)}\n"""
         )
-        act_call_example = format_act_params_example(actions)
+        return prompt
+
+    def __examples_prompt__(
+        self,
+        example_type: str,
+        example: str,
+        example_indices: List[int] = None,
+        format_example: Callable[[], str] = None,
+    ) -> str:
+        """the examples part of the action prompt, the format example if there is no example"""
         # get task example
         if example:  # get from input
             prompt_example = example
         else:  # get from self.examples
-            prompt_example = self.__get_examples__(example_type)
+            prompt_example = self.__get_examples__(example_type, example_indices)
 
         if prompt_example:  # if have example, put into prompt
-            prompt += self.__prompt_example__(prompt_example)
-        else:  # no example provided, only add the format example
-            # adding format example
-            prompt += self.__act_format_example__(act_call_example)
-        # adding action observation chain
-        cur_session = task_chain_format(task, action_chain)
-        prompt += f"""{PROMPT_TOKENS["execution"]['begin']}\n{cur_session}\n"""
-        # adding inference token
-        prompt += """Action:"""
-        return prompt
+            return self.__prompt_example__(prompt_example)
+        # no example provided, only add the format example
+        return self.__act_format_example__(format_example())
+
+    def __prefix_key__(self, actions: List[BaseAction], *extra) -> tuple:
+        """the cache key of the static prefix. Actions are keyed by identity."""
+        return (
+            tuple(id(act) for act in actions),
+            self.instruction,
+            self.agent_role,
+            self.constraint,
+        ) + extra
+
+    def __examples_key__(
+        self,
+        actions: List[BaseAction],
+        example_type: str,
+        example: str,
+        example_indices: List[int] = None,
+        *extra,
+    ) -> tuple:
+        """the cache key of the examples part. The actions make the format example."""
+        return (
+            tuple(id(act) for act in actions),
+            example_type,
+            example,
+            self.examples_version,
+            len(self.examples.get(example_type, [])),
+            example_indices and tuple(example_indices),
+        ) + extra
+
+    def __cached__(
+        self, cache: OrderedDict, key: tuple, build: Callable[[], str], max_size: int
+    ) -> str:
+        value = cache.get(key)
+        if value is None:
+            value = build()
+            cache[key] = value
+            if len(cache) > max_size:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        return value
+
+    def __history__(
+        self, task: TaskPackage, action_chain: List[tuple[AgentAct, str]]
+    ) -> str:
+        """the formatted action chain of a task. Only the pairs appended since
+        the last call are formatted if the same chain object is passed again.
+        The cache keeps the id of the chain, not the chain itself."""
+        entry = self.history_cache.get(task.task_id)
+        if (
+            entry is None
+            or entry[0] != id(action_chain)
+            or entry[1] > len(action_chain)
+            or entry[2] != task.instruction
+        ):
+            entry = [id(action_chain), 0, task.instruction, ""]
+            self.history_cache[task.task_id] = entry
+            if len(self.history_cache) > self.MAX_CACHED_HISTORIES:
+                self.history_cache.popitem(last=False)
+        else:
+            self.history_cache.move_to_end(task.task_id)
+        if entry[1] < len(action_chain):
+            entry[3] += "".join(
+                act_obs_format(act, obs) for act, obs in action_chain[entry[1] :]
+            )
+            entry[1] = len(action_chain)
+        return entry[3]
+
+    def __session_prompt__(
+        self,
+        task: TaskPackage,
+        action_chain: List[tuple[AgentAct, str]],
+        prefix: str = "",
+        context_manager: ContextManager = None,
+    ) -> str:
+        """the execution part of the action prompt, ending with the inference token.
+        With a context manager, the action chain is shortened to fit the context window."""
+        head = f"""{PROMPT_TOKENS["execution"]['begin']}\nTask:{task.instruction}\n"""
+        if context_manager is not None:
+            prompt_tokens = context_manager.count(prefix) + context_manager.count(
+                head + "\nAction:"
+            )
+            fitted_chain = context_manager.fit(prompt_tokens, action_chain)
+            if fitted_chain is not action_chain:
+                # the shortened chain is rebuilt at every step, bypass the history cache
+                return f"""{head}{action_chain_format(fitted_chain)}\nAction:"""
+        history = self.__history__(task, action_chain)
+        return f"""{head}{history}\nAction:"""
 
 
 class ManagerPromptGen(BasePromptGen):
@@ -174,6 +374,7 @@ class ManagerPromptGen(BasePromptGen):
         agent_role: str = None,
         constraint: str = DEFAULT_PROMPT["constraint"],
         instruction: str = DEFAULT_PROMPT["manager_instruction"],
+        max_cached_prefixes: int = None,
     ):
         """Prompt Generator for Manager Agent
 
@@ -181,8 +382,15 @@ class ManagerPromptGen(BasePromptGen):
         :type agent_role: str, optional
         :param constraint: the constraint of this agent, defaults to None
         :type constraint: str, optional
+        :param max_cached_prefixes: the number of static prefixes kept, defaults to MAX_CACHED_PREFIXES
+        :type max_cached_prefixes: int, optional
         """
-        super().__init__(agent_role, constraint=constraint, instruction=instruction)
+        super().__init__(
+            agent_role,
+            constraint=constraint,
+            instruction=instruction,
+            max_cached_prefixes=max_cached_prefixes,
+        )
         self.prompt_type = "ManagerPromptGen"
 
     def __team_prompt__(self, labor_agents_doc) -> str:
@@ -197,6 +405,8 @@ class ManagerPromptGen(BasePromptGen):
         labor_agents_doc: dict[str, str] = None,
         example_type: str = "action",
         example: str = None,
+        multi_call: bool = False,
+        context_manager: ContextManager = None,
         **kwargs,
     ) -> str:
         """
@@ -214,38 +424,57 @@ class ManagerPromptGen(BasePromptGen):
         :type example_type: str, optional
         :param example: the example string, defaults to None
         :type example: str, optional
+        :param multi_call: whether to tell the manager it can call several agents in one step, defaults to False
+        :type multi_call: bool, optional
+        :param context_manager: keeps the prompt within the context window, defaults to None
+        :type context_manager: ContextManager, optional
         :return: the prompt for agent to take action
         :rtype: str
         """
 
+        example_indices = None if example else self.__select_examples__(task, example_type)
+        labor_agents_key = tuple((labor_agents_doc or {}).items())
+        prefix = self.__cached__(
+            self.prefix_cache,
+            self.__prefix_key__(actions, labor_agents_key, multi_call),
+            lambda: self.__manager_static_prefix__(actions, labor_agents_doc, multi_call),
+            self.max_cached_prefixes,
+        )
+        prefix += self.__cached__(
+            self.examples_cache,
+            self.__examples_key__(
+                actions, example_type, example, example_indices, labor_agents_key
+            ),
+            lambda: self.__examples_prompt__(
+                example_type,
+                example,
+                example_indices,
+                lambda: format_agent_call_example(labor_agents_doc)
+                + format_act_params_example(actions),
+            ),
+            self.MAX_CACHED_EXAMPLES,
+        )
+        return prefix + self.__session_prompt__(
+            task, action_chain, prefix, context_manager
+        )
+
+    def __manager_static_prefix__(
+        self,
+        actions: List[BaseAction],
+        labor_agents_doc: dict[str, str],
+        multi_call: bool,
+    ) -> str:
+        """the part of the manager action prompt which is the same for all the tasks and steps"""
         # adding roles into prompt
         prompt = f"""{self.instruction}\n{self.__role_prompt__(self.agent_role)}\n"""
         # adding constraint into prompt
         prompt += f"""{self.__constraint_prompt__()}\n"""
         # adding team agent into prompt
         prompt += f"""{self.__team_prompt__(labor_agents_doc)}\n"""
-        agent_call_example = format_agent_call_example(labor_agents_doc)
+        if multi_call:
+            prompt += f"""{DEFAULT_PROMPT["multi_call"]}\n"""
         # adding action doc into prompt
         prompt += (
             f"""{self.__act_doc_prompt__(actions=actions, params_doc_flag=True)}\n"""
         )
-        act_call_example = format_act_params_example(actions)
-
-        # get task example
-        if example:  # get from input
-            prompt_example = example
-        else:  # get from self.examples
-            prompt_example = self.__get_examples__(example_type)
-
-        if prompt_example:  # if have example, put into prompt
-            prompt += self.__prompt_example__(prompt_example)
-        else:  # no example provided, only add the format example
-            # adding format example
-            format_example = f"""{agent_call_example}{act_call_example}"""
-            prompt += self.__act_format_example__(format_example)
-        # adding action observation chain
-        cur_session = task_chain_format(task, action_chain)
-        prompt += f"""{PROMPT_TOKENS["execution"]['begin']}\n{cur_session}\n"""
-        # adding inference token
-        prompt += """Action:"""
         return prompt
@@ -0,0 +1,199 @@
+import hashlib
+import math
+from collections import OrderedDict
+from typing import Callable, List
+
+from agentlite.agent_prompts.prompt_utils import act_obs_format
+from agentlite.commons import AgentAct
+
+CONTEXT_POLICIES = ["truncate", "elide", "summarize"]
+ELIDED_OBS = "[observation elided]"
+TRUNCATED_MARK = " ...[truncated]"
+
+
+class ApproxTokenizer:
+    """dependency-free token counter, roughly one token for every 4 characters"""
+
+    chars_per_token = 4
+
+    def count(self, text: str) -> int:
+        return math.ceil(len(text) / self.chars_per_token)
+
+    def truncate(self, text: str, num_tokens: int) -> str:
+        return text[: num_tokens * self.chars_per_token]
+
+
+class TiktokenTokenizer:
+    """exact token counter of the OpenAI models with tiktoken"""
+
+    def __init__(self, llm_name: str) -> None:
+        import tiktoken
+
+        try:
+            self.encoding = tiktoken.encoding_for_model(llm_name)
+        except KeyError:
+            self.encoding = tiktoken.get_encoding("cl100k_base")
+
+    def count(self, text: str) -> int:
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+    def truncate(self, text: str, num_tokens: int) -> str:
+        return self.encoding.decode(
+            self.encoding.encode(text, disallowed_special=())[:num_tokens]
+        )
+
+
+def get_tokenizer(llm_name: str = None):
+    """return the tiktoken tokenizer of llm_name if tiktoken and its encoding files
+    are available, otherwise the approximate tokenizer"""
+    if llm_name:
+        try:
+            return TiktokenTokenizer(llm_name)
+        except Exception:
+            pass
+    return ApproxTokenizer()
+
+
+class LLMSummarizer:
+    """summarize an observation with a llm, summaries are cached by observation
+
+    :param llm: the language model used for summarizing
+    :type llm: BaseLLM
+    :param max_cached: the maximum number of cached summaries, defaults to 256
+    :type max_cached: int, optional
+    """
+
+    def __init__(self, llm, max_cached: int = 256) -> None:
+        self.llm = llm
+        self.max_cached = max_cached
+        self.summaries: OrderedDict[str, str] = OrderedDict()
+
+    def __call__(self, observation: str) -> str:
+        key = hashlib.sha256(observation.encode("utf-8")).hexdigest()
+        summary = self.summaries.get(key)
+        if summary is None:
+            prompt = f"""Summarize the following observation in one or two sentences, keeping the facts needed for the task.\nObservation: {observation}\nSummary:"""
+            summary = self.llm.run(prompt).strip()
+            self.summaries[key] = summary
+            if len(self.summaries) > self.max_cached:
+                self.summaries.popitem(last=False)
+        return summary
+
+
+class ContextManager:
+    """keep the action prompt within the context window of the llm.
+    When the prompt exceeds context_len - max_tokens, the observations of older
+    steps are shortened oldest first, following the policy:
+
+        - truncate: keep the beginning of the observation
+        - elide: replace the observation with a placeholder
+        - summarize: replace the observation with summarizer(observation)
+
+    If the prompt is still too long, the oldest steps are dropped.
+    The latest keep_last steps are never changed.
+
+    :param context_len: the context window of the llm in tokens
+    :type context_len: int
+    :param max_tokens: the tokens reserved for the generation, defaults to 256
+    :type max_tokens: int, optional
+    :param policy: one of CONTEXT_POLICIES, defaults to "truncate"
+    :type policy: str, optional
+    :param tokenizer: the token counter, defaults to ApproxTokenizer
+    :type tokenizer: ApproxTokenizer | TiktokenTokenizer, optional
+    :param keep_last: the number of latest steps kept untouched, defaults to 1
+    :type keep_last: int, optional
+    :param truncate_tokens: the tokens kept from a truncated observation, defaults to 64
+    :type truncate_tokens: int, optional
+    :param summarizer: the summarizing function for the summarize policy, defaults to truncating
+    :type summarizer: Callable[[str], str], optional
+    """
+
+    MAX_CACHED_COUNTS = 1024
+
+    def __init__(
+        self,
+        context_len: int,
+        max_tokens: int = 256,
+        policy: str = "truncate",
+        tokenizer=None,
+        keep_last: int = 1,
+        truncate_tokens: int = 64,
+        summarizer: Callable[[str], str] = None,
+    ) -> None:
+        if policy not in CONTEXT_POLICIES:
+            raise ValueError(f"policy should be one of {CONTEXT_POLICIES}, got {policy}")
+        self.context_len = context_len
+        self.max_tokens = max_tokens or 0
+        self.policy = policy
+        self.tokenizer = tokenizer or ApproxTokenizer()
+        self.keep_last = keep_last
+        self.truncate_tokens = truncate_tokens
+        self.summarizer = summarizer
+        self.token_counts: OrderedDict[tuple[int, int], int] = OrderedDict()
+
+    @property
+    def budget(self) -> int:
+        """the tokens available for the prompt"""
+        return self.context_len - self.max_tokens
+
+    def count(self, text: str) -> int:
+        """count the tokens of text. The counts are memoized since the prefix and
+        the older steps are counted again at every step. They are keyed by the hash and
+        length of text, so the long prompt strings are not kept alive by the memo."""
+        key = (hash(text), len(text))
+        num_tokens = self.token_counts.get(key)
+        if num_tokens is None:
+            num_tokens = self.tokenizer.count(text)
+            self.token_counts[key] = num_tokens
+            if len(self.token_counts) > self.MAX_CACHED_COUNTS:
+                self.token_counts.popitem(last=False)
+        else:
+            self.token_counts.move_to_end(key)
+        return num_tokens
+
+    def __shorten__(self, observation: str) -> str:
+        if self.policy == "elide":
+            return ELIDED_OBS
+        if self.policy == "summarize" and self.summarizer is not None:
+            return self.summarizer(observation)
+        if self.count(observation) <= self.truncate_tokens:
+            return observation
+        return self.tokenizer.truncate(observation, self.truncate_tokens) + TRUNCATED_MARK
+
+    def fit(
+        self, prompt_tokens: int, action_chain: List[tuple[AgentAct, str]]
+    ) -> List[tuple[AgentAct, str]]:
+        """return the action chain fitting in the budget besides prompt_tokens.
+        The same chain object is returned if it already fits.
+
+        :param prompt_tokens: the tokens of the prompt without the action chain
+        :type prompt_tokens: int
+        :param action_chain: the history action-obs chain of the task
+        :type action_chain: List[tuple[AgentAct, str]]
+        :return: the action chain for the prompt
+        :rtype: List[tuple[AgentAct, str]]
+        """
+        budget = self.budget - prompt_tokens
+        step_tokens = [self.count(act_obs_format(act, obs)) for act, obs in action_chain]
+        total = sum(step_tokens)
+        if total <= budget:
+            return action_chain
+        fitted = list(action_chain)
+        num_old = max(len(fitted) - self.keep_last, 0)
+        for idx in range(num_old):
+            if total <= budget:
+                return fitted
+            act, obs = fitted[idx]
+            short_obs = self.__shorten__(obs)
+            if short_obs == obs:
+                continue
+            fitted[idx] = (act, short_obs)
+            short_tokens = self.count(act_obs_format(act, short_obs))
+            total += short_tokens - step_tokens[idx]
+            step_tokens[idx] = short_tokens
+        # still too long, drop the oldest steps
+        num_dropped = 0
+        while total > budget and num_dropped < num_old:
+            total -= step_tokens[num_dropped]
+            num_dropped += 1
+        return fitted[num_dropped:]
@@ -1 +1,2 @@
+from .ContextManager import ContextManager
 from .BasePrompt import BasePromptGen, ManagerPromptGen, PromptGen
@@ -1,9 +1,11 @@
 import json
 
 from agentlite.actions.BaseAction import BaseAction
-from agentlite.agents.agent_utils import AGENT_CALL_ARG_KEY
 from agentlite.commons import AgentAct, TaskPackage
 
+# the param of the team member calls of a manager agent
+AGENT_CALL_ARG_KEY = "Task"
+
 PROMPT_TASK_KEY = "task"
 PROMPT_ACT_OBS_KEY = "act_obs"
 
@@ -33,6 +35,8 @@ DEFAULT_PROMPT = {
     "constraint": f"""{CONSTRAITS["simple"]}""",
     "action_format": "Using the following action format example to generate well formatted actions.\n",
     "not_completed": "I cannot help with that. Please be more specific.",
+    "multi_action": f"""You can take several independent actions within one Action by separating the calls with ';', e.g. action_a[{{"query": "..."}}]; action_b[{{"query": "..."}}]. Only combine actions which do not depend on each other's observations.""",
+    "multi_call": f"""You can call several agents in your {PROMPT_TOKENS["team"]['begin']} within one Action by separating the calls with ';', e.g. agent_a[{{"Task": "..."}}]; agent_b[{{"Task": "..."}}]. These agents work on their tasks in parallel.""",
 }
 
 
@@ -67,7 +71,9 @@ def format_agent_call_example(agents_doc: dict[str, str]):
 
 def action_format(act: AgentAct, action_trigger: bool = True) -> str:
     """unified format the action as a string"""
-    str_params = json.dumps(act.params)
+    str_params = getattr(act, "params_str", None)  # cached by AgentActLite
+    if str_params is None:  # e.g. an action object of a user subclass
+        str_params = json.dumps(act.params)
     if action_trigger:
         act_str = f"""Action:{act.name}[{str_params}]"""
     # w/o Action trigger
@@ -76,12 +82,14 @@ def action_format(act: AgentAct, action_trigger: bool = True) -> str:
     return act_str
 
 
+def act_obs_format(act: AgentAct, obs: str) -> str:
+    """unified format of one action and its observation"""
+    return f"""{action_format(act)}\nObservation: {obs}\n"""
+
+
 def action_chain_format(action_chain: list[tuple[AgentAct, str]]):
     """Unified format of action generation of inner actions and outer actions"""
-    history = ""
-    for act, obs in action_chain:
-        history += f"""{action_format(act)}\nObservation: {obs}\n"""
-    return history
+    return "".join(act_obs_format(act, obs) for act, obs in action_chain)
 
 
 def task_chain_format(task: TaskPackage, action_chain: list[tuple[AgentAct, str]]):
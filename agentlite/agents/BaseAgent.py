@@ -1,15 +1,31 @@
-from typing import List
+import asyncio
+import contextvars
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import Callable, Hashable, List
 
 from agentlite.actions import BaseAction, FinishAct, ThinkAct, PlanAct
 from agentlite.agent_prompts import BasePromptGen
+from agentlite.agent_prompts.ContextManager import (
+    ApproxTokenizer,
+    ContextManager,
+    LLMSummarizer,
+    get_tokenizer,
+)
 from agentlite.agent_prompts.prompt_utils import DEFAULT_PROMPT
 from agentlite.agents.agent_utils import *
-from agentlite.commons import AgentAct, TaskPackage
+from agentlite.commons import AgentAct, AgentActLite, TaskPackage
 from agentlite.commons.AgentAct import ActObsChainType
+from agentlite.commons.RunStats import RunStats
+from agentlite.commons.TaskRegistry import TaskRegistry, get_task_registry
 from agentlite.llm.agent_llms import BaseLLM
 from agentlite.logging import DefaultLogger
+from agentlite.logging.base import log_event
 from agentlite.logging.terminal_logger import AgentLogger
 from agentlite.memory.AgentSTMemory import AgentSTMemory, DictAgentSTMemory
+from agentlite.tracing import Span, Tracer, get_tracer
 
 from .ABCAgent import ABCAgent
 
@@ -36,11 +52,33 @@ class BaseAgent(ABCAgent):
     :type reasoning_type: str, optional
     :param logger: the logger for this agent, defaults to DefaultLogger
     :type logger: AgentLogger, optional
+    :param stream_action: stream the llm output and stop it as soon as a complete action arrived, defaults to False
+    :type stream_action: bool, optional
+    :param context_policy: how older observations are shortened when the prompt exceeds the context_len
+        of the llm, one of "truncate", "elide" and "summarize", defaults to "truncate".
+        The prompt is not managed if the llm has no context_len.
+    :type context_policy: str, optional
+    :param fuzzy_matcher: resolve the action names generated without an exact match, e.g. NormalizedMatcher(), defaults to None
+    :type fuzzy_matcher: NormalizedMatcher, optional
+    :param tracer: record the agent-run, step, llm-call and action-call spans, defaults to None (the tracer of set_tracer)
+    :type tracer: Tracer, optional
+    :param constrained_decoding: restrict the llm output to the valid actions if the llm supports it, defaults to False.
+        See BaseLLM.run_constrained and ActionConstraint.
+    :type constrained_decoding: bool, optional
+    :param multi_call: allow several actions in one step, e.g. `Search[{...}]; Search[{...}]`.
+        The calls of parallel-safe actions run concurrently, see BaseAction.parallel_safe, defaults to False
+    :type multi_call: bool, optional
 
     Methods:
         - __call__(task: TaskPackage) -> str
+        - acall(task: TaskPackage) -> str, awaitable
+        - run_batch(tasks: List[TaskPackage], max_concurrency: int) -> List[str]
+        - get_run_stats(task: TaskPackage) -> RunStats
+        - add_stats_hook(hook: Callable[[RunStats], None])
     """
 
+    MAX_RUN_STATS = 1024
+
     def __init__(
         self,
         name: str,
@@ -51,6 +89,12 @@ class BaseAgent(ABCAgent):
         instruction: str = DEFAULT_PROMPT["agent_instruction"],
         reasoning_type: str = "react",
         logger: AgentLogger = DefaultLogger,
+        stream_action: bool = False,
+        context_policy: str = "truncate",
+        fuzzy_matcher: NormalizedMatcher = None,
+        tracer: Tracer = None,
+        constrained_decoding: bool = False,
+        multi_call: bool = False,
         **kwargs
     ):
         super().__init__(name=name, role=role)
@@ -59,6 +103,7 @@ class BaseAgent(ABCAgent):
         self.llm = llm
         self.actions = actions
         self.max_exec_steps = 20
+        self.max_parallel_actions = 8  # the worker threads of a multi-call step
         self.task_pool = []
         self.constraint = constraint
         self.instruction = instruction
@@ -69,6 +114,30 @@ class BaseAgent(ABCAgent):
             instruction=self.instruction,
         )
         self.logger = logger
+        self.stream_action = stream_action
+        self.fuzzy_matcher = fuzzy_matcher
+        self.tracer = tracer
+        self.constrained_decoding = constrained_decoding
+        self.multi_call = multi_call
+        self.action_constraint: ActionConstraint = None
+        self.action_constraint_key = None
+        self.action_index: NameIndex = None
+        self.action_index_key = None
+        self.stats = RunStats(agent_name=self.name)  # aggregate of all the finished tasks
+        self.run_stats: dict[str, RunStats] = {}
+        # the finished runs in finish order, only these are evicted beyond MAX_RUN_STATS
+        self.finished_runs: OrderedDict[str, None] = OrderedDict()
+        self.stats_hooks: List[Callable[[RunStats], None]] = []
+        self.task_registry: TaskRegistry = get_task_registry()
+        self.context_manager = None
+        if llm.context_len:
+            self.context_manager = ContextManager(
+                context_len=llm.context_len,
+                max_tokens=llm.max_tokens,
+                policy=context_policy,
+                tokenizer=get_tokenizer(llm.llm_name),
+                summarizer=LLMSummarizer(llm) if context_policy == "summarize" else None,
+            )
         self.__add_st_memory__()
         self.__add_inner_actions__()
 
@@ -79,7 +148,7 @@ class BaseAgent(ABCAgent):
         :type short_term_memory: AgentSTMemory, optional
         """ """
         """
-        if short_term_memory:
+        if short_term_memory is not None:
             self.short_term_memory = short_term_memory
         else:
             self.short_term_memory = DictAgentSTMemory(agent_id=self.id)
@@ -110,12 +179,27 @@ class BaseAgent(ABCAgent):
         :rtype: str
         """
         # adding log information
-        self.logger.receive_task(task=task, agent_name=self.name)
+        log_event(self.logger, "receive_task", task=task, agent_name=self.name)
         self.assign(task)
         self.execute(task)
         response = self.respond(task)
         return response
 
+    async def acall(self, task: TaskPackage) -> str:
+        """the awaitable version of __call__. Many tasks can be served concurrently
+        from one event loop since the llm calls and actions are awaited.
+
+        :param task: the task which agent receives and solves
+        :type task: TaskPackage
+        :return: the response of this task
+        :rtype: str
+        """
+        log_event(self.logger, "receive_task", task=task, agent_name=self.name)
+        self.assign(task)
+        await self.aexecute(task)
+        response = self.respond(task)
+        return response
+
     def assign(self, task: TaskPackage) -> None:
         """assign task to agent
 
@@ -124,6 +208,7 @@ class BaseAgent(ABCAgent):
         """
         self.short_term_memory.add_new_task(task)
         self.task_pool.append(task)
+        self.task_registry.register(task)
 
     def llm_layer(self, prompt: str) -> str:
         """input a prompt, llm generates a text
@@ -133,25 +218,405 @@ class BaseAgent(ABCAgent):
         :return: the output from llm, which is a string
         :rtype: str
         """
+        if self.__use_constraint__():
+            return self.llm.run_constrained(prompt, self.__action_constraint__())
+        if self.stream_action:
+            return stream_until_action(self.llm.stream(prompt), self.__action_complete__)
         return self.llm.run(prompt)
 
+    def llm_batch_layer(self, prompts: List[str]) -> List[str]:
+        """input several prompts, llm generates one text for each of them
+
+        :param prompts: the prompt strings
+        :type prompts: List[str]
+        :return: the outputs from llm, in the prompt order
+        :rtype: List[str]
+        """
+        return self.llm.run_batch(prompts)
+
+    async def allm_layer(self, prompt: str) -> str:
+        """the awaitable version of llm_layer
+
+        :param prompt: the prompt string
+        :type prompt: str
+        :return: the output from llm, which is a string
+        :rtype: str
+        """
+        if self.__use_constraint__():
+            return await self.llm.arun_constrained(prompt, self.__action_constraint__())
+        if self.stream_action:
+            return await astream_until_action(
+                self.llm.astream(prompt), self.__action_complete__
+            )
+        return await self.llm.arun(prompt)
+
+    def __use_constraint__(self) -> bool:
+        return self.constrained_decoding and self.llm.supports_constrained
+
+    def __action_constraint__(self) -> ActionConstraint:
+        """the constraint of the outputs calling the actions of this agent,
+        rebuilt when the action space changes"""
+        constraint_key = (id(self.actions), len(self.actions), self.multi_call)
+        if self.action_constraint is None or self.action_constraint_key != constraint_key:
+            self.action_constraint = ActionConstraint(
+                self.__action_params__(), multi_call=self.multi_call
+            )
+            self.action_constraint_key = constraint_key
+        return self.action_constraint
+
+    def __action_params__(self) -> dict[str, list[str]]:
+        """the param names of every action name"""
+        return {action.action_name: list(action.params_doc or {}) for action in self.actions}
+
+    def __action_complete__(self, text: str) -> bool:
+        """whether the streamed llm output already holds a complete action, see stream_action
+
+        :param text: the llm output received so far
+        :type text: str
+        :return: True if the rest of the output can be dropped
+        :rtype: bool
+        """
+        # more calls may follow on the same line with multi_call, only the finished lines count
+        if self.multi_call:
+            finished = text[: text.rfind("\n") + 1]
+            return bool(finished) and parse_actions(finished)[0][2]
+        return parse_action(text)[2]
+
     def execute(self, task: TaskPackage):
         """multi-step execution of actions. Generate the actions for a task until reach the done
 
         :param task: the task which agent receives and solves
         :type task: TaskPackage
         """
-        step_size = 0
-        self.logger.execute_task(task=task, agent_name=self.name)
-        while task.completion == "active" and step_size < self.max_exec_steps:
-            action_chain = self.short_term_memory.get_action_chain(task)
-            action = self.__next_act__(task, action_chain)
-            self.logger.take_action(action, agent_name=self.name, step_idx=step_size)
-            observation = self.forward(task, action)
-            self.logger.get_obs(obs=observation)
-            self.__st_memorize__(task, action, observation)
-            step_size += 1
-        self.logger.end_execute(task=task, agent_name=self.name)
+        tracer = self.__tracer__()
+        with tracer.span("agent-run", attributes=self.__run_attributes__(task)) as run_span:
+            step_size = 0
+            self.__start_stats__(task)
+            log_event(self.logger, "execute_task", task=task, agent_name=self.name)
+            failed = True
+            try:
+                while task.completion == "active" and step_size < self.max_exec_steps:
+                    with tracer.span("step", attributes=self.__step_attributes__(task, step_size)):
+                        action_chain = self.short_term_memory.get_action_chain(task)
+                        agent_acts = self.__next_acts__(task, action_chain)
+                        self.__forward_step__(task, agent_acts, step_size)
+                    step_size += 1
+                failed = False
+            finally:
+                self.__end_registry__(task, failed)
+            log_event(self.logger, "end_execute", task=task, agent_name=self.name)
+            self.short_term_memory.end_task(task)
+            self.__end_stats__(task, step_size)
+            self.__end_run_span__(run_span, task, step_size)
+
+    def __forward_step__(
+        self, task: TaskPackage, agent_acts: List[AgentAct], step_idx: int
+    ):
+        """execute the actions of one step and memorize the observations
+
+        :param task: the task which agent receives and solves
+        :type task: TaskPackage
+        :param agent_acts: the actions generated in this step
+        :type agent_acts: List[AgentAct]
+        :param step_idx: the index of this step
+        :type step_idx: int
+        """
+        for agent_act in agent_acts:
+            log_event(
+                self.logger,
+                "take_action",
+                agent_act,
+                agent_name=self.name,
+                step_idx=step_idx,
+                task=task,
+            )
+        with self.__phase__(task, "action"):
+            observations = self.forward_acts(task, agent_acts)
+        for agent_act, observation in zip(agent_acts, observations):
+            log_event(self.logger, "get_obs", obs=observation, task=task, agent_name=self.name)
+            with self.__phase__(task, "memory"):
+                self.__st_memorize__(task, agent_act, observation)
+
+    async def __aforward_step__(
+        self, task: TaskPackage, agent_acts: List[AgentAct], step_idx: int
+    ):
+        """the awaitable version of __forward_step__"""
+        for agent_act in agent_acts:
+            log_event(
+                self.logger,
+                "take_action",
+                agent_act,
+                agent_name=self.name,
+                step_idx=step_idx,
+                task=task,
+            )
+        with self.__phase__(task, "action"):
+            observations = await self.aforward_acts(task, agent_acts)
+        for agent_act, observation in zip(agent_acts, observations):
+            log_event(self.logger, "get_obs", obs=observation, task=task, agent_name=self.name)
+            with self.__phase__(task, "memory"):
+                self.__st_memorize__(task, agent_act, observation)
+
+    def __end_registry__(self, task: TaskPackage, failed: bool = False):
+        """index the end of a run of task in the task registry. A run which stopped at
+        max_exec_steps is indexed "incomplete" and a run which raised "failed", so the registry
+        can evict it; task.completion stays "active" and the task can be run again."""
+        status = task.completion
+        if status == "active":
+            status = "failed" if failed else "incomplete"
+        self.task_registry.update(task, status=status)
+
+    def __start_stats__(self, task: TaskPackage):
+        self.run_stats[task.task_id] = RunStats(task_id=task.task_id, agent_name=self.name)
+        self.finished_runs.pop(task.task_id, None)
+
+    def __end_stats__(self, task: TaskPackage, step_size: int):
+        """stop the run stats of task, add them to the agent stats and call the stats hooks"""
+        stats = self.run_stats.get(task.task_id)
+        if stats is None:
+            return
+        stats.steps = step_size
+        stats.finish()
+        self.stats.merge(stats)
+        self.finished_runs[task.task_id] = None
+        while len(self.finished_runs) > self.MAX_RUN_STATS:
+            task_id, _ = self.finished_runs.popitem(last=False)
+            self.run_stats.pop(task_id, None)
+        for hook in self.stats_hooks:
+            hook(stats)
+
+    def __phase__(self, task: TaskPackage, phase: str):
+        """time a phase of the current step of task, see RunStats"""
+        stats = self.run_stats.get(task.task_id)
+        return stats.timer(phase) if stats is not None else nullcontext()
+
+    def __count_tokens__(self, text: str) -> int:
+        if self.context_manager is not None:
+            return self.context_manager.tokenizer.count(text)
+        return ApproxTokenizer().count(text)
+
+    def __record_llm_call__(
+        self, task: TaskPackage, prompt: str, output: str, llm_span: Span = None
+    ):
+        if llm_span is not None:
+            llm_span.set_attribute("completion_chars", len(output))
+        stats = self.run_stats.get(task.task_id)
+        if stats is not None:
+            stats.add_llm_call(
+                prompt_chars=len(prompt),
+                completion_chars=len(output),
+                prompt_tokens=self.__count_tokens__(prompt),
+                completion_tokens=self.__count_tokens__(output),
+            )
+
+    def __record_action__(self, task: TaskPackage, action_name: str, start: float):
+        if task is None:
+            return
+        stats = self.run_stats.get(task.task_id)
+        if stats is not None:
+            stats.add_action(action_name, time.perf_counter() - start)
+
+    def get_run_stats(self, task: TaskPackage) -> RunStats:
+        """the stats of the latest run of task, None if unknown
+
+        :param task: the task which agent receives and solves
+        :type task: TaskPackage
+        :return: the latency and size counters of the run
+        :rtype: RunStats
+        """
+        return self.run_stats.get(task.task_id)
+
+    def add_stats_hook(self, hook: Callable[[RunStats], None]):
+        """call hook with the RunStats of every finished task, e.g. to push them to a metrics sink
+
+        :param hook: the function receiving the stats
+        :type hook: Callable[[RunStats], None]
+        """
+        self.stats_hooks.append(hook)
+
+    def __tracer__(self) -> Tracer:
+        return self.tracer or get_tracer()
+
+    def __run_attributes__(self, task: TaskPackage) -> dict:
+        # creator and executor link the run of a team member to the manager which created the task
+        return {
+            "agent": self.name,
+            "task_id": task.task_id,
+            "creator": task.creator,
+            "executor": task.executor,
+        }
+
+    def __step_attributes__(self, task: TaskPackage, step_idx: int) -> dict:
+        return {"agent": self.name, "task_id": task.task_id, "step": step_idx}
+
+    def __llm_attributes__(self, task: TaskPackage, prompt: str, **attributes) -> dict:
+        return {
+            "agent": self.name,
+            "task_id": task.task_id,
+            "llm": self.llm.llm_name,
+            "prompt_chars": len(prompt),
+            **attributes,
+        }
+
+    def __action_attributes__(self, task: TaskPackage, action_name: str, **attributes) -> dict:
+        return {
+            "agent": self.name,
+            "task_id": task.task_id if task is not None else None,
+            "action": action_name,
+            **attributes,
+        }
+
+    def __end_run_span__(self, run_span: Span, task: TaskPackage, step_size: int):
+        if run_span is not None:
+            run_span.set_attribute("steps", step_size)
+            run_span.set_attribute("completion", task.completion)
+
+    def run_batch(
+        self,
+        tasks: List[TaskPackage],
+        max_concurrency: int = None,
+        on_finish: Callable[[TaskPackage, str], None] = None,
+    ) -> List[str]:
+        """solve many tasks in lockstep. At every step the prompts of all the running tasks
+        are sent through one BaseLLM.run_batch call, then the actions are dispatched task by task.
+
+        :param tasks: the tasks to solve, each with a distinct task_id
+        :type tasks: List[TaskPackage]
+        :param max_concurrency: the maximum number of tasks running at the same step, defaults to None (all)
+        :type max_concurrency: int, optional
+        :param on_finish: called with each task and its response as soon as the task ends,
+            e.g. to write the results incrementally, defaults to None
+        :type on_finish: Callable[[TaskPackage, str], None], optional
+        :return: the responses in the order of tasks
+        :rtype: List[str]
+        """
+        if len({task.task_id for task in tasks}) != len(tasks):
+            raise ValueError("run_batch needs a distinct task_id for every task.")
+        tracer = self.__tracer__()
+        run_spans = {}  # the tasks run interleaved, so their spans are passed explicitly
+        pending = deque(tasks)
+        running = []  # [task, step_size]
+        step_spans, llm_spans = [], []
+        try:
+            while pending or running:
+                while pending and (max_concurrency is None or len(running) < max_concurrency):
+                    task = pending.popleft()
+                    log_event(self.logger, "receive_task", task=task, agent_name=self.name)
+                    self.assign(task)
+                    run_spans[task.task_id] = tracer.start_span(
+                        "agent-run", attributes=self.__run_attributes__(task)
+                    )
+                    self.__start_stats__(task)
+                    running.append([task, 0])
+                    log_event(self.logger, "execute_task", task=task, agent_name=self.name)
+                prompts = []
+                step_spans, llm_spans = [], []
+                for task, step_size in running:
+                    step_spans.append(
+                        tracer.start_span(
+                            "step",
+                            parent=run_spans[task.task_id],
+                            attributes=self.__step_attributes__(task, step_size),
+                        )
+                    )
+                    action_chain = self.short_term_memory.get_action_chain(task)
+                    with self.__phase__(task, "prompt"):
+                        prompts.append(self.__action_prompt__(task, action_chain))
+                llm_spans = [
+                    tracer.start_span(
+                        "llm-call",
+                        parent=step_span,
+                        attributes=self.__llm_attributes__(task, prompt, batch_size=len(prompts)),
+                    )
+                    for (task, step_size), step_span, prompt in zip(running, step_spans, prompts)
+                ]
+                llm_start = time.perf_counter()
+                raw_actions = self.llm_batch_layer(prompts)
+                llm_time = time.perf_counter() - llm_start
+                for run, prompt, raw_action, step_span, llm_span in zip(
+                    running, prompts, raw_actions, step_spans, llm_spans
+                ):
+                    task, step_size = run
+                    # every task of the batch waited for the whole batch call
+                    stats = self.run_stats.get(task.task_id)
+                    if stats is not None:
+                        stats.phase_time["llm"] += llm_time
+                    self.__record_llm_call__(task, prompt, raw_action, llm_span)
+                    tracer.end_span(llm_span)
+                    log_event(
+                        self.logger, "get_prompt", prompt, task=task, agent_name=self.name
+                    )
+                    log_event(
+                        self.logger, "get_llm_output", raw_action, task=task, agent_name=self.name
+                    )
+                    with tracer.use_span(step_span):
+                        with self.__phase__(task, "parse"):
+                            agent_acts = self.__acts_parser__(raw_action)
+                        self.__forward_step__(task, agent_acts, step_size)
+                    tracer.end_span(step_span)
+                    run[1] += 1
+                still_running = []
+                for task, step_size in running:
+                    if task.completion == "active" and step_size < self.max_exec_steps:
+                        still_running.append([task, step_size])
+                    else:
+                        run_span = run_spans.pop(task.task_id)
+                        log_event(self.logger, "end_execute", task=task, agent_name=self.name)
+                        self.short_term_memory.end_task(task)
+                        self.__end_registry__(task)
+                        self.__end_stats__(task, step_size)
+                        self.__end_run_span__(run_span, task, step_size)
+                        tracer.end_span(run_span)
+                        if on_finish is not None:
+                            on_finish(task, self.respond(task))
+                running = still_running
+        except BaseException as error:
+            # close what the failed step left open, the tasks still holding a run span
+            # had not ended yet
+            for span in llm_spans + step_spans:
+                if span is not None and not span.is_ended:
+                    span.record_error(error)
+                    tracer.end_span(span)
+            for task, step_size in running:
+                if task.task_id not in run_spans:
+                    continue
+                run_span = run_spans.pop(task.task_id)
+                self.__end_registry__(task, failed=True)
+                self.__end_stats__(task, step_size)
+                self.__end_run_span__(run_span, task, step_size)
+                if run_span is not None:
+                    run_span.record_error(error)
+                tracer.end_span(run_span)
+            raise
+        return [self.respond(task) for task in tasks]
+
+    async def aexecute(self, task: TaskPackage):
+        """the awaitable version of execute. Same loop, but the llm call and the
+        action are awaited so the event loop can serve other tasks meanwhile.
+
+        :param task: the task which agent receives and solves
+        :type task: TaskPackage
+        """
+        tracer = self.__tracer__()
+        with tracer.span("agent-run", attributes=self.__run_attributes__(task)) as run_span:
+            step_size = 0
+            self.__start_stats__(task)
+            log_event(self.logger, "execute_task", task=task, agent_name=self.name)
+            failed = True
+            try:
+                while task.completion == "active" and step_size < self.max_exec_steps:
+                    with tracer.span("step", attributes=self.__step_attributes__(task, step_size)):
+                        action_chain = self.short_term_memory.get_action_chain(task)
+                        agent_acts = await self.__anext_acts__(task, action_chain)
+                        await self.__aforward_step__(task, agent_acts, step_size)
+                    step_size += 1
+                failed = False
+            finally:
+                self.__end_registry__(task, failed)
+            log_event(self.logger, "end_execute", task=task, agent_name=self.name)
+            self.short_term_memory.end_task(task)
+            self.__end_stats__(task, step_size)
+            self.__end_run_span__(run_span, task, step_size)
 
     def respond(self, task: TaskPackage, **kwargs) -> str:
         """generate messages for manager agents
@@ -180,16 +645,77 @@ class BaseAgent(ABCAgent):
         :return: the action for agent to execute
         :rtype: AgentAct
         """
+        return self.__next_acts__(task, action_chain)[0]
+
+    def __next_acts__(
+        self, task: TaskPackage, action_chain: ActObsChainType
+    ) -> List[AgentAct]:
+        """one-step action generation. One llm call may produce several actions,
+        see __acts_parser__.
+
+        :param task: the task which agent receives and solves
+        :type task: TaskPackage
+        :param action_chain: history actions and observation of this task from memory
+        :type action_chain: ActObsChainType
+        :return: the actions for agent to execute in this step
+        :rtype: List[AgentAct]
+        """
+
+        with self.__phase__(task, "prompt"):
+            action_prompt = self.__action_prompt__(task, action_chain)
+        log_event(self.logger, "get_prompt", action_prompt, task=task, agent_name=self.name)
+        with self.__phase__(task, "llm"), self.__tracer__().span(
+            "llm-call", attributes=self.__llm_attributes__(task, action_prompt)
+        ) as llm_span:
+            raw_action = self.llm_layer(action_prompt)
+        self.__record_llm_call__(task, action_prompt, raw_action, llm_span)
+        log_event(self.logger, "get_llm_output", raw_action, task=task, agent_name=self.name)
+        with self.__phase__(task, "parse"):
+            return self.__acts_parser__(raw_action)
+
+    async def __anext_acts__(
+        self, task: TaskPackage, action_chain: ActObsChainType
+    ) -> List[AgentAct]:
+        """the awaitable version of __next_acts__
+
+        :param task: the task which agent receives and solves
+        :type task: TaskPackage
+        :param action_chain: history actions and observation of this task from memory
+        :type action_chain: ActObsChainType
+        :return: the actions for agent to execute in this step
+        :rtype: List[AgentAct]
+        """
+        with self.__phase__(task, "prompt"):
+            action_prompt = self.__action_prompt__(task, action_chain)
+        log_event(self.logger, "get_prompt", action_prompt, task=task, agent_name=self.name)
+        with self.__phase__(task, "llm"), self.__tracer__().span(
+            "llm-call", attributes=self.__llm_attributes__(task, action_prompt)
+        ) as llm_span:
+            raw_action = await self.allm_layer(action_prompt)
+        self.__record_llm_call__(task, action_prompt, raw_action, llm_span)
+        log_event(self.logger, "get_llm_output", raw_action, task=task, agent_name=self.name)
+        with self.__phase__(task, "parse"):
+            return self.__acts_parser__(raw_action)
 
-        action_prompt = self.prompt_gen.action_prompt(
+    def __action_prompt__(
+        self, task: TaskPackage, action_chain: ActObsChainType
+    ) -> str:
+        """build the action generation prompt of one step
+
+        :param task: the task which agent receives and solves
+        :type task: TaskPackage
+        :param action_chain: history actions and observation of this task from memory
+        :type action_chain: ActObsChainType
+        :return: the prompt for llm
+        :rtype: str
+        """
+        return self.prompt_gen.action_prompt(
             task=task,
             actions=self.actions,
             action_chain=action_chain,
+            multi_call=self.multi_call,
+            context_manager=self.context_manager,
         )
-        self.logger.get_prompt(action_prompt)
-        raw_action = self.llm_layer(action_prompt)
-        self.logger.get_llm_output(raw_action)
-        return self.__action_parser__(raw_action)
 
     def __st_memorize__(
         self, task: TaskPackage, action: AgentAct, observation: str = ""
@@ -215,12 +741,31 @@ class BaseAgent(ABCAgent):
         """
 
         action_name, args, PARSE_FLAG = parse_action(raw_action)
-        agent_act = AgentAct(name=action_name, params=args)
+        agent_act = AgentActLite(name=action_name, params=args)
         return agent_act
 
+    def __acts_parser__(self, raw_action: str) -> List[AgentAct]:
+        """parse the generated content to the actions of one step.
+        With multi_call, one line can hold several calls separated by ";",
+        otherwise the agent takes exactly one action per step.
+
+        :param raw_action: llm generated text
+        :type raw_action: str
+        :return: the executable action wrappers
+        :rtype: List[AgentAct]
+        """
+        if not self.multi_call:
+            return [self.__action_parser__(raw_action)]
+        return [
+            AgentActLite(name=action_name, params=args)
+            for action_name, args, PARSE_FLAG in parse_actions(raw_action)
+        ]
+
     def forward(self, task: TaskPackage, agent_act: AgentAct) -> str:
         """
         using this function to forward the action to get the observation.
+        The call is guarded by the timeout, max_retries and circuit breaker of the action,
+        see BaseAction. A call which times out returns a timeout observation.
 
         :param task: the task which agent receives and solves.
         :type task: TaskPackage
@@ -229,22 +774,258 @@ class BaseAgent(ABCAgent):
         :return: observation
         :rtype: str
         """
-        act_found_flag = False
-        
-        # if match one in self.actions
-        for action in self.actions:
-            if act_match(agent_act.name, action):
-                act_found_flag = True
-                observation = action(**agent_act.params)
-                # if action is Finish Action
-                if agent_act.name == FinishAct.action_name:
-                    task.answer = observation
-                    task.completion = "completed"
+        action = self.__find_action__(agent_act.name)
         # if not find this action
-        if act_found_flag:
-            return observation
-        else:
-            observation = ACION_NOT_FOUND_MESS
+        if action is None:
+            return ACION_NOT_FOUND_MESS
+        start = time.perf_counter()
+        with self.__tracer__().span(
+            "action-call", attributes=self.__action_attributes__(task, action.action_name)
+        ) as action_span:
+            observation = self.__guarded_call__(action, agent_act.params, action_span)
+        self.__record_action__(task, action.action_name, start)
+        # if action is Finish Action
+        if action.action_name == FinishAct.action_name:
+            task.answer = observation
+            task.completion = "completed"
+        return observation
+
+    def __guarded_call__(self, action: BaseAction, params: dict, action_span: Span = None) -> str:
+        """call the action within its timeout, retry budget and circuit breaker.
+        Only the timeouts and the action.retry_on exceptions are retried and count as failures
+        of the breaker. Once the retries are spent, a timeout returns ACTION_TIMEOUT_MESS and
+        an exception ACTION_ERROR_MESS; any other exception returns ACTION_ERROR_MESS at once.
+        An open circuit returns ACTION_CIRCUIT_OPEN_MESS."""
+        breaker = action.circuit_breaker
+        if breaker is None and action.timeout is None and not action.max_retries:
+            return action(**params)
+        attempts = action.max_retries + 1
+        error = None
+        for attempt in range(attempts):
+            if breaker is not None and not breaker.allow():
+                return self.__circuit_open__(action, action_span)
+            try:
+                observation = call_with_timeout(action, action.timeout, **params)
+            except ActionTimeout:
+                self.__action_failed__(action)
+                error = None
+            except action.retry_on as retry_error:
+                self.__action_failed__(action)
+                error = retry_error
+            except Exception as call_error:
+                return self.__action_error__(action, call_error, action_span)
+            else:
+                if breaker is not None:
+                    breaker.record_success()
+                return observation
+        if error is not None:
+            return self.__action_error__(action, error, action_span)
+        return self.__action_timeout__(action, attempts, action_span)
+
+    async def __aguarded_call__(
+        self, action: BaseAction, params: dict, action_span: Span = None
+    ) -> str:
+        """the awaitable version of __guarded_call__. A call which times out is cancelled."""
+        breaker = action.circuit_breaker
+        if breaker is None and action.timeout is None and not action.max_retries:
+            return await action.__acall__(**params)
+        attempts = action.max_retries + 1
+        error = None
+        for attempt in range(attempts):
+            if breaker is not None and not breaker.allow():
+                return self.__circuit_open__(action, action_span)
+            try:
+                observation = await acall_with_timeout(
+                    action.__acall__, action.timeout, **params
+                )
+            except ActionTimeout:
+                self.__action_failed__(action)
+                error = None
+            except action.retry_on as retry_error:
+                self.__action_failed__(action)
+                error = retry_error
+            except Exception as call_error:
+                return self.__action_error__(action, call_error, action_span)
+            else:
+                if breaker is not None:
+                    breaker.record_success()
+                return observation
+        if error is not None:
+            return self.__action_error__(action, error, action_span)
+        return self.__action_timeout__(action, attempts, action_span)
+
+    def __action_failed__(self, action: BaseAction):
+        if action.circuit_breaker is not None:
+            action.circuit_breaker.record_failure()
+
+    def __action_error__(
+        self, action: BaseAction, error: Exception, action_span: Span = None
+    ) -> str:
+        if action_span is not None:
+            action_span.set_attribute("status", "error")
+        if action.circuit_breaker is not None and not isinstance(error, action.retry_on):
+            # the tool answered, the error comes from the call itself, e.g. its parameters
+            action.circuit_breaker.record_success()
+        return ACTION_ERROR_MESS.format(
+            action=action.action_name, error_type=type(error).__name__, error=error
+        )
+
+    def __action_timeout__(self, action: BaseAction, attempts: int, action_span: Span = None) -> str:
+        if action_span is not None:
+            action_span.set_attribute("status", "timeout")
+        return ACTION_TIMEOUT_MESS.format(
+            action=action.action_name, timeout=action.timeout, attempts=attempts
+        )
+
+    def __circuit_open__(self, action: BaseAction, action_span: Span = None) -> str:
+        if action_span is not None:
+            action_span.set_attribute("status", "circuit_open")
+        return ACTION_CIRCUIT_OPEN_MESS.format(
+            action=action.action_name, retry_after=action.circuit_breaker.retry_after()
+        )
+
+    def __find_action__(self, action_name: str) -> BaseAction:
+        """return the action matching action_name, None if no one matches.
+        The name index is rebuilt when self.actions is replaced or its length changes,
+        call reset_action_index after replacing an action in place."""
+        index_key = (id(self.actions), len(self.actions))
+        if self.action_index is None or self.action_index_key != index_key:
+            self.action_index = NameIndex(
+                self.actions,
+                lambda action: action.action_name,
+                fuzzy_matcher=self.fuzzy_matcher,
+            )
+            self.action_index_key = index_key
+        return self.action_index.get(action_name)
+
+    def reset_action_index(self):
+        self.action_index = None
+
+    def add_action(self, action: BaseAction):
+        """add an action to the action space
+
+        :param action: the action to add
+        :type action: BaseAction
+        """
+        self.actions.append(action)
+        self.reset_action_index()
+
+    def __parallel_key__(self, idx: int, agent_act: AgentAct) -> Hashable:
+        """the group of an action call in a multi-call step. Calls of different groups
+        run concurrently, the calls of one group run in order in the same worker.
+        None keeps the call in the current thread, in order with the other such calls.
+        Every call of a parallel-safe action is a group of its own, the other actions,
+        e.g. Finish or the actions sharing an environment, stay in the current thread.
+
+        :param idx: the index of the call in the step
+        :type idx: int
+        :param agent_act: the action call
+        :type agent_act: AgentAct
+        :return: the group key, None for the current thread
+        :rtype: Hashable
+        """
+        action = self.__find_action__(agent_act.name)
+        if action is not None and action.parallel_safe:
+            return ("action", idx)
+        return None
+
+    def __group_parallel_calls__(self, agent_acts: List[AgentAct]) -> dict[Hashable, List[int]]:
+        """group the indices of the calls which can run concurrently, see __parallel_key__"""
+        groups = {}
+        for idx, agent_act in enumerate(agent_acts):
+            key = self.__parallel_key__(idx, agent_act)
+            if key is not None:
+                groups.setdefault(key, []).append(idx)
+        return groups
+
+    def forward_acts(self, task: TaskPackage, agent_acts: List[AgentAct]) -> List[str]:
+        """forward the actions of one step, the observations are returned in the action order.
+        Independent calls run in a thread pool, the other actions run in order in the
+        current thread, see __parallel_key__.
+
+        :param task: the task which agent receives and solves.
+        :type task: TaskPackage
+        :param agent_acts: the action wrappers for execution.
+        :type agent_acts: List[AgentAct]
+        :return: observations
+        :rtype: List[str]
+        """
+        groups = self.__group_parallel_calls__(agent_acts) if len(agent_acts) > 1 else {}
+        if len(groups) <= 1:
+            return [self.forward(task, agent_act) for agent_act in agent_acts]
+        observations = [None] * len(agent_acts)
+
+        def run_group(indices: List[int]):
+            for idx in indices:
+                observations[idx] = self.forward(task, agent_acts[idx])
+
+        grouped = {idx for indices in groups.values() for idx in indices}
+        with ThreadPoolExecutor(
+            max_workers=min(len(groups), self.max_parallel_actions)
+        ) as executor:
+            # each group runs in a copy of the current context to keep the current span
+            futures = [
+                executor.submit(contextvars.copy_context().run, run_group, indices)
+                for indices in groups.values()
+            ]
+            for idx, agent_act in enumerate(agent_acts):
+                if idx not in grouped:
+                    observations[idx] = self.forward(task, agent_act)
+            for future in futures:
+                future.result()
+        return observations
+
+    async def aforward_acts(
+        self, task: TaskPackage, agent_acts: List[AgentAct]
+    ) -> List[str]:
+        """the awaitable version of forward_acts. Independent calls are gathered.
+
+        :param task: the task which agent receives and solves.
+        :type task: TaskPackage
+        :param agent_acts: the action wrappers for execution.
+        :type agent_acts: List[AgentAct]
+        :return: observations
+        :rtype: List[str]
+        """
+        groups = self.__group_parallel_calls__(agent_acts) if len(agent_acts) > 1 else {}
+        if len(groups) <= 1:
+            return [await self.aforward(task, agent_act) for agent_act in agent_acts]
+        observations = [None] * len(agent_acts)
+
+        async def run_group(indices: List[int]):
+            for idx in indices:
+                observations[idx] = await self.aforward(task, agent_acts[idx])
+
+        grouped = {idx for indices in groups.values() for idx in indices}
+        group_runs = asyncio.gather(*[run_group(indices) for indices in groups.values()])
+        for idx, agent_act in enumerate(agent_acts):
+            if idx not in grouped:
+                observations[idx] = await self.aforward(task, agent_act)
+        await group_runs
+        return observations
+
+    async def aforward(self, task: TaskPackage, agent_act: AgentAct) -> str:
+        """the awaitable version of forward. The action is awaited through BaseAction.__acall__
+
+        :param task: the task which agent receives and solves.
+        :type task: TaskPackage
+        :param agent_act: the action wrapper for execution.
+        :type agent_act: AgentAct
+        :return: observation
+        :rtype: str
+        """
+        action = self.__find_action__(agent_act.name)
+        if action is None:
+            return ACION_NOT_FOUND_MESS
+        start = time.perf_counter()
+        with self.__tracer__().span(
+            "action-call", attributes=self.__action_attributes__(task, action.action_name)
+        ) as action_span:
+            observation = await self.__aguarded_call__(action, agent_act.params, action_span)
+        self.__record_action__(task, action.action_name, start)
+        if action.action_name == FinishAct.action_name:
+            task.answer = observation
+            task.completion = "completed"
         return observation
 
     def add_example(
@@ -264,13 +1045,27 @@ class BaseAgent(ABCAgent):
         """
         self.prompt_gen.add_example(task, action_chain, example_type=example_type)
     
+    def memorize_trajectory(self, task: TaskPackage, example_type: str = "action") -> bool:
+        """add the finished run of task as an example, e.g. once the benchmark rewarded it.
+        Combine with prompt_gen.set_example_retrieval to only prompt the relevant examples.
+
+        :param task: a task executed by this agent
+        :type task: TaskPackage
+        :param example_type: the type of this example, defaults to "action"
+        :type example_type: str, optional
+        :return: whether the task was completed and added
+        :rtype: bool
+        """
+        if task.completion != "completed":
+            return False
+        action_chain = self.short_term_memory.get_action_chain(task)
+        self.add_example(task, list(action_chain), example_type=example_type)
+        return True
+
     def __check_action__(self, action_name:str):
         """check if the action is in the action space
 
         :param action_name: the name of the action
         :type action_name: str
         """
-        for action in self.actions:
-            if act_match(action_name, action):
-                return True
-        return False
\ No newline at end of file
+        return self.__find_action__(action_name) is not None
\ No newline at end of file
@@ -1,6 +1,8 @@
-from typing import List
+import asyncio
+import time
+from contextlib import contextmanager
+from typing import Hashable, List
 
-from agentlite.actions import FinishAct
 from agentlite.agent_prompts import ManagerPromptGen
 from agentlite.agent_prompts.prompt_utils import DEFAULT_PROMPT
 from agentlite.agents.agent_utils import *
@@ -8,6 +10,7 @@ from agentlite.commons import AgentAct, TaskPackage
 from agentlite.commons.AgentAct import ActObsChainType
 from agentlite.llm.agent_llms import BaseLLM
 from agentlite.logging import DefaultLogger
+from agentlite.logging.base import log_event
 from agentlite.logging.terminal_logger import AgentLogger
 
 from .ABCAgent import ABCAgent
@@ -25,6 +28,7 @@ class ManagerAgent(BaseAgent):
         reasoning_type: str = "react",
         TeamAgents: List[ABCAgent] = [],
         logger: AgentLogger = DefaultLogger,
+        multi_call: bool = False,
         **kwargs
     ):
         """ManagerAgent inherits BaseAgent. It has all methods for base agent
@@ -48,6 +52,9 @@ class ManagerAgent(BaseAgent):
         :type TeamAgents: List[ABCAgent], optional
         :param logger: the logger for this agent, defaults to DefaultLogger
         :type logger: AgentLogger, optional
+        :param multi_call: allow the manager to call several team members in one step,
+            e.g. `agent_a[{...}]; agent_b[{...}]`. The calls run in parallel, defaults to False
+        :type multi_call: bool, optional
         """
         super().__init__(
             name=name,
@@ -57,8 +64,12 @@ class ManagerAgent(BaseAgent):
             instruction=instruction,
             reasoning_type=reasoning_type,
             logger=logger,
+            multi_call=multi_call,
+            **kwargs,
         )
         self.team = TeamAgents
+        self.member_index: NameIndex = None
+        self.member_index_key = None
         self.prompt_gen = ManagerPromptGen(
             agent_role=self.role,
             constraint=self.constraint,
@@ -87,54 +98,60 @@ class ManagerAgent(BaseAgent):
         :type LaborAgent: ABCAgent
         """
         self.team.append(LaborAgent)
+        self.member_index = None
 
-    def __next_act__(
+    def __action_prompt__(
         self, task: TaskPackage, action_chain: ActObsChainType
-    ) -> AgentAct:
-        """one-step action generation for manager agent
+    ) -> str:
+        """build the action generation prompt for manager agent, including the team doc
 
         :param task: the next action towards the task
         :type task: TaskPackage
         :param action_chain: history actions and observation of this task from memory
         :type action_chain: ActObsChainType
-        :return: action for agent to execute
-        :rtype: AgentAct
+        :return: the prompt for llm
+        :rtype: str
         """
         labor_agents_doc = {
             labor_agent.name: labor_agent.role for labor_agent in self.team
         }
-        action_prompt = self.prompt_gen.action_prompt(
+        return self.prompt_gen.action_prompt(
             task=task,
             actions=self.actions,
             action_chain=action_chain,
             labor_agents_doc=labor_agents_doc,
+            multi_call=self.multi_call,
+            context_manager=self.context_manager,
         )
-        self.logger.get_prompt(action_prompt)
-        raw_action = self.llm_layer(action_prompt)
-        self.logger.get_llm_output(raw_action)
-        return self.__action_parser__(raw_action)
-
-    def __action_parser__(self, raw_action: str) -> AgentAct:
-        """parse the raw action from llm to AgentAct
-
-        :param raw_action: the raw action from llm
-        :type raw_action: str
-        :return: the parsed action
-        :rtype: AgentAct
-        """
 
-        action_name, args, PARSE_FLAG = parse_action(raw_action)
-        # if action_name match a labor_agent
-        if self.team:
+    def __action_constraint__(self) -> ActionConstraint:
+        """the constraint of the outputs calling the actions or the team members,
+        rebuilt when the action space or the team changes"""
+        constraint_key = (
+            id(self.actions),
+            len(self.actions),
+            id(self.team),
+            len(self.team),
+            self.multi_call,
+        )
+        if self.action_constraint is None or self.action_constraint_key != constraint_key:
+            action_params = self.__action_params__()
             for agent in self.team:
-                if self.agent_match(action_name, agent):
-                    agent_act = AgentAct(name=action_name, params=args)
-
-        # if action_name is action
-        for action in self.actions:
-            if act_match(action_name, action):
-                agent_act = AgentAct(name=action_name, params=args)
-        return agent_act
+                action_params.setdefault(agent.name, [AGENT_CALL_ARG_KEY])
+            self.action_constraint = ActionConstraint(action_params, multi_call=self.multi_call)
+            self.action_constraint_key = constraint_key
+        return self.action_constraint
+
+    def __find_member__(self, agent_name: str) -> ABCAgent:
+        """return the team member matching agent_name, None if no one matches.
+        The name index is rebuilt when the team is replaced or its size changes."""
+        index_key = (id(self.team), len(self.team))
+        if self.member_index is None or self.member_index_key != index_key:
+            self.member_index = NameIndex(
+                self.team, lambda agent: agent.name, fuzzy_matcher=self.fuzzy_matcher
+            )
+            self.member_index_key = index_key
+        return self.member_index.get(agent_name)
 
     def forward(self, task: TaskPackage, agent_act: AgentAct) -> str:
         """forward the action to get the observation or response from other agent
@@ -146,30 +163,71 @@ class ManagerAgent(BaseAgent):
         :return: the observation or response from other agent
         :rtype: str
         """
-        act_found_flag = False
         # if action is labor agent call
-        for agent in self.team:
-            if self.agent_match(agent_act.name, agent):
-                act_found_flag = True
-                new_task_package = self.create_TP(
-                    agent_act.params[AGENT_CALL_ARG_KEY], agent.id
-                )
-                observation = agent(new_task_package)
-                return observation
+        agent = self.__find_member__(agent_act.name)
+        if agent is not None:
+            return self.__call_member__(agent, agent_act, task)
         # if action is inner action
-        for action in self.actions:
-            if act_match(agent_act.name, action):
-                act_found_flag = True
-                observation = action(**agent_act.params)
-                if agent_act.name == FinishAct.action_name:
-                    task.answer = observation
-                    task.completion = "completed"
-        # if not find this action
-        if act_found_flag:
-            return observation
-        else:
-            observation = ACION_NOT_FOUND_MESS
-        return observation
+        return super().forward(task, agent_act)
+
+    def __parallel_key__(self, idx: int, agent_act: AgentAct) -> Hashable:
+        """calls to the same team member are grouped so that one member never runs
+        two tasks at the same time, calls to different members run concurrently"""
+        agent = self.__find_member__(agent_act.name)
+        if agent is not None:
+            return ("member", agent.id)
+        return super().__parallel_key__(idx, agent_act)
+
+    def __call_member__(
+        self, agent: ABCAgent, agent_act: AgentAct, task: TaskPackage = None
+    ) -> str:
+        new_task_package = self.__create_member_task__(agent, agent_act, task)
+        with self.__member_call__(task, agent, new_task_package):
+            return agent(new_task_package)
+
+    @contextmanager
+    def __member_call__(self, task: TaskPackage, agent: ABCAgent, member_task: TaskPackage):
+        """trace and time the call of a team member like an action call"""
+        start = time.perf_counter()
+        attributes = self.__action_attributes__(
+            task, agent.name, member=True, member_task_id=member_task.task_id
+        )
+        with self.__tracer__().span("action-call", attributes=attributes):
+            yield
+        self.__record_action__(task, agent.name, start)
+
+    def __create_member_task__(
+        self, agent: ABCAgent, agent_act: AgentAct, task: TaskPackage = None
+    ) -> TaskPackage:
+        """create the sub-task of task for a team member and log the link"""
+        new_task_package = self.create_TP(agent_act.params[AGENT_CALL_ARG_KEY], agent.id)
+        log_event(
+            self.logger,
+            "create_task",
+            task=new_task_package,
+            parent_task=task,
+            agent_name=self.name,
+        )
+        return new_task_package
+
+    async def aforward(self, task: TaskPackage, agent_act: AgentAct) -> str:
+        """the awaitable version of forward. Labor agents are awaited through BaseAgent.acall
+
+        :param task: the task to forward
+        :type task: TaskPackage
+        :param agent_act: the action to forward
+        :type agent_act: AgentAct
+        :return: the observation or response from other agent
+        :rtype: str
+        """
+        agent = self.__find_member__(agent_act.name)
+        if agent is not None:
+            if isinstance(agent, BaseAgent):
+                new_task_package = self.__create_member_task__(agent, agent_act, task)
+                with self.__member_call__(task, agent, new_task_package):
+                    return await agent.acall(new_task_package)
+            return await asyncio.to_thread(self.__call_member__, agent, agent_act, task)
+        return await super().aforward(task, agent_act)
 
     def create_TP(self, task_ins: str, executor: str) -> TaskPackage:
         """create a task package for labor agent
@@ -182,6 +240,8 @@ class ManagerAgent(BaseAgent):
         :rtype: TaskPackage
         """
         task = TaskPackage(
-            instruction=task_ins, task_creator=self.id, task_executor=executor
+            instruction=task_ins,
+            creator=self.id,
+            executor=executor,
         )
         return task
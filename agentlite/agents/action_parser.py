@@ -0,0 +1,245 @@
+"""parse the actions generated by the llm, e.g. `Search[{"query": "agents"}]`.
+
+The arguments are read as JSON. Arguments which are not valid JSON are repaired
+for the usual llm slips before giving up: single quoted strings, trailing commas,
+unquoted keys and the Python literals True, False and None.
+The first line holding a valid action is used, so an action following a
+thought line is still found and the step is not wasted.
+"""
+
+import json
+import re
+
+ACTION_PATTERN = re.compile(r"(\w+)\[(.+)\]$")
+ACTION_CALL_PATTERN = re.compile(r"\s*(\w+)\[")
+ACTION_TRIGGER_PATTERN = re.compile(r"\s*Action\s*\d*\s*:\s*")
+ACTION_CALL_SEPARATORS = " \t;"
+LINE_STRIP = " .:"
+JSON_LITERALS = {"True": "true", "False": "false", "None": "null"}
+
+
+def repair_json(text: str) -> str:
+    """rewrite the common llm JSON mistakes in one pass: single quoted strings,
+    trailing commas, unquoted keys and Python literals. Valid JSON is kept as is."""
+    out = []
+    pos = 0
+    length = len(text)
+    last = ""  # the last significant character written outside of strings
+    while pos < length:
+        char = text[pos]
+        if char == '"' or char == "'":
+            # copy the string, double quoted
+            end = pos + 1
+            chars = []
+            while end < length and text[end] != char:
+                if text[end] == "\\" and end + 1 < length:
+                    if text[end + 1] == "'":  # \' is not a JSON escape
+                        chars.append("'")
+                    else:
+                        chars.append(text[end : end + 2])
+                    end += 2
+                    continue
+                chars.append('\\"' if text[end] == '"' else text[end])
+                end += 1
+            out.append('"' + "".join(chars) + '"')
+            last = '"'
+            pos = end + 1
+        elif char == ",":
+            # drop the comma if only white space separates it from a closing bracket
+            end = pos + 1
+            while end < length and text[end].isspace():
+                end += 1
+            if end < length and text[end] in "}]":
+                pos += 1
+                continue
+            out.append(char)
+            last = char
+            pos += 1
+        elif char.isalpha() or char == "_":
+            end = pos + 1
+            while end < length and (text[end].isalnum() or text[end] == "_"):
+                end += 1
+            word = text[pos:end]
+            after = end
+            while after < length and text[after].isspace():
+                after += 1
+            if last in ("{", ",") and after < length and text[after] == ":":
+                out.append(f'"{word}"')
+            else:
+                out.append(JSON_LITERALS.get(word, word))
+            last = word[-1]
+            pos = end
+        else:
+            out.append(char)
+            if not char.isspace():
+                last = char
+            pos += 1
+    return "".join(out)
+
+
+def load_arguments(text: str):
+    """the JSON value of the action arguments, repaired if needed.
+    Raises json.JSONDecodeError if text cannot be read even after the repair."""
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return json.loads(repair_json(text))
+
+
+def iter_lines(string: str):
+    """the lines of string stripped like an action line, without the `Action:` trigger"""
+    for line in string.split("\n"):
+        line = line.strip(LINE_STRIP)
+        trigger = ACTION_TRIGGER_PATTERN.match(line)
+        if trigger:
+            line = line[trigger.end() :].strip(LINE_STRIP)
+        if line:
+            yield line
+
+
+def parse_action_line(line: str) -> tuple[str, dict, bool]:
+    """parse one stripped line holding a single action call"""
+    match = ACTION_PATTERN.match(line)
+    if match:
+        try:
+            return match.group(1), load_arguments(match.group(2).strip()), True
+        except json.JSONDecodeError:
+            pass
+    return line, {}, False
+
+
+def first_line(string: str) -> str:
+    return string.strip(" ").strip(".").strip(":").split("\n")[0]
+
+
+def parse_action(string: str) -> tuple[str, dict, bool]:
+    """
+    Parse an action string into an action type and an argument.
+    The first line holding a valid action is parsed. If no line does,
+    (first line, {}, False) is returned.
+    """
+    line = string.strip(LINE_STRIP)
+    if "\n" not in line:  # the usual case, a single action line
+        result = parse_action_line(line)
+        if result[2]:
+            return result
+    for line in iter_lines(string):
+        result = parse_action_line(line)
+        if result[2]:
+            return result
+    return first_line(string), {}, False
+
+
+def find_call_end(line: str, start: int) -> int:
+    """the index of the "]" closing the call arguments starting at start, -1 if not closed.
+    Brackets inside single or double quoted strings are skipped."""
+    depth = 0
+    quote = None
+    pos = start
+    while pos < len(line):
+        char = line[pos]
+        if quote:
+            if char == "\\":
+                pos += 1
+            elif char == quote:
+                quote = None
+        elif char == '"' or char == "'":
+            quote = char
+        elif char in "[{":
+            depth += 1
+        elif char in "}]":
+            if depth == 0:
+                return pos if char == "]" else -1
+            depth -= 1
+        pos += 1
+    return -1
+
+
+def parse_action_calls(line: str) -> list[tuple[str, dict, bool]]:
+    """parse a stripped line of calls separated by ";", empty if any call is invalid"""
+    actions = []
+    pos = 0
+    while pos < len(line):
+        match = ACTION_CALL_PATTERN.match(line, pos)
+        if not match:
+            return []
+        end = find_call_end(line, match.end())
+        if end < 0:
+            return []
+        try:
+            arguments = load_arguments(line[match.end() : end])
+        except json.JSONDecodeError:
+            return []
+        actions.append((match.group(1), arguments, True))
+        pos = end + 1
+        while pos < len(line) and line[pos] in ACTION_CALL_SEPARATORS:
+            pos += 1
+    return actions
+
+
+def parse_actions(string: str) -> list[tuple[str, dict, bool]]:
+    """
+    Parse a multi-call action string such as `A[{...}]; B[{...}]` into a list of
+    (action type, arguments, PARSE_FLAG). Calls are separated by ";".
+    The first line holding valid calls is parsed, otherwise falls back to parse_action.
+    """
+    for line in iter_lines(string):
+        actions = parse_action_calls(line)
+        if actions:
+            return actions
+    return [parse_action(string)]
+
+
+# actions ending the task, never used as the example output, see InnerActions.FinishAction
+TERMINAL_ACTIONS = frozenset(["Finish"])
+
+# a JSON string, number or literal, the values of the action params in the guided output
+JSON_VALUE_REGEX = r'(?:"(?:[^"\\\n]|\\.)*"|-?\d+(?:\.\d+)?|true|false|null)'
+
+
+def regex_escape(text: str) -> str:
+    # spaces need no escape, and not every regex engine of the servers accepts "\ "
+    return re.escape(text).replace("\\ ", " ")
+
+
+class ActionConstraint:
+    """the regular language of the valid action outputs `Name[{"param": value, ...}]`,
+    for backends which can constrain their decoding to a regex, e.g. the guided_regex of
+    vLLM servers. Every action takes all its params in the order of its params doc,
+    formatted as json.dumps does, so the guided output always parses.
+    Param values are JSON strings, numbers, booleans or null.
+
+    :param action_params: the param names of every action name
+    :type action_params: dict[str, list[str]]
+    :param multi_call: allow several calls separated by "; ", defaults to False
+    :type multi_call: bool, optional
+    """
+
+    def __init__(self, action_params: dict[str, list[str]], multi_call: bool = False) -> None:
+        self.action_params = action_params
+        self.multi_call = multi_call
+        call_regex = "(?:" + "|".join(
+            self.__call_regex__(name, params) for name, params in action_params.items()
+        ) + ")"
+        if multi_call:
+            self.regex = f"{call_regex}(?:; {call_regex})*"
+        else:
+            self.regex = call_regex
+        self.pattern = re.compile(self.regex)
+
+    def __call_regex__(self, name: str, params: list[str]) -> str:
+        params_regex = ", ".join(
+            regex_escape(json.dumps(param) + ": ") + JSON_VALUE_REGEX for param in params
+        )
+        return regex_escape(f"{name}[{{") + params_regex + regex_escape("}]")
+
+    def matches(self, text: str) -> bool:
+        return self.pattern.fullmatch(text.strip()) is not None
+
+    def example(self) -> str:
+        """a valid output, the first non-terminal action by name with empty string params.
+        The choice does not depend on the order of the actions, which may come from a set."""
+        names = sorted(name for name in self.action_params if name not in TERMINAL_ACTIONS)
+        name = names[0] if names else min(self.action_params)
+        params = self.action_params[name]
+        return f"{name}[{json.dumps({param: '' for param in params})}]"
@@ -1,9 +1,20 @@
 """functions or objects shared by agents"""
 
+import asyncio
+import contextvars
+import difflib
 import re
-import json
+import threading
+from typing import Any, AsyncIterator, Callable, Iterator, List
 
 from agentlite.actions.BaseAction import BaseAction
+from agentlite.agent_prompts.prompt_utils import AGENT_CALL_ARG_KEY
+from agentlite.agents.action_parser import (
+    ActionConstraint,
+    parse_action,
+    parse_actions,
+    repair_json,
+)
 
 
 def name_checking(name: str):
@@ -22,34 +33,172 @@ def act_match(input_act_name: str, act: BaseAction):
     return False
 
 
-def parse_action(string: str) -> tuple[str, dict, bool]:
+def normalize_name(name: str) -> str:
+    """lower case name without white space, underscores and punctuation"""
+    return re.sub(r"[\W_]+", "", name).lower()
+
+
+class NormalizedMatcher:
+    """fuzzy match of names ignoring case, white space, underscores and punctuation"""
+
+    def build(self, names: List[str]):
+        self.normalized = {}
+        for name in names:
+            self.normalized.setdefault(normalize_name(name), name)
+
+    def match(self, name: str) -> str:
+        return self.normalized.get(normalize_name(name))
+
+
+class CloseMatcher(NormalizedMatcher):
+    """fuzzy match of names by normalized name, then by the closest normalized name
+    with a similarity ratio of at least cutoff"""
+
+    def __init__(self, cutoff: float = 0.8) -> None:
+        self.cutoff = cutoff
+
+    def match(self, name: str) -> str:
+        normalized_name = normalize_name(name)
+        if normalized_name in self.normalized:
+            return self.normalized[normalized_name]
+        close = difflib.get_close_matches(
+            normalized_name, list(self.normalized), n=1, cutoff=self.cutoff
+        )
+        return self.normalized[close[0]] if close else None
+
+
+class NameIndex:
+    """name-indexed lookup of actions or agents. The first item wins if two share a name.
+    Names without an exact match are resolved by the fuzzy matcher, whose index
+    is built together with this one.
+
+    :param items: the actions or agents
+    :type items: list
+    :param get_name: return the name of an item
+    :type get_name: Callable[[Any], str]
+    :param fuzzy_matcher: the fallback for names without an exact match, defaults to None
+    :type fuzzy_matcher: NormalizedMatcher, optional
+    """
+
+    def __init__(
+        self, items: list, get_name: Callable[[Any], str], fuzzy_matcher=None
+    ) -> None:
+        self.items = {}
+        for item in items:
+            self.items.setdefault(get_name(item), item)
+        self.fuzzy_matcher = fuzzy_matcher
+        if fuzzy_matcher is not None:
+            fuzzy_matcher.build(list(self.items))
+
+    def get(self, name: str):
+        item = self.items.get(name)
+        if item is None and self.fuzzy_matcher is not None:
+            matched_name = self.fuzzy_matcher.match(name)
+            if matched_name is not None:
+                item = self.items[matched_name]
+        return item
+
+    def __contains__(self, name: str) -> bool:
+        return self.get(name) is not None
+
+
+def stream_until_action(
+    chunks: Iterator[str], action_complete: Callable[[str], bool] = None
+) -> str:
     """
-    Parse an action string into an action type and an argument.
+    Consume a stream of llm output chunks until action_complete tells that the text
+    already holds a complete action or the stream ends, then close the stream.
+    Only the first valid action is used by parse_action, so the rest is never generated.
+    action_complete is only checked once a chunk may close a call or a line.
     """
+    text = ""
+    try:
+        for chunk in chunks:
+            text += chunk
+            if action_complete and ("]" in chunk or "\n" in chunk) and action_complete(text):
+                break
+    finally:
+        if hasattr(chunks, "close"):
+            chunks.close()
+    return text
 
-    string = string.strip(" ").strip(".").strip(":").split("\n")[0]
-    pattern = r"^(\w+)\[(.+)\]$"
-    match = re.match(pattern, string)
-    PARSE_FLAG = True
 
-    if match:
-        action_type = match.group(1).strip()
-        arguments = match.group(2).strip()
-        try:
-            arguments = json.loads(arguments)
-        except json.JSONDecodeError:
-            PARSE_FLAG = False
-            return string, {}, PARSE_FLAG
-        return action_type, arguments, PARSE_FLAG
-    else:
-        PARSE_FLAG = False
-        return string, {}, PARSE_FLAG
+async def astream_until_action(
+    chunks: AsyncIterator[str], action_complete: Callable[[str], bool] = None
+) -> str:
+    """the awaitable version of stream_until_action"""
+    text = ""
+    try:
+        async for chunk in chunks:
+            text += chunk
+            if action_complete and ("]" in chunk or "\n" in chunk) and action_complete(text):
+                break
+    finally:
+        if hasattr(chunks, "aclose"):
+            await chunks.aclose()
+    return text
 
 
-AGENT_CALL_ARG_KEY = "Task"
 NO_TEAM_MEMEBER_MESS = (
     """No team member for manager agent. Please check your manager agent team."""
 )
 ACION_NOT_FOUND_MESS = (
     """"This is the wrong action to call. Please check your available action list."""
 )
+ACTION_TIMEOUT_MESS = """ActionTimeout: {action} did not respond within {timeout:g}s after {attempts} attempt(s). Try another action or other parameters."""
+ACTION_ERROR_MESS = """ActionError: {action} failed with {error_type}: {error}. Try another action or other parameters."""
+ACTION_CIRCUIT_OPEN_MESS = """ActionUnavailable: {action} failed repeatedly and is paused for {retry_after:.0f}s. Try another action."""
+
+
+class ActionTimeout(TimeoutError):
+    """the call did not return within its timeout. Unlike a TimeoutError raised by the
+    called function itself, it is the one retried by the action guard."""
+
+
+def call_with_timeout(func: Callable, timeout: float = None, **kwargs) -> Any:
+    """call func(**kwargs) and return its result, raise ActionTimeout after timeout seconds.
+    The call runs in a daemon thread which is abandoned on timeout, as a Python thread
+    cannot be killed: a hung call never blocks the agent nor the interpreter exit.
+    Exceptions of func are raised again in the caller.
+
+    :param func: the function to call
+    :type func: Callable
+    :param timeout: seconds to wait for the result, defaults to None (call in the current thread)
+    :type timeout: float, optional
+    """
+    if timeout is None:
+        return func(**kwargs)
+    outcome = {}
+
+    def run():
+        try:
+            outcome["result"] = func(**kwargs)
+        except BaseException as error:
+            outcome["error"] = error
+
+    # the call keeps the context of the caller, e.g. the current span
+    worker = threading.Thread(target=contextvars.copy_context().run, args=(run,), daemon=True)
+    worker.start()
+    worker.join(timeout)
+    if worker.is_alive():
+        raise ActionTimeout(f"no result after {timeout}s")
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
+
+
+async def acall_with_timeout(func: Callable, timeout: float = None, **kwargs) -> Any:
+    """the awaitable version of call_with_timeout, func(**kwargs) returns an awaitable.
+    The call is cancelled on timeout."""
+    if timeout is None:
+        return await func(**kwargs)
+    call = asyncio.ensure_future(func(**kwargs))
+    try:
+        done, _ = await asyncio.wait({call}, timeout=timeout)
+    except asyncio.CancelledError:
+        call.cancel()
+        raise
+    if not done:
+        call.cancel()
+        raise ActionTimeout(f"no result after {timeout}s")
+    return call.result()
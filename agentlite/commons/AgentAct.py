@@ -1,3 +1,5 @@
+import json
+
 from pydantic import BaseModel
 
 
@@ -14,5 +16,71 @@ class AgentAct(BaseModel):
     desc: str = None
     params: dict = None
 
+    @property
+    def params_str(self) -> str:
+        """the params serialized as in the prompts"""
+        return json.dumps(self.params)
+
+
+class AgentActLite:
+    """the lightweight action built by the agents at every step. It has the attributes of
+    AgentAct without the pydantic validation, and serializes its params only once.
+    The params should not be modified after the first use of params_str.
+
+    :param name: action name
+    :type name: str
+    :param params: the action params, defaults to None
+    :type params: dict, optional
+    :param desc: the description/documents of this action, defaults to None
+    :type desc: str, optional
+    """
+
+    __slots__ = ("name", "params", "desc", "_params_str")
+
+    def __init__(self, name: str, params: dict = None, desc: str = None) -> None:
+        self.name = name
+        self.params = params
+        self.desc = desc
+        self._params_str = None
+
+    @property
+    def params_str(self) -> str:
+        if self._params_str is None:
+            self._params_str = json.dumps(self.params)
+        return self._params_str
+
+    @classmethod
+    def from_agent_act(cls, act: AgentAct) -> "AgentActLite":
+        return cls(name=act.name, params=act.params, desc=act.desc)
+
+    def to_agent_act(self) -> AgentAct:
+        """the validated pydantic AgentAct, e.g. to hand the action out of the library"""
+        if self.desc is None:  # AgentAct validates desc as a str when it is given
+            return AgentAct(name=self.name, params=self.params)
+        return AgentAct(name=self.name, params=self.params, desc=self.desc)
+
+    def as_dict(self) -> dict:
+        return {"name": self.name, "desc": self.desc, "params": self.params}
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (AgentActLite, AgentAct)):
+            return (self.name, self.params, self.desc) == (other.name, other.params, other.desc)
+        return NotImplemented
+
+    __hash__ = None  # mutable params, like the pydantic model
+
+    def __repr__(self):
+        return f"AgentActLite(name={self.name!r}, params={self.params!r}, desc={self.desc!r})"
+
+
+def to_agent_act(act) -> AgentAct:
+    """convert an AgentActLite or an AgentAct to AgentAct"""
+    return act.to_agent_act() if isinstance(act, AgentActLite) else act
+
+
+def to_act_lite(act) -> AgentActLite:
+    """convert an AgentAct or an AgentActLite to AgentActLite"""
+    return act if isinstance(act, AgentActLite) else AgentActLite.from_agent_act(act)
+
 
 ActObsChainType = list[tuple[AgentAct, str]]
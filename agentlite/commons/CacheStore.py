@@ -0,0 +1,130 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+CACHE_MISS = object()  # returned by the stores when a key is absent or expired
+
+
+class CacheStats:
+    """hit/miss counters of a cache. bytes_saved counts the size of the values served from cache."""
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+
+    def hit(self, value: Any):
+        self.hits += 1
+        self.bytes_saved += len(str(value).encode("utf-8"))
+
+    def miss(self):
+        self.misses += 1
+
+    def as_dict(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "bytes_saved": self.bytes_saved}
+
+    def __str__(self):
+        total = self.hits + self.misses
+        hit_rate = self.hits / total if total else 0.0
+        return f"""hits: {self.hits}, misses: {self.misses}, hit rate: {hit_rate:.2%}, bytes saved: {self.bytes_saved}"""
+
+
+class LRUCacheStore:
+    """in-memory key-value store with least-recently-used eviction and an optional time-to-live
+
+    :param max_size: the maximum number of entries, defaults to 1024
+    :type max_size: int, optional
+    :param ttl: seconds before an entry expires, defaults to None (never)
+    :type ttl: float, optional
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = None) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries: OrderedDict[str, tuple[Any, float]] = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return CACHE_MISS
+            value, expire_at = entry
+            if expire_at is not None and expire_at < time.time():
+                del self.entries[key]
+                return CACHE_MISS
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any):
+        expire_at = time.time() + self.ttl if self.ttl is not None else None
+        with self.lock:
+            self.entries[key] = (value, expire_at)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class SQLiteCacheStore:
+    """persistent key-value store in a SQLite file. Values are stored as JSON,
+    so they should be JSON serializable.
+
+    :param path: the SQLite file path
+    :type path: str
+    :param table: the table name, defaults to "cache"
+    :type table: str, optional
+    :param ttl: seconds before an entry expires, defaults to None (never)
+    :type ttl: float, optional
+    """
+
+    def __init__(self, path: str, table: str = "cache", ttl: float = None) -> None:
+        self.path = path
+        self.table = table
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.lock, self.conn:
+            self.conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} "
+                "(key TEXT PRIMARY KEY, value TEXT, created_at REAL)"
+            )
+
+    def get(self, key: str) -> Any:
+        with self.lock:
+            row = self.conn.execute(
+                f"SELECT value, created_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return CACHE_MISS
+        value, created_at = row
+        if self.ttl is not None and created_at + self.ttl < time.time():
+            return CACHE_MISS
+        return json.loads(value)
+
+    def set(self, key: str, value: Any):
+        with self.lock, self.conn:
+            self.conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, created_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), time.time()),
+            )
+
+    def clear(self):
+        with self.lock, self.conn:
+            self.conn.execute(f"DELETE FROM {self.table}")
+
+    def close(self):
+        self.conn.close()
+
+    def __len__(self):
+        with self.lock:
+            return self.conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
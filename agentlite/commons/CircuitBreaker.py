@@ -0,0 +1,65 @@
+import threading
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """stop calling a failing tool for a while. After failure_threshold consecutive failures
+    the circuit opens and allow() returns False for reset_timeout seconds. Then one trial
+    call is let through (half open): a success closes the circuit, a failure opens it again.
+
+    :param failure_threshold: the consecutive failures opening the circuit, defaults to 5
+    :type failure_threshold: int, optional
+    :param reset_timeout: seconds before a trial call is allowed in an open circuit, defaults to 30.0
+    :type reset_timeout: float, optional
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.trial_running = False
+        self.lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return CLOSED
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return OPEN
+
+    def allow(self) -> bool:
+        """whether a call may go through. In half open state only one trial call is allowed."""
+        with self.lock:
+            state = self.state
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self.trial_running:
+                self.trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_running = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.trial_running or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self.trial_running = False
+
+    def retry_after(self) -> float:
+        """seconds until a trial call is allowed, 0.0 if calls are allowed"""
+        with self.lock:
+            if self.opened_at is None:
+                return 0.0
+            return max(self.reset_timeout - (time.monotonic() - self.opened_at), 0.0)
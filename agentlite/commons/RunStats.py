@@ -0,0 +1,116 @@
+import threading
+import time
+from contextlib import contextmanager
+
+# the phases of one agent step
+STEP_PHASES = ["prompt", "llm", "parse", "action", "memory"]
+
+
+class RunStats:
+    """latency and size counters of a task run, or of all the runs of an agent when merged.
+    Times are in seconds. `overhead` is the wall time spent outside the timed phases,
+    e.g. logging.
+
+    :param task_id: the task of this run, defaults to None for the aggregate of an agent
+    :type task_id: str, optional
+    :param agent_name: the agent executing the task, defaults to None
+    :type agent_name: str, optional
+    """
+
+    def __init__(self, task_id: str = None, agent_name: str = None) -> None:
+        self.task_id = task_id
+        self.agent_name = agent_name
+        self.tasks = 0
+        self.steps = 0
+        self.phase_time = {phase: 0.0 for phase in STEP_PHASES}
+        self.action_time: dict[str, float] = {}
+        self.action_calls: dict[str, int] = {}
+        self.llm_calls = 0
+        self.prompt_chars = 0
+        self.prompt_tokens = 0
+        self.completion_chars = 0
+        self.completion_tokens = 0
+        self.wall_time = 0.0
+        self.start_time = time.perf_counter()
+        self.lock = threading.Lock()  # team members may report actions from threads
+
+    @contextmanager
+    def timer(self, phase: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phase_time[phase] += time.perf_counter() - start
+
+    def add_llm_call(
+        self,
+        prompt_chars: int,
+        completion_chars: int,
+        prompt_tokens: int,
+        completion_tokens: int,
+    ):
+        self.llm_calls += 1
+        self.prompt_chars += prompt_chars
+        self.completion_chars += completion_chars
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+
+    def add_action(self, action_name: str, seconds: float):
+        with self.lock:
+            self.action_time[action_name] = self.action_time.get(action_name, 0.0) + seconds
+            self.action_calls[action_name] = self.action_calls.get(action_name, 0) + 1
+
+    def finish(self):
+        """stop the wall clock of this run"""
+        self.tasks = 1
+        self.wall_time = time.perf_counter() - self.start_time
+
+    def merge(self, other: "RunStats"):
+        """add the counters of another run into this one"""
+        with self.lock:
+            self.tasks += other.tasks
+            self.steps += other.steps
+            for phase, seconds in other.phase_time.items():
+                self.phase_time[phase] = self.phase_time.get(phase, 0.0) + seconds
+            for name, seconds in other.action_time.items():
+                self.action_time[name] = self.action_time.get(name, 0.0) + seconds
+            for name, calls in other.action_calls.items():
+                self.action_calls[name] = self.action_calls.get(name, 0) + calls
+            self.llm_calls += other.llm_calls
+            self.prompt_chars += other.prompt_chars
+            self.prompt_tokens += other.prompt_tokens
+            self.completion_chars += other.completion_chars
+            self.completion_tokens += other.completion_tokens
+            self.wall_time += other.wall_time
+
+    @property
+    def overhead(self) -> float:
+        return max(self.wall_time - sum(self.phase_time.values()), 0.0)
+
+    def as_dict(self) -> dict:
+        """flat dict of the counters, e.g. for a metrics sink or a pandas row"""
+        stats = {
+            "task_id": self.task_id,
+            "agent_name": self.agent_name,
+            "tasks": self.tasks,
+            "steps": self.steps,
+            "llm_calls": self.llm_calls,
+            "prompt_chars": self.prompt_chars,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_chars": self.completion_chars,
+            "completion_tokens": self.completion_tokens,
+            "wall_time": self.wall_time,
+            "overhead_time": self.overhead,
+        }
+        for phase, seconds in self.phase_time.items():
+            stats[f"{phase}_time"] = seconds
+        for name, seconds in self.action_time.items():
+            stats[f"action.{name}.time"] = seconds
+            stats[f"action.{name}.calls"] = self.action_calls[name]
+        return stats
+
+    def __str__(self):
+        phases = ", ".join(
+            f"{phase}: {seconds:.3f}s" for phase, seconds in self.phase_time.items()
+        )
+        return f"""Agent {self.agent_name} Task {self.task_id}: {self.tasks} tasks, {self.steps} steps, wall: {self.wall_time:.3f}s, {phases}, overhead: {self.overhead:.3f}s, llm calls: {self.llm_calls}, prompt tokens: {self.prompt_tokens}, completion tokens: {self.completion_tokens}"""
@@ -1,18 +1,47 @@
+import itertools
+import os
+import threading
 import time
-import uuid
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+
+class TaskIdGenerator:
+    """cheap unique task ids, `<node>-<counter>`. The node is random per process and
+    the counter increases monotonically, so ids sort by creation within a process."""
+
+    def __init__(self) -> None:
+        self.reset()
+        if hasattr(os, "register_at_fork"):
+            # a forked worker must not repeat the ids of its parent
+            os.register_at_fork(after_in_child=self.reset)
+
+    def reset(self):
+        self.lock = threading.Lock()
+        self.node = os.urandom(6).hex()
+        self.counter = itertools.count()
+
+    def __call__(self) -> str:
+        with self.lock:
+            return f"{self.node}-{next(self.counter):08x}"
+
+
+new_task_id = TaskIdGenerator()
+
+
+def new_timestamp() -> str:
+    return str(time.time())
 
 
 class TaskPackage(BaseModel):
     instruction: str
     completion: str = "active"
     creator: str = ""
-    timestamp: str = time.time()
+    timestamp: str = Field(default_factory=new_timestamp)
     answer: str = ""
     executor: str = ""
     priority: int = 5
-    task_id: str = str(uuid.uuid4())
+    task_id: str = Field(default_factory=new_task_id)
 
     def __str__(self):
         return f"""Task ID: {self.task_id}\nInstruction: {self.instruction}\nTask Creator: {self.creator}\nTask Completion:{self.completion}\nAnswer: {self.answer}\nTask Executor: {self.executor}"""
@@ -0,0 +1,157 @@
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Dict, List, Set
+
+from .TaskPackage import TaskPackage
+
+
+class TaskRecord:
+    """what the registry keeps of a task: its ids and its indexed status"""
+
+    __slots__ = ("task_id", "creator", "executor", "status")
+
+    def __init__(self, task_id: str, creator: str, executor: str, status: str) -> None:
+        self.task_id = task_id
+        self.creator = creator
+        self.executor = executor
+        self.status = status
+
+    def __repr__(self):
+        return f"TaskRecord({self.task_id}, creator={self.creator}, executor={self.executor}, status={self.status})"
+
+
+class TaskRegistry:
+    """the tasks of the running agents, indexed by task_id, creator, executor and completion
+    status. The agents register a task when it is assigned and update it when its execution
+    ends, with a terminal status even if the run stopped unfinished or raised.
+    Only a TaskRecord is kept per task, the TaskPackages are referenced weakly, so the
+    get methods return the tasks still alive elsewhere, e.g. in an agent memory.
+    Finished records are forgotten oldest first beyond max_finished, and active records
+    oldest first beyond max_active, e.g. tasks of runs which never ended.
+
+    :param max_finished: the maximum number of finished tasks kept, defaults to 10000
+    :type max_finished: int, optional
+    :param max_active: the maximum number of active tasks kept, defaults to 10000
+    :type max_active: int, optional
+    """
+
+    def __init__(self, max_finished: int = 10000, max_active: int = 10000) -> None:
+        self.max_finished = max_finished
+        self.max_active = max_active
+        self.records: Dict[str, TaskRecord] = {}
+        self.tasks: weakref.WeakValueDictionary[str, TaskPackage] = weakref.WeakValueDictionary()
+        self.by_creator: Dict[str, Set[str]] = {}
+        self.by_executor: Dict[str, Set[str]] = {}
+        self.by_status: Dict[str, Set[str]] = {}
+        self.finished: OrderedDict[str, None] = OrderedDict()
+        self.active: OrderedDict[str, None] = OrderedDict()
+        self.lock = threading.RLock()
+
+    def register(self, task: TaskPackage):
+        """add task, replacing a registered task with the same task_id"""
+        with self.lock:
+            if task.task_id in self.records:
+                self.__unindex__(task.task_id)
+            self.records[task.task_id] = TaskRecord(
+                task.task_id, task.creator, task.executor, task.completion
+            )
+            self.tasks[task.task_id] = task
+            self.by_creator.setdefault(task.creator, set()).add(task.task_id)
+            self.by_executor.setdefault(task.executor, set()).add(task.task_id)
+            self.__index_status__(task.task_id, task.completion)
+
+    def update(self, task: TaskPackage, status: str = None):
+        """re-index the status of task after it changed, registering task if unknown
+
+        :param task: the task
+        :type task: TaskPackage
+        :param status: the indexed status, defaults to None (task.completion). The agents
+            index the runs ending with an active task as "incomplete" or "failed".
+        :type status: str, optional
+        """
+        status = status or task.completion
+        with self.lock:
+            if self.tasks.get(task.task_id) is not task:
+                self.register(task)
+            record = self.records[task.task_id]
+            if record.status != status:
+                self.by_status[record.status].discard(task.task_id)
+                self.__index_status__(task.task_id, status)
+
+    def __index_status__(self, task_id: str, status: str):
+        self.records[task_id].status = status
+        self.by_status.setdefault(status, set()).add(task_id)
+        if status != "active":
+            self.active.pop(task_id, None)
+            self.finished[task_id] = None
+            while len(self.finished) > self.max_finished:
+                self.remove(next(iter(self.finished)))
+        else:
+            self.finished.pop(task_id, None)
+            self.active[task_id] = None
+            while len(self.active) > self.max_active:
+                self.remove(next(iter(self.active)))
+
+    def __unindex__(self, task_id: str):
+        record = self.records.pop(task_id)
+        self.tasks.pop(task_id, None)
+        self.by_creator[record.creator].discard(task_id)
+        self.by_executor[record.executor].discard(task_id)
+        self.by_status[record.status].discard(task_id)
+        self.finished.pop(task_id, None)
+        self.active.pop(task_id, None)
+
+    def remove(self, task_id: str):
+        with self.lock:
+            if task_id in self.records:
+                self.__unindex__(task_id)
+
+    def get(self, task_id: str) -> TaskPackage:
+        """the task with task_id, None if unknown or no longer alive"""
+        return self.tasks.get(task_id)
+
+    def get_record(self, task_id: str) -> TaskRecord:
+        return self.records.get(task_id)
+
+    def __select__(self, index: Dict[str, Set[str]], key: str) -> List[TaskPackage]:
+        with self.lock:
+            tasks = [self.tasks.get(task_id) for task_id in index.get(key, ())]
+        return [task for task in tasks if task is not None]
+
+    def get_by_creator(self, creator: str) -> List[TaskPackage]:
+        return self.__select__(self.by_creator, creator)
+
+    def get_by_executor(self, executor: str) -> List[TaskPackage]:
+        return self.__select__(self.by_executor, executor)
+
+    def get_by_status(self, completion: str) -> List[TaskPackage]:
+        """the tasks with completion status, as of their last register or update"""
+        return self.__select__(self.by_status, completion)
+
+    def active_tasks(self) -> List[TaskPackage]:
+        return self.get_by_status("active")
+
+    def clear(self):
+        with self.lock:
+            self.records.clear()
+            self.tasks.clear()
+            self.by_creator.clear()
+            self.by_executor.clear()
+            self.by_status.clear()
+            self.finished.clear()
+            self.active.clear()
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self.records
+
+    def __len__(self):
+        return len(self.records)
+
+
+# the process-wide registry used by the agents
+TASK_REGISTRY = TaskRegistry()
+
+
+def get_task_registry() -> TaskRegistry:
+    return TASK_REGISTRY
@@ -1,2 +1,5 @@
-from .AgentAct import ActObsChainType, AgentAct
+from .AgentAct import ActObsChainType, AgentAct, AgentActLite
+from .CircuitBreaker import CircuitBreaker
+from .RunStats import RunStats
 from .TaskPackage import TaskPackage
+from .TaskRegistry import TaskRegistry, get_task_registry
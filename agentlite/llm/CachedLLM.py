@@ -0,0 +1,130 @@
+import hashlib
+import json
+from typing import AsyncIterator, Iterator, List
+
+from agentlite.commons.CacheStore import (
+    CACHE_MISS,
+    CacheStats,
+    LRUCacheStore,
+    SQLiteCacheStore,
+)
+from agentlite.llm.agent_llms import BaseLLM
+
+
+class CachedLLM(BaseLLM):
+    """wrap any BaseLLM with a response cache. The key is the hash of
+    (llm_name, temperature, max_tokens, stop, prompt). Responses are kept in an in-memory LRU
+    and, if cache_path is given, in a SQLite file so that they survive restarts.
+
+    :param llm: the wrapped language model
+    :type llm: BaseLLM
+    :param max_size: the maximum number of responses kept in memory, defaults to 1024
+    :type max_size: int, optional
+    :param cache_path: the SQLite file for persisting responses, defaults to None
+    :type cache_path: str, optional
+    """
+
+    def __init__(self, llm: BaseLLM, max_size: int = 1024, cache_path: str = None) -> None:
+        self.llm = llm
+        self.llm_name = llm.llm_name
+        self.context_len = llm.context_len
+        self.stop = llm.stop
+        self.max_tokens = llm.max_tokens
+        self.temperature = llm.temperature
+        self.end_of_prompt = llm.end_of_prompt
+        self.max_concurrency = llm.max_concurrency
+        self.supports_constrained = llm.supports_constrained
+        self.memory_cache = LRUCacheStore(max_size=max_size)
+        self.disk_cache = SQLiteCacheStore(cache_path, table="llm_cache") if cache_path else None
+        self.stats = CacheStats()
+
+    def cache_key(self, prompt: str, *extra) -> str:
+        key_items = [self.llm_name, self.temperature, self.max_tokens, self.stop, prompt, *extra]
+        return hashlib.sha256(json.dumps(key_items).encode("utf-8")).hexdigest()
+
+    def lookup(self, key: str):
+        """return the cached response or CACHE_MISS, updating the stats"""
+        response = self.memory_cache.get(key)
+        if response is CACHE_MISS and self.disk_cache is not None:
+            response = self.disk_cache.get(key)
+            if response is not CACHE_MISS:
+                self.memory_cache.set(key, response)
+        if response is CACHE_MISS:
+            self.stats.miss()
+        else:
+            self.stats.hit(response)
+        return response
+
+    def store(self, key: str, response: str):
+        self.memory_cache.set(key, response)
+        if self.disk_cache is not None:
+            self.disk_cache.set(key, response)
+
+    def run(self, prompt: str):
+        key = self.cache_key(prompt)
+        response = self.lookup(key)
+        if response is CACHE_MISS:
+            response = self.llm.run(prompt)
+            self.store(key, response)
+        return response
+
+    async def arun(self, prompt: str):
+        key = self.cache_key(prompt)
+        response = self.lookup(key)
+        if response is CACHE_MISS:
+            response = await self.llm.arun(prompt)
+            self.store(key, response)
+        return response
+
+    def run_constrained(self, prompt: str, constraint) -> str:
+        key = self.cache_key(prompt, constraint.regex)
+        response = self.lookup(key)
+        if response is CACHE_MISS:
+            response = self.llm.run_constrained(prompt, constraint)
+            self.store(key, response)
+        return response
+
+    async def arun_constrained(self, prompt: str, constraint) -> str:
+        key = self.cache_key(prompt, constraint.regex)
+        response = self.lookup(key)
+        if response is CACHE_MISS:
+            response = await self.llm.arun_constrained(prompt, constraint)
+            self.store(key, response)
+        return response
+
+    def run_batch(self, prompts: List[str]) -> List[str]:
+        # only the missed prompts go to the wrapped llm, as one batch
+        keys = [self.cache_key(prompt) for prompt in prompts]
+        responses = [self.lookup(key) for key in keys]
+        missed = [idx for idx, response in enumerate(responses) if response is CACHE_MISS]
+        if missed:
+            outputs = self.llm.run_batch([prompts[idx] for idx in missed])
+            for idx, output in zip(missed, outputs):
+                responses[idx] = output
+                self.store(keys[idx], output)
+        return responses
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        # a stream closed early holds a partial output, only complete outputs are stored
+        key = self.cache_key(prompt)
+        response = self.lookup(key)
+        if response is not CACHE_MISS:
+            yield response
+            return
+        chunks = []
+        for chunk in self.llm.stream(prompt):
+            chunks.append(chunk)
+            yield chunk
+        self.store(key, "".join(chunks))
+
+    async def astream(self, prompt: str) -> AsyncIterator[str]:
+        key = self.cache_key(prompt)
+        response = self.lookup(key)
+        if response is not CACHE_MISS:
+            yield response
+            return
+        chunks = []
+        async for chunk in self.llm.astream(prompt):
+            chunks.append(chunk)
+            yield chunk
+        self.store(key, "".join(chunks))
@@ -15,4 +15,22 @@ class LLMConfig:
         self.api_key: str = os.environ.get("OPENAI_API_KEY", "EMPTY")
         self.base_url = None
         self.provider = None
+        self.use_cache = False  # wrap the backend with CachedLLM
+        self.cache_size = 1024  # number of responses kept in memory by CachedLLM
+        self.cache_path = None  # SQLite file for persisting cached responses
+        self.timeout = 60.0  # per-request timeout in seconds
+        self.max_retries = 3  # retries with exponential backoff on 429/5xx
+        self.pool_size = 16  # maximum open connections of the shared http pool
+        self.max_concurrency = 8  # maximum concurrent requests of a run_batch call
+        self.guided_decoding = False  # the server takes a guided_regex, e.g. vLLM
         self.__dict__.update(config_dict)
+
+    def config_key(self) -> tuple:
+        """a hashable key of the configuration, used to reuse llm backends"""
+        return tuple(
+            sorted(
+                (key, repr(value))
+                for key, value in self.__dict__.items()
+                if key != "config_dict"
+            )
+        )
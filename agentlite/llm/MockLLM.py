@@ -0,0 +1,37 @@
+from typing import List
+
+from agentlite.llm.agent_llms import BaseLLM
+from agentlite.llm.LLMConfig import LLMConfig
+
+
+class MockLLM(BaseLLM):
+    """offline llm returning scripted outputs in order, for tests and examples.
+    It emulates guided decoding: run_constrained returns the scripted output if it
+    matches the constraint, otherwise the constraint example, which is always valid.
+
+    :param outputs: the outputs returned one per call, the last one is repeated
+    :type outputs: List[str]
+    :param llm_config: the llm configuration, defaults to LLMConfig({"llm_name": "mock"})
+    :type llm_config: LLMConfig, optional
+    """
+
+    supports_constrained = True
+
+    def __init__(self, outputs: List[str], llm_config: LLMConfig = None) -> None:
+        super().__init__(llm_config or LLMConfig({"llm_name": "mock"}))
+        self.outputs = list(outputs)
+        self.prompts: List[str] = []  # the received prompts
+        self.num_repaired = 0  # outputs replaced to satisfy a constraint
+
+    def run(self, prompt: str):
+        self.prompts.append(prompt)
+        if len(self.outputs) > 1:
+            return self.outputs.pop(0)
+        return self.outputs[0]
+
+    def run_constrained(self, prompt: str, constraint) -> str:
+        output = self.run(prompt)
+        if constraint.matches(output):
+            return output
+        self.num_repaired += 1
+        return constraint.example()
@@ -1,7 +1,12 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Iterator, List
+
 from langchain.chains import LLMChain
 from langchain.prompts import PromptTemplate
-from openai import OpenAI
 
+from agentlite.llm.http_client import get_openai_clients
 from agentlite.llm.LLMConfig import LLMConfig
 
 OPENAI_CHAT_MODELS = [
@@ -19,6 +24,9 @@ OPENAI_LLM_MODELS = ["text-davinci-003", "text-ada-001"]
 
 
 class BaseLLM:
+    # whether run_constrained restricts the generation to the constraint
+    supports_constrained = False
+
     def __init__(self, llm_config: LLMConfig) -> None:
         self.llm_name = llm_config.llm_name
         self.context_len: int = llm_config.context_len
@@ -26,6 +34,7 @@ class BaseLLM:
         self.max_tokens: int = llm_config.max_tokens
         self.temperature: float = llm_config.temperature
         self.end_of_prompt: str = llm_config.end_of_prompt
+        self.max_concurrency: int = llm_config.max_concurrency
 
     def __call__(self, prompt: str) -> str:
         return self.run(prompt)
@@ -34,62 +43,212 @@ class BaseLLM:
         # return str
         raise NotImplementedError
 
+    async def arun(self, prompt: str):
+        """awaitable version of run. By default the blocking run is executed
+        in a worker thread; subclasses with an async client should override it.
+        """
+        return await asyncio.to_thread(self.run, prompt)
+
+    def run_batch(self, prompts: List[str]) -> List[str]:
+        """generate for several prompts at once, outputs are in the prompt order.
+        By default the prompts are run one by one; backends which can serve
+        a batch in one request should override it.
+        """
+        return [self.run(prompt) for prompt in prompts]
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        """generate the output as a stream of text chunks. Closing the iterator early
+        cancels the request for backends which stream natively; by default the
+        whole output of run is yielded as one chunk.
+        """
+        yield self.run(prompt)
+
+    async def astream(self, prompt: str) -> AsyncIterator[str]:
+        """awaitable version of stream"""
+        yield await self.arun(prompt)
+
+    def run_constrained(self, prompt: str, constraint) -> str:
+        """generate an output matching constraint.regex, e.g. an ActionConstraint.
+        Backends which support guided decoding set supports_constrained and override it;
+        by default the generation is not constrained.
+        """
+        return self.run(prompt)
+
+    async def arun_constrained(self, prompt: str, constraint) -> str:
+        """awaitable version of run_constrained"""
+        if not self.supports_constrained:
+            return await self.arun(prompt)
+        return await asyncio.to_thread(self.run_constrained, prompt, constraint)
+
 
 class OpenAIChatLLM(BaseLLM):
     def __init__(self, llm_config: LLMConfig):
         super().__init__(llm_config=llm_config)
-        self.client = OpenAI(api_key=llm_config.api_key)
+        self.client, self.async_client = get_openai_clients(llm_config)
+
+    def __messages__(self, prompt: str):
+        return [
+            {"role": "system", "content": "You are a helpful assistant."},
+            {"role": "user", "content": prompt},
+        ]
 
     def run(self, prompt: str):
         response = self.client.chat.completions.create(
             model=self.llm_name,
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant."},
-                {"role": "user", "content": prompt},
-            ],
+            messages=self.__messages__(prompt),
         )
         return response.choices[0].message.content
 
+    async def arun(self, prompt: str):
+        response = await self.async_client.chat.completions.create(
+            model=self.llm_name,
+            messages=self.__messages__(prompt),
+        )
+        return response.choices[0].message.content
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        response = self.client.chat.completions.create(
+            model=self.llm_name,
+            messages=self.__messages__(prompt),
+            stream=True,
+        )
+        try:
+            for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            # closing the http response cancels the generation on early stop
+            response.close()
+
+    async def astream(self, prompt: str) -> AsyncIterator[str]:
+        response = await self.async_client.chat.completions.create(
+            model=self.llm_name,
+            messages=self.__messages__(prompt),
+            stream=True,
+        )
+        try:
+            async for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            await response.close()
+
+    def run_batch(self, prompts: List[str]) -> List[str]:
+        # the chat API takes one conversation per request, send up to max_concurrency at once
+        max_workers = min(len(prompts), self.max_concurrency)
+        if max_workers <= 1:
+            return [self.run(prompt) for prompt in prompts]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.run, prompts))
+
 
 class LangchainLLM(BaseLLM):
     def __init__(self, llm_config: LLMConfig):
         from langchain_openai import OpenAI
 
         super().__init__(llm_config)
+        client, async_client = get_openai_clients(llm_config)
         llm = OpenAI(
             model_name=self.llm_name,
             temperature=self.temperature,
             max_tokens=self.max_tokens,
             base_url=llm_config.base_url,
             api_key=llm_config.api_key,
+            request_timeout=llm_config.timeout,
+            max_retries=llm_config.max_retries,
+            client=client.completions,
+            async_client=async_client.completions,
         )
         human_template = "{prompt}"
         prompt = PromptTemplate(template=human_template, input_variables=["prompt"])
+        self.llm = llm
         self.llm_chain = LLMChain(prompt=prompt, llm=llm)
+        self.supports_constrained = llm_config.guided_decoding
 
     def run(self, prompt: str):
         return self.llm_chain.run(prompt)
 
+    async def arun(self, prompt: str):
+        return await self.llm_chain.arun(prompt)
+
+    def run_constrained(self, prompt: str, constraint) -> str:
+        if not self.supports_constrained:
+            return self.run(prompt)
+        # the guided decoding parameter of vLLM's OpenAI compatible server
+        return self.llm.invoke(prompt, extra_body={"guided_regex": constraint.regex})
+
+    async def arun_constrained(self, prompt: str, constraint) -> str:
+        if not self.supports_constrained:
+            return await self.arun(prompt)
+        return await self.llm.ainvoke(prompt, extra_body={"guided_regex": constraint.regex})
+
+    def run_batch(self, prompts: List[str]) -> List[str]:
+        # the completion API accepts a list of prompts, so the batch goes out in one request
+        outputs = self.llm_chain.apply([{"prompt": prompt} for prompt in prompts])
+        return [output[self.llm_chain.output_key] for output in outputs]
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        yield from self.llm.stream(prompt)
+
+    async def astream(self, prompt: str) -> AsyncIterator[str]:
+        async for chunk in self.llm.astream(prompt):
+            yield chunk
+
 
 class LangchainChatModel(BaseLLM):
     def __init__(self, llm_config: LLMConfig):
         from langchain_openai import ChatOpenAI
 
         super().__init__(llm_config)
+        client, async_client = get_openai_clients(llm_config)
         llm = ChatOpenAI(
             model_name=self.llm_name,
             temperature=self.temperature,
             max_tokens=self.max_tokens,
             base_url=llm_config.base_url,
             api_key=llm_config.api_key,
+            request_timeout=llm_config.timeout,
+            max_retries=llm_config.max_retries,
+            client=client.chat.completions,
+            async_client=async_client.chat.completions,
         )
         human_template = "{prompt}"
         prompt = PromptTemplate(template=human_template, input_variables=["prompt"])
+        self.llm = llm
         self.llm_chain = LLMChain(prompt=prompt, llm=llm)
+        self.supports_constrained = llm_config.guided_decoding
 
     def run(self, prompt: str):
         return self.llm_chain.run(prompt)
 
+    async def arun(self, prompt: str):
+        return await self.llm_chain.arun(prompt)
+
+    def run_constrained(self, prompt: str, constraint) -> str:
+        if not self.supports_constrained:
+            return self.run(prompt)
+        extra_body = {"guided_regex": constraint.regex}
+        return self.llm.invoke(prompt, extra_body=extra_body).content
+
+    async def arun_constrained(self, prompt: str, constraint) -> str:
+        if not self.supports_constrained:
+            return await self.arun(prompt)
+        extra_body = {"guided_regex": constraint.regex}
+        return (await self.llm.ainvoke(prompt, extra_body=extra_body)).content
+
+    def run_batch(self, prompts: List[str]) -> List[str]:
+        # chat models take one conversation per request, langchain sends them concurrently
+        outputs = self.llm.batch(prompts, config={"max_concurrency": self.max_concurrency})
+        return [output.content for output in outputs]
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        for chunk in self.llm.stream(prompt):
+            yield chunk.content
+
+    async def astream(self, prompt: str) -> AsyncIterator[str]:
+        async for chunk in self.llm.astream(prompt):
+            yield chunk.content
+
 
 # class LangchainOllamaLLM(BaseLLM):
 #     def __init__(self, llm_config: LLMConfig):
@@ -110,15 +269,47 @@ class LangchainChatModel(BaseLLM):
 #     def run(self, prompt: str):
 #         return self.llm_chain.run(prompt)
 
-def get_llm_backend(llm_config: LLMConfig):
+# backends reused across tasks, keyed on LLMConfig.config_key
+LLM_BACKENDS: dict[tuple, BaseLLM] = {}
+LLM_BACKENDS_LOCK = threading.Lock()
+
+
+def get_llm_backend(llm_config: LLMConfig, reuse: bool = True):
+    """return the llm backend of the config. With reuse, the backend built for an
+    equal config is returned, so that its clients and connections are shared.
+    """
+    if not reuse:
+        return build_llm_backend(llm_config)
+    key = llm_config.config_key()
+    with LLM_BACKENDS_LOCK:
+        llm = LLM_BACKENDS.get(key)
+        if llm is None:
+            llm = build_llm_backend(llm_config)
+            LLM_BACKENDS[key] = llm
+    return llm
+
+
+def clear_llm_backends():
+    with LLM_BACKENDS_LOCK:
+        LLM_BACKENDS.clear()
+
+
+def build_llm_backend(llm_config: LLMConfig):
     llm_name = llm_config.llm_name
     llm_provider = llm_config.provider
     if llm_name in OPENAI_CHAT_MODELS:
-        return LangchainChatModel(llm_config)
+        llm = LangchainChatModel(llm_config)
     elif llm_name in OPENAI_LLM_MODELS:
-        return LangchainLLM(llm_config)
+        llm = LangchainLLM(llm_config)
     else:
-        return LangchainLLM(llm_config)
+        llm = LangchainLLM(llm_config)
+    if llm_config.use_cache or llm_config.cache_path:
+        from agentlite.llm.CachedLLM import CachedLLM
+
+        llm = CachedLLM(
+            llm, max_size=llm_config.cache_size, cache_path=llm_config.cache_path
+        )
+    return llm
     # TODO: add more llm providers and inference APIs but for now we are using langchainLLM as the default
     # Using other LLM providers will require additional setup and configuration
     # We suggest subclass BaseLLM and implement the run method for the specific provider in your own best practices
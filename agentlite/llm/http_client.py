@@ -0,0 +1,66 @@
+import threading
+
+import httpx
+from openai import AsyncOpenAI, OpenAI
+
+from agentlite.llm.LLMConfig import LLMConfig
+
+# keep-alive transports shared by all the llm backends, keyed on (pool_size, timeout)
+HTTP_CLIENTS: dict[tuple, httpx.Client] = {}
+HTTP_CLIENTS_LOCK = threading.Lock()
+
+
+def get_http_client(pool_size: int = 16, timeout: float = 60.0) -> httpx.Client:
+    """return the shared connection-pooled http client, so that the TCP/TLS
+    connections are reused across backends and tasks.
+
+    :param pool_size: the maximum number of open connections, defaults to 16
+    :type pool_size: int, optional
+    :param timeout: the per-request timeout in seconds, defaults to 60.0
+    :type timeout: float, optional
+    :return: the shared client
+    :rtype: httpx.Client
+    """
+    key = (pool_size, timeout)
+    with HTTP_CLIENTS_LOCK:
+        client = HTTP_CLIENTS.get(key)
+        if client is None or client.is_closed:
+            client = httpx.Client(limits=pool_limits(pool_size), timeout=timeout)
+            HTTP_CLIENTS[key] = client
+    return client
+
+
+def pool_limits(pool_size: int) -> httpx.Limits:
+    return httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+
+
+def close_http_clients():
+    with HTTP_CLIENTS_LOCK:
+        for client in HTTP_CLIENTS.values():
+            client.close()
+        HTTP_CLIENTS.clear()
+
+
+def get_openai_clients(llm_config: LLMConfig) -> tuple[OpenAI, AsyncOpenAI]:
+    """build the OpenAI clients of a backend. The openai client retries 429/5xx
+    responses and connection errors with exponential backoff up to max_retries.
+    The sync client uses the shared pool; an async transport is bound to the event
+    loop it first ran on, so each async client keeps its own pool.
+    """
+    client_params = {
+        "api_key": llm_config.api_key,
+        "base_url": llm_config.base_url,
+        "timeout": llm_config.timeout,
+        "max_retries": llm_config.max_retries,
+    }
+    client = OpenAI(
+        http_client=get_http_client(llm_config.pool_size, llm_config.timeout),
+        **client_params,
+    )
+    async_client = AsyncOpenAI(
+        http_client=httpx.AsyncClient(
+            limits=pool_limits(llm_config.pool_size), timeout=llm_config.timeout
+        ),
+        **client_params,
+    )
+    return client, async_client
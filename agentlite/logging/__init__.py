@@ -1,3 +1,6 @@
+from agentlite.logging.base import log_event
+from agentlite.logging.buffered_logger import BufferedAgentLogger
 from agentlite.logging.terminal_logger import AgentLogger
+from agentlite.logging.trace_logger import JSONLTraceSink, TraceLogger
 
 DefaultLogger = AgentLogger()
@@ -1,10 +1,49 @@
+import inspect
 from abc import ABC, abstractmethod
+from functools import lru_cache
 
 from agentlite.commons import AgentAct, TaskPackage
 
 
+@lru_cache(maxsize=None)
+def hook_keywords(hook_func) -> frozenset:
+    """the keyword arguments taken by a logger hook, None if it takes **kwargs"""
+    params = inspect.signature(hook_func).parameters.values()
+    if any(param.kind == param.VAR_KEYWORD for param in params):
+        return None
+    return frozenset(
+        param.name
+        for param in params
+        if param.kind in (param.POSITIONAL_OR_KEYWORD, param.KEYWORD_ONLY)
+    )
+
+
+def log_event(logger, hook: str, *args, **kwargs):
+    """call a hook of logger. The keyword arguments the hook does not take are dropped,
+    so loggers written for the hooks without the task context, e.g. get_prompt(self, prompt),
+    keep working. A hook missing on the logger is skipped.
+
+    :param logger: the agent logger
+    :type logger: BaseAgentLogger
+    :param hook: the name of the hook, e.g. "get_prompt"
+    :type hook: str
+    """
+    method = getattr(logger, hook, None)
+    if method is None:
+        return None
+    try:
+        keywords = hook_keywords(getattr(method, "__func__", method))
+    except (TypeError, ValueError):  # no signature, e.g. a builtin
+        keywords = None
+    if keywords is not None:
+        kwargs = {key: value for key, value in kwargs.items() if key in keywords}
+    return method(*args, **kwargs)
+
 
 class BaseAgentLogger(ABC):
+    """the hooks called by the agents. The agents pass the task and agent_name to every hook
+    through log_event, which drops them for hooks which do not take them or **kwargs."""
+
     def __init__(
         self,
         log_file_name: str = "agent.log",
@@ -15,7 +54,7 @@ class BaseAgentLogger(ABC):
         """how to save the log"""
         pass
         
-    def receive_task(self, task: TaskPackage, agent_name: str):
+    def receive_task(self, task: TaskPackage, agent_name: str, **kwargs):
         """the agent receives a task and log it"""
         pass
 
@@ -23,22 +62,32 @@ class BaseAgentLogger(ABC):
         """the agent starts to execute the task"""
         pass
     
-    def end_execute(self, task: TaskPackage, agent_name: str = None):
+    def end_execute(self, task: TaskPackage, agent_name: str = None, **kwargs):
         """the agent finishes the task"""
         pass
 
-    def take_action(self, action: AgentAct, agent_name: str, step_idx: int):
+    def take_action(self, action: AgentAct, agent_name: str, step_idx: int, **kwargs):
         """the agent takes an action"""
         pass
 
-    def get_obs(self, obs: str):
+    def get_obs(self, obs: str, **kwargs):
         """get observation"""
         pass
 
-    def get_prompt(self, prompt):
+    def get_prompt(self, prompt, **kwargs):
         """get prompt"""
         pass
 
-    def get_llm_output(self, output: str):
+    def get_llm_output(self, output: str, **kwargs):
         """get llm output"""
-        pass
\ No newline at end of file
+        pass
+
+    def create_task(
+        self,
+        task: TaskPackage,
+        parent_task: TaskPackage = None,
+        agent_name: str = None,
+        **kwargs,
+    ):
+        """the agent creates a sub-task of parent_task for another agent"""
+        pass
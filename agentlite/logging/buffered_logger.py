@@ -0,0 +1,237 @@
+import atexit
+import os
+import queue
+import threading
+import time
+
+from agentlite.logging.utils import str_color_remove
+
+from .terminal_logger import AgentLogger
+
+LOG_POLICIES = ["drop", "block"]
+
+
+class BackgroundLogWriter:
+    """write log lines to a file from a background thread. The file handle stays open,
+    lines are written in batches, and the file is rotated to log_file_name.1, .2, ...
+    once it grows over max_bytes. An error of the writer thread, e.g. a full disk, stops it
+    and is raised again by flush and close; the lines written after it are dropped.
+
+    :param log_file_name: the log file
+    :type log_file_name: str
+    :param max_queue: the maximum number of lines waiting to be written, defaults to 10000
+    :type max_queue: int, optional
+    :param policy: what to do when the queue is full, "drop" the line or "block" the caller, defaults to "drop"
+    :type policy: str, optional
+    :param flush_interval: the longest time in seconds a line waits to be flushed, defaults to 0.5
+    :type flush_interval: float, optional
+    :param batch_size: the maximum number of lines written at once, defaults to 256
+    :type batch_size: int, optional
+    :param max_bytes: rotate the file when it is larger, defaults to None (never)
+    :type max_bytes: int, optional
+    :param backup_count: the number of rotated files kept, defaults to 3
+    :type backup_count: int, optional
+    """
+
+    def __init__(
+        self,
+        log_file_name: str,
+        max_queue: int = 10000,
+        policy: str = "drop",
+        flush_interval: float = 0.5,
+        batch_size: int = 256,
+        max_bytes: int = None,
+        backup_count: int = 3,
+    ) -> None:
+        if policy not in LOG_POLICIES:
+            raise ValueError(f"policy should be one of {LOG_POLICIES}, got {policy}")
+        self.log_file_name = log_file_name
+        self.config = {
+            "max_queue": max_queue,
+            "policy": policy,
+            "flush_interval": flush_interval,
+            "batch_size": batch_size,
+            "max_bytes": max_bytes,
+            "backup_count": backup_count,
+        }
+        self.policy = policy
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.dropped = 0  # lines dropped because the queue was full or the writer failed
+        self.error: BaseException = None  # the error which stopped the writer thread
+        self.queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self.file = open(log_file_name, "a")
+        self.closed = False
+        self.pid = os.getpid()  # the thread does not survive a fork
+        self.thread = threading.Thread(target=self.__run__, daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def write(self, log_str: str):
+        if self.closed:
+            return
+        if self.policy == "block":
+            if not self.__put__(log_str):
+                self.dropped += 1
+            return
+        if not self.thread.is_alive():
+            self.dropped += 1
+            return
+        try:
+            self.queue.put_nowait(log_str)
+        except queue.Full:
+            self.dropped += 1
+
+    def __put__(self, item) -> bool:
+        """put item in the queue, waiting for room while the writer thread runs"""
+        while self.thread.is_alive():
+            try:
+                self.queue.put(item, timeout=self.flush_interval)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def __run__(self):
+        try:
+            self.__write_batches__()
+        except BaseException as error:
+            self.error = error
+
+    def __write_batches__(self):
+        while True:
+            try:
+                batch = [self.queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = batch[-1] is None
+            self.file.write(
+                "".join(
+                    str_color_remove(log_str) + "\n"
+                    for log_str in batch
+                    if log_str is not None
+                )
+            )
+            self.file.flush()
+            if self.max_bytes and self.file.tell() > self.max_bytes:
+                self.__rotate__()
+            for _ in batch:
+                self.queue.task_done()
+            if stop:
+                return
+
+    def __rotate__(self):
+        self.file.close()
+        for idx in range(self.backup_count - 1, 0, -1):
+            backup = f"{self.log_file_name}.{idx}"
+            if os.path.exists(backup):
+                os.replace(backup, f"{self.log_file_name}.{idx + 1}")
+        if self.backup_count > 0:
+            os.replace(self.log_file_name, f"{self.log_file_name}.1")
+        else:
+            os.remove(self.log_file_name)
+        self.file = open(self.log_file_name, "a")
+
+    def flush(self, timeout: float = 30.0):
+        """block until all the queued lines are written
+
+        :param timeout: the longest time in seconds to wait, defaults to 30.0. None waits forever.
+        :type timeout: float, optional
+        :raises TimeoutError: the lines are not written after timeout seconds
+        :raises RuntimeError: the writer thread stopped, the error which stopped it is raised instead
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.queue.all_tasks_done:
+            while self.queue.unfinished_tasks:
+                if not self.thread.is_alive():
+                    self.__raise_error__()
+                    raise RuntimeError(f"the log writer of {self.log_file_name} stopped")
+                wait = self.flush_interval
+                if deadline is not None:
+                    wait = min(wait, deadline - time.monotonic())
+                    if wait <= 0:
+                        raise TimeoutError(
+                            f"{self.queue.unfinished_tasks} log lines not written after {timeout}s"
+                        )
+                self.queue.all_tasks_done.wait(wait)
+        self.__raise_error__()
+
+    def close(self, timeout: float = 30.0):
+        """write the queued lines and close the file, raise the error of the writer thread"""
+        if self.closed:
+            return
+        self.closed = True
+        if self.__put__(None):
+            self.thread.join(timeout)
+        self.file.close()
+        self.__raise_error__()
+
+    def __raise_error__(self):
+        if self.error is not None:
+            raise self.error
+
+
+# one writer per log file, shared by the loggers writing to it
+LOG_WRITERS: dict[str, BackgroundLogWriter] = {}
+LOG_WRITERS_LOCK = threading.Lock()
+
+
+def get_log_writer(log_file_name: str, **kwargs) -> BackgroundLogWriter:
+    """return the background writer of log_file_name, kwargs are used when creating it.
+    Raise ValueError if kwargs differ from the ones of the open writer of the file."""
+    path = os.path.abspath(log_file_name)
+    with LOG_WRITERS_LOCK:
+        writer = LOG_WRITERS.get(path)
+        if (
+            writer is None
+            or writer.closed
+            or writer.pid != os.getpid()
+            or not writer.thread.is_alive()
+        ):
+            writer = BackgroundLogWriter(log_file_name, **kwargs)
+            LOG_WRITERS[path] = writer
+        elif any(writer.config.get(key) != value for key, value in kwargs.items()):
+            raise ValueError(
+                f"{log_file_name} is already open with {writer.config}, got {kwargs}"
+            )
+    return writer
+
+
+class BufferedAgentLogger(AgentLogger):
+    """AgentLogger which hands the log lines to a BackgroundLogWriter, so the agent
+    does not wait for the file. The arguments after PROMPT_DEBUG_FLAG configure the
+    writer, see BackgroundLogWriter."""
+
+    def __init__(
+        self,
+        log_file_name: str = "agent.log",
+        FLAG_PRINT: bool = True,
+        OBS_OFFSET: int = 99999,
+        PROMPT_DEBUG_FLAG: bool = False,
+        **writer_kwargs,
+    ) -> None:
+        super().__init__(
+            log_file_name=log_file_name,
+            FLAG_PRINT=FLAG_PRINT,
+            OBS_OFFSET=OBS_OFFSET,
+            PROMPT_DEBUG_FLAG=PROMPT_DEBUG_FLAG,
+        )
+        self.writer_kwargs = writer_kwargs
+        self.writer = get_log_writer(log_file_name, **writer_kwargs)
+
+    def __save_log__(self, log_str: str):
+        if self.FLAG_PRINT:
+            print(log_str)
+        if self.writer.pid != os.getpid():  # the logger was created before a fork
+            self.writer = get_log_writer(self.log_file_name, **self.writer_kwargs)
+        self.writer.write(log_str)
+
+    def flush(self, timeout: float = 30.0):
+        self.writer.flush(timeout)
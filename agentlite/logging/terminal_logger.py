@@ -40,7 +40,7 @@ class AgentLogger(BaseAgentLogger):
         with open(self.log_file_name, "a") as f:
             f.write(str_color_remove(log_str) + "\n")
 
-    def receive_task(self, task: TaskPackage, agent_name: str):
+    def receive_task(self, task: TaskPackage, agent_name: str, **kwargs):
         task_str = (
             f"""[\n\tTask ID: {task.task_id}\n\tInstruction: {task.instruction}\n]"""
         )
@@ -53,35 +53,35 @@ class AgentLogger(BaseAgentLogger):
         log_str = f"""===={self.__color_agent_name__(agent_name)} starts execution on TaskPackage {task.task_id}===="""
         self.__save_log__(log_str=log_str)
 
-    def end_execute(self, task: TaskPackage, agent_name: str = None):
+    def end_execute(self, task: TaskPackage, agent_name: str = None, **kwargs):
         log_str = f"""========={self.__color_agent_name__(agent_name)} finish execution. TaskPackage[ID:{task.task_id}] status:\n"""
         task_str = f"""[\n\tcompletion: {task.completion}\n\tanswer: {task.answer}\n]"""
         log_str += self.__color_task_str__(task_str=task_str)
         log_str += "\n=========="
         self.__save_log__(log_str=log_str)
 
-    def take_action(self, action: AgentAct, agent_name: str, step_idx: int):
+    def take_action(self, action: AgentAct, agent_name: str, step_idx: int, **kwargs):
         act_str = f"""{{\n\tname: {action.name}\n\tparams: {action.params}\n}}"""
         log_str = f"""Agent {self.__color_agent_name__(agent_name)} takes {step_idx}-step {bcolors.UNDERLINE}Action{bcolors.ENDC}:\n"""
         log_str += f"""{self.__color_act_str__(act_str)}"""
         self.__save_log__(log_str)
 
-    def add_st_memory(self, agent_name: str):
+    def add_st_memory(self, agent_name: str, **kwargs):
         log_str = f"""Action and Observation added to Agent {self.__color_agent_name__(agent_name)} memory"""
         self.__save_log__(log_str)
 
-    def get_obs(self, obs: str):
+    def get_obs(self, obs: str, **kwargs):
         if len(obs) > self.OBS_OFFSET:
             obs = obs[: self.OBS_OFFSET] + "[TLDR]"
         log_str = f"""Observation: {self.__color_obs_str__(obs)}"""
         self.__save_log__(log_str)
 
-    def get_prompt(self, prompt):
-        log_str = f"""Prompt: {self.__color_prompt_str__(prompt)}"""
+    def get_prompt(self, prompt, **kwargs):
         if self.PROMPT_DEBUG_FLAG:
+            log_str = f"""Prompt: {self.__color_prompt_str__(prompt)}"""
             self.__save_log__(log_str)
 
-    def get_llm_output(self, output: str):
-        log_str = f"""LLM generates: {self.__color_prompt_str__(output)}"""
+    def get_llm_output(self, output: str, **kwargs):
         if self.PROMPT_DEBUG_FLAG:
+            log_str = f"""LLM generates: {self.__color_prompt_str__(output)}"""
             self.__save_log__(log_str)
\ No newline at end of file
@@ -0,0 +1,229 @@
+import atexit
+import gzip
+import json
+import os
+import threading
+import time
+
+from agentlite.commons import AgentAct, TaskPackage
+
+from .base import BaseAgentLogger, log_event
+
+
+class JSONLTraceSink:
+    """append trace records to a JSON lines file, gzip compressed if the path ends with .gz.
+    Records are buffered in memory and written every buffer_size records, at flush and at exit.
+
+    :param path: the trace file
+    :type path: str
+    :param buffer_size: the number of records buffered before writing, defaults to 256
+    :type buffer_size: int, optional
+    """
+
+    def __init__(self, path: str, buffer_size: int = 256) -> None:
+        self.path = path
+        self.buffer_size = buffer_size
+        self.buffer: list[str] = []
+        self.lock = threading.Lock()
+        if path.endswith(".gz"):
+            self.file = gzip.open(path, "at", encoding="utf-8")
+        else:
+            self.file = open(path, "a", encoding="utf-8")
+        atexit.register(self.close)
+
+    def write(self, record: dict):
+        line = json.dumps(record, default=str)
+        with self.lock:
+            self.buffer.append(line)
+            if len(self.buffer) >= self.buffer_size:
+                self.__write_buffer__()
+
+    def __write_buffer__(self):
+        if self.buffer and not self.file.closed:
+            self.file.write("\n".join(self.buffer) + "\n")
+            self.buffer = []
+
+    def flush(self):
+        with self.lock:
+            self.__write_buffer__()
+            if not self.file.closed:
+                self.file.flush()
+
+    def close(self):
+        with self.lock:
+            self.__write_buffer__()
+            self.file.close()
+
+
+class TraceLogger(BaseAgentLogger):
+    """write one JSON record per agent event, for loading the runs into pandas, e.g.
+    `pd.read_json("trace.jsonl", lines=True)`. Every record has the event name, task_id,
+    agent name, step index, a monotonic timestamp `ts` (seconds), the wall clock `time`,
+    the process and thread ids, and event specific sizes in characters.
+    Sub-tasks created by ManagerAgent are linked to their parent by `create_task`
+    records holding task_id and parent_task_id.
+
+    :param trace_file: the trace file, gzip compressed if it ends with .gz, defaults to "trace.jsonl"
+    :type trace_file: str, optional
+    :param sink: write the records to this sink instead of trace_file, defaults to None
+    :type sink: JSONLTraceSink, optional
+    :param logger: another logger receiving the same events, e.g. AgentLogger(), defaults to None
+    :type logger: BaseAgentLogger, optional
+    """
+
+    def __init__(
+        self,
+        trace_file: str = "trace.jsonl",
+        sink: JSONLTraceSink = None,
+        logger: BaseAgentLogger = None,
+    ) -> None:
+        super().__init__(log_file_name=trace_file)
+        self.sink = sink or JSONLTraceSink(trace_file)
+        self.logger = logger
+        self.steps: dict[str, int] = {}  # task_id -> index of the last step which took actions
+        self.lock = threading.Lock()
+
+    def __emit__(
+        self,
+        event: str,
+        task: TaskPackage = None,
+        agent_name: str = None,
+        step: int = None,
+        **fields,
+    ):
+        task_id = task.task_id if task is not None else None
+        if step is None:
+            step = self.steps.get(task_id)
+        record = {
+            "event": event,
+            "task_id": task_id,
+            "agent": agent_name,
+            "step": step,
+            "ts": time.monotonic(),
+            "time": time.time(),
+            "pid": os.getpid(),
+            "thread": threading.get_ident(),
+        }
+        record.update(fields)
+        self.sink.write(record)
+
+    def flush(self):
+        self.sink.flush()
+
+    def receive_task(self, task: TaskPackage, agent_name: str, **kwargs):
+        self.__emit__(
+            "receive_task",
+            task,
+            agent_name,
+            instruction_chars=len(task.instruction),
+            creator=task.creator,
+            executor=task.executor,
+        )
+        if self.logger:
+            log_event(self.logger, "receive_task", task, agent_name, **kwargs)
+
+    def execute_task(self, task: TaskPackage = None, agent_name: str = None, **kwargs):
+        self.__emit__("execute_task", task, agent_name)
+        with self.lock:
+            self.steps[task.task_id] = -1
+        if self.logger:
+            log_event(self.logger, "execute_task", task, agent_name, **kwargs)
+
+    def end_execute(self, task: TaskPackage, agent_name: str = None, **kwargs):
+        self.__emit__(
+            "end_execute",
+            task,
+            agent_name,
+            completion=task.completion,
+            answer_chars=len(str(task.answer)),
+        )
+        with self.lock:
+            self.steps.pop(task.task_id, None)
+        if self.logger:
+            log_event(self.logger, "end_execute", task, agent_name, **kwargs)
+
+    def take_action(
+        self,
+        action: AgentAct,
+        agent_name: str,
+        step_idx: int,
+        task: TaskPackage = None,
+        **kwargs,
+    ):
+        if task is not None:
+            with self.lock:
+                self.steps[task.task_id] = step_idx
+        self.__emit__(
+            "take_action",
+            task,
+            agent_name,
+            action=action.name,
+            params_chars=len(json.dumps(action.params, default=str)),
+        )
+        if self.logger:
+            log_event(
+                self.logger, "take_action", action, agent_name, step_idx, task=task, **kwargs
+            )
+
+    def __next_step__(self, task: TaskPackage) -> int:
+        """the step of a prompt or llm output, which come before the actions of the step"""
+        if task is None or task.task_id not in self.steps:
+            return None
+        return self.steps[task.task_id] + 1
+
+    def get_obs(
+        self, obs: str, task: TaskPackage = None, agent_name: str = None, **kwargs
+    ):
+        self.__emit__("get_obs", task, agent_name, obs_chars=len(str(obs)))
+        if self.logger:
+            log_event(self.logger, "get_obs", obs, task=task, agent_name=agent_name, **kwargs)
+
+    def get_prompt(
+        self, prompt, task: TaskPackage = None, agent_name: str = None, **kwargs
+    ):
+        self.__emit__(
+            "get_prompt",
+            task,
+            agent_name,
+            step=self.__next_step__(task),
+            prompt_chars=len(prompt),
+        )
+        if self.logger:
+            log_event(
+                self.logger, "get_prompt", prompt, task=task, agent_name=agent_name, **kwargs
+            )
+
+    def get_llm_output(
+        self, output: str, task: TaskPackage = None, agent_name: str = None, **kwargs
+    ):
+        self.__emit__(
+            "get_llm_output",
+            task,
+            agent_name,
+            step=self.__next_step__(task),
+            output_chars=len(output),
+        )
+        if self.logger:
+            log_event(
+                self.logger, "get_llm_output", output, task=task, agent_name=agent_name, **kwargs
+            )
+
+    def create_task(
+        self,
+        task: TaskPackage,
+        parent_task: TaskPackage = None,
+        agent_name: str = None,
+        **kwargs,
+    ):
+        parent_task_id = parent_task.task_id if parent_task is not None else None
+        self.__emit__(
+            "create_task",
+            task,
+            agent_name,
+            step=self.steps.get(parent_task_id),
+            parent_task_id=parent_task_id,
+            creator=task.creator,
+            executor=task.executor,
+        )
+        if self.logger:
+            log_event(self.logger, "create_task", task, parent_task, agent_name, **kwargs)
@@ -11,9 +11,11 @@ def format_dict_str(dict_like, keys=None):
     return "\n".join(pairs)
 
 
+ANSI_ESCAPE = re.compile(r"\x1B[@-_][0-?]*[ -/]*[@-~]")
+
+
 def str_color_remove(color_str: str):
-    ansi_escape = re.compile(r"\x1B[@-_][0-?]*[ -/]*[@-~]")
-    clean_str = ansi_escape.sub("", color_str)
+    clean_str = ANSI_ESCAPE.sub("", color_str)
     return clean_str
 
     
@@ -0,0 +1,158 @@
+import re
+import threading
+import zlib
+from typing import Any, Callable, List
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+class HashingEmbedder:
+    """dependency-free text embedder. Words and word bigrams are hashed into dim buckets
+    with log-scaled counts, and the vectors are L2 normalized, so the dot product is
+    the cosine similarity of the texts. Works offline and needs no fitting.
+
+    :param dim: the embedding size, defaults to 1024
+    :type dim: int, optional
+    """
+
+    def __init__(self, dim: int = 1024) -> None:
+        self.dim = dim
+
+    def __features__(self, text: str) -> List[str]:
+        words = TOKEN_PATTERN.findall(text.lower())
+        return words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+
+    def __call__(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self.__features__(text):
+                # crc32 is stable across processes, unlike hash()
+                vectors[row, zlib.crc32(feature.encode("utf-8")) % self.dim] += 1.0
+        np.log1p(vectors, out=vectors)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+
+class SentenceTransformerEmbedder:
+    """local neural embedder with sentence-transformers"""
+
+    def __init__(self, model_name: str) -> None:
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name)
+
+    def __call__(self, texts: List[str]) -> np.ndarray:
+        return self.model.encode(
+            texts, normalize_embeddings=True, convert_to_numpy=True
+        ).astype(np.float32)
+
+
+def get_embedder(model_name: str = None):
+    """return the sentence-transformers embedder of model_name if the package and
+    the model are available, otherwise the hashing embedder"""
+    if model_name:
+        try:
+            return SentenceTransformerEmbedder(model_name)
+        except Exception:
+            pass
+    return HashingEmbedder()
+
+
+class VectorIndex:
+    """brute-force cosine search over normalized vectors. The vectors are kept in one
+    matrix grown by doubling, so a search is a single matrix-vector product.
+
+    :param dim: the vector size
+    :type dim: int
+    """
+
+    def __init__(self, dim: int) -> None:
+        self.dim = dim
+        self.vectors = np.zeros((16, dim), dtype=np.float32)
+        self.size = 0
+
+    def add(self, vector: np.ndarray) -> int:
+        if self.size == len(self.vectors):
+            grown = np.zeros((2 * len(self.vectors), self.dim), dtype=np.float32)
+            grown[: self.size] = self.vectors
+            self.vectors = grown
+        self.vectors[self.size] = vector
+        self.size += 1
+        return self.size - 1
+
+    def search(self, query: np.ndarray, top_k: int) -> List[tuple[int, float]]:
+        """return the (position, score) of the top_k most similar vectors, best first"""
+        if self.size == 0 or top_k <= 0:
+            return []
+        scores = self.vectors[: self.size] @ query
+        if top_k < self.size:
+            top = np.argpartition(-scores, top_k - 1)[:top_k]
+        else:
+            top = np.arange(self.size)
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(int(pos), float(scores[pos])) for pos in top]
+
+    def __len__(self):
+        return self.size
+
+
+class AgentLTMemory:
+    """long-term memory of an agent: items indexed by the embedding of a key text, e.g.
+    past trajectories keyed by their task instruction, searched by similarity.
+    Items are grouped by memory type, e.g. the example types of the prompt generator.
+
+    :param embedder: maps a list of texts to an array of L2 normalized vectors, defaults to HashingEmbedder()
+    :type embedder: Callable[[List[str]], np.ndarray], optional
+    """
+
+    def __init__(self, embedder: Callable[[List[str]], np.ndarray] = None) -> None:
+        self.embedder = embedder or HashingEmbedder()
+        self.indexes: dict[str, VectorIndex] = {}
+        self.items: dict[str, list] = {}
+        self.lock = threading.Lock()
+
+    def add(self, key: str, item: Any, memory_type: str = "action") -> int:
+        """memorize item under the key text
+
+        :param key: the text to search the item by
+        :type key: str
+        :param item: the memorized item
+        :type item: Any
+        :param memory_type: the group of the item, defaults to "action"
+        :type memory_type: str, optional
+        :return: the position of the item in its group
+        :rtype: int
+        """
+        vector = self.embedder([key])[0]
+        with self.lock:
+            if memory_type not in self.indexes:
+                self.indexes[memory_type] = VectorIndex(len(vector))
+                self.items[memory_type] = []
+            self.items[memory_type].append(item)
+            return self.indexes[memory_type].add(vector)
+
+    def search(
+        self, query: str, top_k: int = 3, memory_type: str = "action"
+    ) -> List[tuple[int, Any]]:
+        """return the (position, item) of the top_k items whose key is the most similar
+        to query, best first
+
+        :param query: the text to search for
+        :type query: str
+        :param top_k: the number of items, defaults to 3
+        :type top_k: int, optional
+        :param memory_type: the group to search, defaults to "action"
+        :type memory_type: str, optional
+        :return: the positions and the items
+        :rtype: List[tuple[int, Any]]
+        """
+        index = self.indexes.get(memory_type)
+        if index is None:
+            return []
+        hits = index.search(self.embedder([query])[0], top_k)
+        return [(pos, self.items[memory_type][pos]) for pos, score in hits]
+
+    def __len__(self):
+        return sum(len(items) for items in self.items.values())
@@ -1,6 +1,11 @@
+import threading
+import time
+from collections import OrderedDict
 from typing import Dict, Union
 
-from agentlite.commons import AgentAct, TaskPackage
+from agentlite.commons import AgentAct, AgentActLite, TaskPackage
+from agentlite.commons.AgentAct import to_act_lite
+from agentlite.commons.CacheStore import CACHE_MISS, SQLiteCacheStore
 
 from .memory_utils import *
 
@@ -22,6 +27,10 @@ class AgentSTMemory:
     def add_act_obs(self, task: TaskPackage, action: AgentAct, observation: str):
         raise NotImplementedError
 
+    def end_task(self, task: TaskPackage):
+        """called when the agent stops executing task, completed or not"""
+        pass
+
 
 class DictAgentSTMemory(AgentSTMemory):
     def __init__(self, agent_id: str) -> None:
@@ -37,3 +46,149 @@ class DictAgentSTMemory(AgentSTMemory):
     def add_act_obs(self, task: TaskPackage, action: AgentAct, observation: str = ""):
         """adding action and its corresponding observations into memory"""
         self.memory[task.task_id][MEMORY_ACT_OBS_KEY].append((action, observation))
+
+
+class BoundedAgentSTMemory(AgentSTMemory):
+    """short-term memory for long-running agents. Running tasks are always kept,
+    completed or ended tasks are evicted least recently used first once there are more than
+    max_tasks of them, or once they were not used for ttl seconds.
+    With spill_path, the evicted tasks are written to a SQLite file and read back
+    when they are used again, so the history stays available while the process
+    keeps a flat memory use.
+
+    :param agent_id: the id of the agent owning this memory
+    :type agent_id: str
+    :param max_tasks: the maximum number of completed tasks kept in memory, defaults to 256
+    :type max_tasks: int, optional
+    :param ttl: seconds a completed task is kept after its last use, defaults to None (no limit)
+    :type ttl: float, optional
+    :param spill_path: the SQLite file of the evicted tasks, defaults to None (evicted tasks are dropped)
+    :type spill_path: str, optional
+    """
+
+    def __init__(
+        self,
+        agent_id: str,
+        max_tasks: int = 256,
+        ttl: float = None,
+        spill_path: str = None,
+    ) -> None:
+        self.agent_id = agent_id
+        self.max_tasks = max_tasks
+        self.ttl = ttl
+        # task_id -> {task, act_obs}, least recently used first
+        self.memory: OrderedDict[str, Dict[str, Union[TaskPackage, list]]] = OrderedDict()
+        self.last_used: Dict[str, float] = {}
+        # the evictable tasks, completed or ended e.g. at max_exec_steps, least recently used first
+        self.ended: OrderedDict[str, None] = OrderedDict()
+        self.spill_store = (
+            SQLiteCacheStore(spill_path, table="st_memory") if spill_path else None
+        )
+        self.lock = threading.RLock()
+
+    def add_new_task(self, task: TaskPackage):
+        with self.lock:
+            self.memory[task.task_id] = {MEMORY_TASK_KEY: task, MEMORY_ACT_OBS_KEY: []}
+            # a task run again is no longer ended, it must not be evicted while it runs
+            self.ended.pop(task.task_id, None)
+            self.__touch__(task.task_id)
+            self.__mark_ended__(task)
+            self.__evict__()
+
+    def get_action_chain(self, task: TaskPackage):
+        with self.lock:
+            return self.__load__(task.task_id)[MEMORY_ACT_OBS_KEY]
+
+    def add_act_obs(self, task: TaskPackage, action: AgentAct, observation: str = ""):
+        """adding action and its corresponding observations into memory"""
+        with self.lock:
+            self.__load__(task.task_id)[MEMORY_ACT_OBS_KEY].append((action, observation))
+            if self.__mark_ended__(task):
+                self.__evict__()
+
+    def end_task(self, task: TaskPackage):
+        with self.lock:
+            if task.task_id in self.memory:
+                self.ended[task.task_id] = None
+                self.__evict__()
+
+    def get_task(self, task_id: str) -> TaskPackage:
+        """return the task of task_id, read back from the spill file if it was evicted"""
+        with self.lock:
+            return self.__load__(task_id)[MEMORY_TASK_KEY]
+
+    def __contains__(self, task_id: str) -> bool:
+        with self.lock:
+            if task_id in self.memory:
+                return True
+        return self.spill_store is not None and self.spill_store.get(task_id) is not CACHE_MISS
+
+    def __len__(self):
+        """the number of tasks held in memory"""
+        return len(self.memory)
+
+    def __touch__(self, task_id: str):
+        self.memory.move_to_end(task_id)
+        if task_id in self.ended:
+            self.ended.move_to_end(task_id)
+        self.last_used[task_id] = time.monotonic()
+
+    def __mark_ended__(self, task: TaskPackage) -> bool:
+        """add a completed task to the evictable ones, return whether it is completed"""
+        if task.completion == "active":
+            return False
+        self.ended[task.task_id] = None
+        return True
+
+    def __load__(self, task_id: str) -> dict:
+        entry = self.memory.get(task_id)
+        if entry is None:
+            record = CACHE_MISS
+            if self.spill_store is not None:
+                record = self.spill_store.get(task_id)
+            if record is CACHE_MISS:
+                raise KeyError(task_id)
+            entry = {
+                # the stored fields were valid, skip the validation
+                MEMORY_TASK_KEY: TaskPackage.model_construct(**record[MEMORY_TASK_KEY]),
+                MEMORY_ACT_OBS_KEY: [
+                    (AgentActLite(**act), obs) for act, obs in record[MEMORY_ACT_OBS_KEY]
+                ],
+            }
+            self.memory[task_id] = entry
+            # only completed or ended tasks are spilled
+            self.ended[task_id] = None
+            self.__touch__(task_id)
+            self.__evict__()
+            return entry
+        self.__touch__(task_id)
+        return entry
+
+    def __evict__(self):
+        num_evicted = max(len(self.ended) - self.max_tasks, 0)
+        expire_before = None if self.ttl is None else time.monotonic() - self.ttl
+        while self.ended:
+            # ended is in last use order, so the expired tasks come first
+            task_id = next(iter(self.ended))
+            if num_evicted > 0:
+                num_evicted -= 1
+            elif expire_before is None or self.last_used[task_id] >= expire_before:
+                break
+            del self.ended[task_id]
+            entry = self.memory.pop(task_id)
+            del self.last_used[task_id]
+            if self.spill_store is not None:
+                self.spill_store.set(task_id, self.__spill_record__(entry))
+
+    def __spill_record__(self, entry: dict) -> dict:
+        return {
+            MEMORY_TASK_KEY: dict(entry[MEMORY_TASK_KEY]),
+            MEMORY_ACT_OBS_KEY: [
+                (to_act_lite(act).as_dict(), obs if isinstance(obs, str) else str(obs))
+                for act, obs in entry[MEMORY_ACT_OBS_KEY]
+            ],
+        }
+
+    def close(self):
+        if self.spill_store is not None:
+            self.spill_store.close()
@@ -0,0 +1,3 @@
+from .exporters import InMemorySpanCollector, JSONLSpanExporter, SpanExporter
+from .span import SPAN_NAMES, Span
+from .tracer import NoopTracer, Tracer, current_span, get_tracer, set_tracer
@@ -0,0 +1,88 @@
+import threading
+from typing import List
+
+from agentlite.logging.trace_logger import JSONLTraceSink
+
+from .span import Span
+
+
+class SpanExporter:
+    """the interface receiving the ended spans of a Tracer"""
+
+    def export(self, span: Span):
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+    def shutdown(self):
+        self.flush()
+
+
+class InMemorySpanCollector(SpanExporter):
+    """keep the ended spans in memory, for tests and for inspecting a run in a notebook"""
+
+    def __init__(self) -> None:
+        self.spans: List[Span] = []
+        self.lock = threading.Lock()
+
+    def export(self, span: Span):
+        with self.lock:
+            self.spans.append(span)
+
+    def get_spans(self, name: str = None, **attributes) -> List[Span]:
+        """the collected spans, filtered by name and attribute values, in end order"""
+        with self.lock:
+            spans = list(self.spans)
+        return [
+            span
+            for span in spans
+            if (name is None or span.name == name)
+            and all(span.attributes.get(key) == value for key, value in attributes.items())
+        ]
+
+    def get_span(self, span_id: str) -> Span:
+        for span in self.get_spans():
+            if span.span_id == span_id:
+                return span
+        return None
+
+    def children(self, span: Span) -> List[Span]:
+        """the spans directly nested in span, in start order"""
+        return sorted(
+            [child for child in self.get_spans() if child.parent_id == span.span_id],
+            key=lambda child: child.start_time,
+        )
+
+    def roots(self) -> List[Span]:
+        return sorted(
+            [span for span in self.get_spans() if span.parent_id is None],
+            key=lambda span: span.start_time,
+        )
+
+    def clear(self):
+        with self.lock:
+            self.spans = []
+
+
+class JSONLSpanExporter(SpanExporter):
+    """append one JSON record per span to a JSON lines file, gzip compressed if the
+    path ends with .gz. Load it with `pd.read_json(path, lines=True)`.
+
+    :param path: the span file
+    :type path: str
+    :param buffer_size: the number of spans buffered before writing, defaults to 256
+    :type buffer_size: int, optional
+    """
+
+    def __init__(self, path: str, buffer_size: int = 256) -> None:
+        self.sink = JSONLTraceSink(path, buffer_size=buffer_size)
+
+    def export(self, span: Span):
+        self.sink.write(span.as_dict())
+
+    def flush(self):
+        self.sink.flush()
+
+    def shutdown(self):
+        self.sink.close()
@@ -0,0 +1,67 @@
+import os
+import time
+import traceback
+import uuid
+
+# the spans recorded by the agents, from the outermost to the innermost
+SPAN_NAMES = ["agent-run", "step", "llm-call", "action-call"]
+
+
+class Span:
+    """a timed operation of an agent run. Spans of one trace share the trace_id and
+    are nested through parent_id. Times are in seconds, start_time is the wall clock
+    and duration is measured with the monotonic clock.
+
+    :param name: the operation, one of SPAN_NAMES for the spans of the agents
+    :type name: str
+    :param parent: the enclosing span, defaults to None which starts a new trace
+    :type parent: Span, optional
+    :param attributes: the details of the operation, e.g. the agent name and the task_id
+    :type attributes: dict, optional
+    """
+
+    def __init__(self, name: str, parent: "Span" = None, attributes: dict = None) -> None:
+        self.name = name
+        self.trace_id = parent.trace_id if parent is not None else uuid.uuid4().hex
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent is not None else None
+        self.attributes = dict(attributes) if attributes else {}
+        self.status = "ok"
+        self.error = None
+        self.start_time = time.time()
+        self.end_time = None
+        self.duration = None
+        self.start_counter = time.perf_counter()
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def record_error(self, error: BaseException):
+        self.status = "error"
+        self.error = "".join(traceback.format_exception_only(type(error), error)).strip()
+
+    def end(self):
+        if self.end_time is None:
+            self.duration = time.perf_counter() - self.start_counter
+            self.end_time = self.start_time + self.duration
+
+    @property
+    def is_ended(self) -> bool:
+        return self.end_time is not None
+
+    def as_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "duration": self.duration,
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+    def __repr__(self):
+        return f"Span({self.name}, span_id={self.span_id}, parent_id={self.parent_id}, duration={self.duration})"
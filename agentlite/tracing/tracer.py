@@ -0,0 +1,122 @@
+import contextvars
+from contextlib import contextmanager
+from typing import List
+
+from .exporters import SpanExporter
+from .span import Span
+
+# the innermost open span of the running thread or asyncio task.
+# Threads started by the agents copy the context, so nested agents keep the parent span.
+CURRENT_SPAN: contextvars.ContextVar[Span] = contextvars.ContextVar(
+    "agentlite_current_span", default=None
+)
+
+# stands for the current span as the default parent
+CURRENT = object()
+
+
+def current_span() -> Span:
+    return CURRENT_SPAN.get()
+
+
+class Tracer:
+    """create the spans of the agent runs and hand the ended spans to the exporters.
+    A span started inside another one is nested in it, also across the team members
+    called by a ManagerAgent, so one trace covers the whole agent hierarchy.
+
+    :param exporters: the exporters receiving the ended spans, defaults to []
+    :type exporters: List[SpanExporter], optional
+    """
+
+    def __init__(self, exporters: List[SpanExporter] = None) -> None:
+        self.exporters = list(exporters) if exporters else []
+
+    def add_exporter(self, exporter: SpanExporter):
+        self.exporters.append(exporter)
+
+    def start_span(self, name: str, parent=CURRENT, attributes: dict = None) -> Span:
+        """start a span without making it the current one, end it with end_span
+
+        :param name: the operation of the span
+        :type name: str
+        :param parent: the enclosing span, defaults to the current span
+        :type parent: Span, optional
+        :param attributes: the details of the operation, defaults to None
+        :type attributes: dict, optional
+        :return: the started span
+        :rtype: Span
+        """
+        if parent is CURRENT:
+            parent = CURRENT_SPAN.get()
+        return Span(name, parent=parent, attributes=attributes)
+
+    def end_span(self, span: Span):
+        if span is None or span.is_ended:
+            return
+        span.end()
+        for exporter in self.exporters:
+            exporter.export(span)
+
+    @contextmanager
+    def use_span(self, span: Span):
+        """make span the current span within the block, without ending it"""
+        token = CURRENT_SPAN.set(span)
+        try:
+            yield span
+        finally:
+            CURRENT_SPAN.reset(token)
+
+    @contextmanager
+    def span(self, name: str, parent=CURRENT, attributes: dict = None):
+        """start a span, make it the current span within the block and end it after.
+        An exception raised in the block marks the span as failed."""
+        span = self.start_span(name, parent=parent, attributes=attributes)
+        token = CURRENT_SPAN.set(span)
+        try:
+            yield span
+        except BaseException as error:
+            span.record_error(error)
+            raise
+        finally:
+            CURRENT_SPAN.reset(token)
+            self.end_span(span)
+
+    def flush(self):
+        for exporter in self.exporters:
+            exporter.flush()
+
+    def shutdown(self):
+        for exporter in self.exporters:
+            exporter.shutdown()
+
+
+class NoopTracer(Tracer):
+    """the default tracer, which records nothing"""
+
+    def start_span(self, name: str, parent=CURRENT, attributes: dict = None) -> Span:
+        return None
+
+    def end_span(self, span: Span):
+        pass
+
+    @contextmanager
+    def use_span(self, span: Span):
+        yield span
+
+    @contextmanager
+    def span(self, name: str, parent=CURRENT, attributes: dict = None):
+        yield None
+
+
+NOOP_TRACER = NoopTracer()
+GLOBAL_TRACER: Tracer = NOOP_TRACER
+
+
+def set_tracer(tracer: Tracer):
+    """set the tracer of the agents created without a tracer, None disables tracing"""
+    global GLOBAL_TRACER
+    GLOBAL_TRACER = tracer or NOOP_TRACER
+
+
+def get_tracer() -> Tracer:
+    return GLOBAL_TRACER
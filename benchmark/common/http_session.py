@@ -0,0 +1,100 @@
+"""
+Shared HTTP session of the benchmark environments. The WebShop server and the tool APIs
+are called through one requests.Session per process, so the connections are kept alive and
+pooled instead of opening a new TCP connection for every agent action.
+
+    from common.http_session import get_session
+    response = get_session().get(url, params=params)
+
+Every request gets a default (connect, read) timeout, and idempotent requests are retried on
+connection errors and 502/503/504 responses. configure_session replaces the shared session,
+set_session injects any session, e.g. one pointed at a local stand-in server in tests.
+The shared session is rebuilt in forked workers, which must not share the pooled sockets.
+"""
+
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_TIMEOUT = (5.0, 60.0)  # seconds to connect, seconds to read
+DEFAULT_POOL_SIZE = int(os.environ.get("BENCHMARK_HTTP_POOL_SIZE", 32))
+DEFAULT_MAX_RETRIES = int(os.environ.get("BENCHMARK_HTTP_MAX_RETRIES", 2))
+RETRY_STATUS = (502, 503, 504)
+
+
+class TimeoutSession(requests.Session):
+    """requests.Session applying a default timeout to the requests which set none"""
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT) -> None:
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().request(method, url, **kwargs)
+
+
+def build_session(
+    pool_size: int = DEFAULT_POOL_SIZE,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    backoff_factor: float = 0.3,
+    timeout=DEFAULT_TIMEOUT,
+) -> requests.Session:
+    """a session keeping up to pool_size connections alive per host.
+    POST requests are not retried, as they may not be idempotent."""
+    session = TimeoutSession(timeout=timeout)
+    retry = Retry(
+        total=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUS,
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+        raise_on_status=False,  # the callers check the status code themselves
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+_session = None
+_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """the shared session of this process, built on first use"""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = build_session()
+    return _session
+
+
+def set_session(session: requests.Session) -> requests.Session:
+    """replace the shared session, return the previous one. None rebuilds it on next use."""
+    global _session
+    with _lock:
+        previous, _session = _session, session
+    return previous
+
+
+def configure_session(**kwargs) -> requests.Session:
+    """replace the shared session by build_session(**kwargs), e.g. a larger pool for a
+    concurrent evaluation, and return it"""
+    session = build_session(**kwargs)
+    set_session(session)
+    return session
+
+
+def _reset_after_fork():
+    global _session, _lock
+    _session = None
+    _lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,193 @@
+"""
+Parallel benchmark runner. The task indices are distributed over a pool of worker processes,
+each worker appends its results to its own shard file, and the finished task ids are recorded
+in a manifest, so an interrupted run resumes with the unfinished tasks only.
+
+    output_dir/
+        manifest.json           {task_id: shard file name} of the finished tasks
+        shard_<pid>.jsonl       one {"task_id": ..., "result": ...} line per task
+
+The results file of a run is rebuilt from all the recorded results with write_results_csv,
+so a resumed run keeps the rows of the tasks finished before the interruption. A results file
+written before the shard folder existed is imported first with seed_from_results_csv.
+
+Results must be JSON serializable and evaluate_fn must be picklable,
+e.g. a module level function or a functools.partial of one.
+"""
+
+import json
+import os
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, List, Sequence
+
+MANIFEST_FILE = "manifest.json"
+LEGACY_SHARD = "shard_legacy.jsonl"  # the rows imported from a former results file
+
+
+def shard_name() -> str:
+    return f"shard_{os.getpid()}.jsonl"
+
+
+def load_manifest(output_dir: str) -> dict:
+    """return {task_id: shard file name} of the finished tasks"""
+    try:
+        with open(os.path.join(output_dir, MANIFEST_FILE), "r") as f:
+            return {int(task_id): shard for task_id, shard in json.load(f).items()}
+    except FileNotFoundError:
+        return {}
+
+
+def save_manifest(output_dir: str, manifest: dict):
+    # write then rename, so an interrupted run never leaves a broken manifest
+    path = os.path.join(output_dir, MANIFEST_FILE)
+    with open(path + ".tmp", "w") as f:
+        json.dump({str(task_id): shard for task_id, shard in manifest.items()}, f)
+    os.replace(path + ".tmp", path)
+
+
+def run_task(evaluate_fn: Callable[[int], Any], output_dir: str, task_id: int):
+    """run one task in the current process and append its result to the process shard"""
+    result = evaluate_fn(task_id)
+    shard = shard_name()
+    with open(os.path.join(output_dir, shard), "a") as f:
+        f.write(json.dumps({"task_id": task_id, "result": result}) + "\n")
+    return task_id, shard
+
+
+def merge_shards(output_dir: str, task_ids: List[int]) -> List[tuple[int, Any]]:
+    """return the (task_id, result) of the finished tasks, ordered as task_ids.
+    Only the shard lines recorded in the manifest are used, so a result written by a
+    run interrupted before updating the manifest is ignored."""
+    manifest = load_manifest(output_dir)
+    results = {}
+    for shard in sorted(set(manifest.values())):
+        with open(os.path.join(output_dir, shard), "r") as f:
+            for line in f:
+                record = json.loads(line)
+                if manifest.get(record["task_id"]) == shard:
+                    results[record["task_id"]] = record["result"]
+    return [(task_id, results[task_id]) for task_id in task_ids if task_id in results]
+
+
+def write_results_csv(
+    path: str,
+    results: List[tuple[int, Any]],
+    row_fn: Callable[[int, Any], Sequence],
+) -> int:
+    """write one tab separated row per finished task, replacing the file at path.
+    Pass the merged results of run_parallel, which include the tasks of the earlier runs.
+
+    :param path: the results file
+    :type path: str
+    :param results: the (task_id, result) of the finished tasks
+    :type results: List[tuple[int, Any]]
+    :param row_fn: map a task_id and its result to the fields of its row
+    :type row_fn: Callable[[int, Any], Sequence]
+    :return: the number of rows written
+    :rtype: int
+    """
+    # write then rename, so an interrupted write never leaves a truncated results file
+    with open(path + ".tmp", "w") as f:
+        for task_id, result in results:
+            f.write("\t".join(str(field) for field in row_fn(task_id, result)) + "\n")
+    os.replace(path + ".tmp", path)
+    return len(results)
+
+
+def read_results_csv(path: str) -> List[List[str]]:
+    """the rows of a tab separated results file. A row starts with its task id, the other
+    lines continue the last field of the previous row, e.g. a multi-line response."""
+    rows = []
+    with open(path, "r") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            fields = line.split("\t")
+            if len(fields) > 1 and fields[0].isdigit():
+                rows.append(fields)
+            elif rows:
+                rows[-1][-1] += "\n" + line
+    return rows
+
+
+def seed_from_results_csv(
+    output_dir: str, path: str, result_fn: Callable[[List[str]], Any]
+) -> int:
+    """record the rows of a results file written without a shard folder, e.g. by the former
+    evaluators appending to it, as finished tasks of output_dir. The next run_parallel then
+    skips these tasks, and write_results_csv keeps their rows. Nothing is done if output_dir
+    already has a manifest or there is no results file.
+
+    :param output_dir: the folder of the manifest and the shard files
+    :type output_dir: str
+    :param path: the results file
+    :type path: str
+    :param result_fn: map the fields of a row to the result of its task, as evaluate_fn returns it
+    :type result_fn: Callable[[List[str]], Any]
+    :return: the number of imported tasks
+    :rtype: int
+    """
+    if os.path.exists(os.path.join(output_dir, MANIFEST_FILE)) or not os.path.exists(path):
+        return 0
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = {}
+    with open(os.path.join(output_dir, LEGACY_SHARD), "w") as f:
+        for fields in read_results_csv(path):
+            try:
+                task_id, result = int(fields[0]), result_fn(fields)
+            except (IndexError, ValueError):
+                print(f"Skipping the unreadable row of task {fields[0]} in {path}")
+                continue
+            f.write(json.dumps({"task_id": task_id, "result": result}) + "\n")
+            manifest[task_id] = LEGACY_SHARD
+    save_manifest(output_dir, manifest)
+    print(f"Imported {len(manifest)} finished tasks from {path}")
+    return len(manifest)
+
+
+def run_parallel(
+    evaluate_fn: Callable[[int], Any],
+    task_ids: List[int],
+    output_dir: str,
+    num_workers: int = 1,
+) -> List[tuple[int, Any]]:
+    """run evaluate_fn(task_id) for the unfinished task ids over num_workers processes
+
+    :param evaluate_fn: run one task and return its JSON serializable result
+    :type evaluate_fn: Callable[[int], Any]
+    :param task_ids: all the task ids of the benchmark
+    :type task_ids: List[int]
+    :param output_dir: the folder of the manifest and the shard files
+    :type output_dir: str
+    :param num_workers: the number of worker processes, defaults to 1 (run in this process)
+    :type num_workers: int, optional
+    :return: the (task_id, result) of all the finished tasks, ordered as task_ids
+    :rtype: List[tuple[int, Any]]
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = load_manifest(output_dir)
+    evaluate_ids = [task_id for task_id in task_ids if task_id not in manifest]
+    print(f"{len(manifest)} tasks finished, running {len(evaluate_ids)} tasks")
+
+    def finish(task_id: int, shard: str):
+        manifest[task_id] = shard
+        save_manifest(output_dir, manifest)
+
+    if num_workers <= 1:
+        for task_id in evaluate_ids:
+            try:
+                finish(*run_task(evaluate_fn, output_dir, task_id))
+            except Exception:
+                print(f"Task {task_id} failed:\n{traceback.format_exc()}")
+    else:
+        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+            futures = {
+                executor.submit(run_task, evaluate_fn, output_dir, task_id): task_id
+                for task_id in evaluate_ids
+            }
+            for future in as_completed(futures):
+                try:
+                    finish(*future.result())
+                except Exception:
+                    print(f"Task {futures[future]} failed:\n{traceback.format_exc()}")
+    return merge_shards(output_dir, task_ids)
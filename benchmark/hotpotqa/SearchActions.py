@@ -1,9 +1,18 @@
 import os
+import requests
 import wikipedia
 
 from agentlite.actions.BaseAction import BaseAction
+from agentlite.actions.CachedAction import cacheable_action
 
+@cacheable_action(max_size=4096, ttl=24 * 3600)
 class WikipediaSearch(BaseAction):
+    parallel_safe = True  # stateless lookups, see BaseAgent multi_call
+    timeout = 30.0  # a hung wikipedia request must not stall the agent
+    max_retries = 1
+    retry_on = (requests.exceptions.RequestException,)  # not the page or disambiguation errors
+    failure_threshold = 5
+
     def __init__(self) -> None:
         action_name = "Wikipedia_Search"
         action_desc = "Using this API to search Wiki content."
@@ -90,9 +90,11 @@ def f1_score(prediction, ground_truth):
     return f1, precision, recall
 
 
-def run_hotpot_qa_agent(level="easy", llm_name="gpt-3.5-turbo-16k-0613", agent_arch="react", PROMPT_DEBUG_FLAG=False):
+def run_hotpot_qa_agent(level="easy", llm_name="gpt-3.5-turbo-16k-0613", agent_arch="react", PROMPT_DEBUG_FLAG=False, batch_size=1, multi_call=False):
     """
     Test the WikiSearchAgent with a specified dataset level and LLM.
+    With batch_size > 1, the questions are solved in lockstep through BaseAgent.run_batch.
+    With multi_call, the agent can search several entities in one step.
     """
 
     # build the search agent
@@ -108,7 +110,7 @@ def run_hotpot_qa_agent(level="easy", llm_name="gpt-3.5-turbo-16k-0613", agent_a
             }
         )
     llm = get_llm_backend(llm_config)
-    agent = WikiSearchAgent(llm=llm, agent_arch=agent_arch, PROMPT_DEBUG_FLAG=PROMPT_DEBUG_FLAG)
+    agent = WikiSearchAgent(llm=llm, agent_arch=agent_arch, PROMPT_DEBUG_FLAG=PROMPT_DEBUG_FLAG, multi_call=multi_call)
     # add several demo trajectories to the search agent for the HotPotQA benchmark
     hotpot_data = load_hotpot_qa_data(level)
     hotpot_data = hotpot_data.reset_index(drop=True)
@@ -116,22 +118,41 @@ def run_hotpot_qa_agent(level="easy", llm_name="gpt-3.5-turbo-16k-0613", agent_a
         (row["question"], row["answer"]) for _, row in hotpot_data.iterrows()
     ]
     f1_list, correct, results = [], 0, {}
-    for test_task, answer in tqdm(task_instructions, desc="Processing"):
-        test_task_pack = TaskPackage(instruction=test_task)
-        response = agent(test_task_pack)
+    task_packs = [
+        TaskPackage(instruction=test_task, task_id=f"{level}_{idx}")
+        for idx, (test_task, _) in enumerate(task_instructions)
+    ]
+    answers = {
+        task_pack.task_id: answer for task_pack, (_, answer) in zip(task_packs, task_instructions)
+    }
+    progress = tqdm(total=len(task_packs), desc="Processing")
+
+    def record(test_task_pack, response):
+        # write each row as soon as its task ends, so a crash keeps the finished rows
+        nonlocal correct
+        test_task, answer = test_task_pack.instruction, answers[test_task_pack.task_id]
         execution = agent.short_term_memory.get_action_chain(task=test_task_pack)
         f1, _, _ = f1_score(response, answer)
         f1_list.append(f1)
         correct += int(response == answer)
         results[test_task] = (response, answer)
 
-        avg_f1 = np.mean(f1_list)
         acc = correct / len(task_instructions)
-        
+
         dump_str = f"{test_task}\t{answer}\t{response}\t{f1:.4f}\t{acc:.4f}\t{execution}\n"
         with open(f"data/{agent_arch}_{llm_name}_results_{level}.csv", "a") as f:
             f.write(dump_str)
-            
+        progress.update(1)
+
+    if batch_size > 1:
+        agent.run_batch(task_packs, max_concurrency=batch_size, on_finish=record)
+    else:
+        for task_pack in task_packs:
+            record(task_pack, agent(task_pack))
+    progress.close()
+    avg_f1 = np.mean(f1_list)
+    acc = correct / len(task_instructions)
+
     return avg_f1, acc
 
 
@@ -164,9 +185,20 @@ if __name__ == "__main__":
         action='store_true',
         help="debug flag",
     )
+    parser.add_argument(
+        "--batch_size",
+        type=int,
+        default=1,
+        help="number of questions solved in lockstep with batched llm calls",
+    )
+    parser.add_argument(
+        "--multi_call",
+        action='store_true',
+        help="allow several independent searches in one step",
+    )
     args = parser.parse_args()
 
-    f1, acc = run_hotpot_qa_agent(level=args.level, llm_name=args.llm, agent_arch=args.agent_arch, PROMPT_DEBUG_FLAG=args.debug)
+    f1, acc = run_hotpot_qa_agent(level=args.level, llm_name=args.llm, agent_arch=args.agent_arch, PROMPT_DEBUG_FLAG=args.debug, batch_size=args.batch_size, multi_call=args.multi_call)
     print(
         f"{'+'*100}\nLLM model: {args.llm}, Dataset: {args.level}, Result: F1-Score = {f1:.4f}, Accuracy = {acc:.4f}"
     )
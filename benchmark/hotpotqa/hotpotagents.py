@@ -6,14 +6,14 @@ from agentlite.agents import BaseAgent
 from agentlite.commons import AgentAct, TaskPackage
 from agentlite.llm.agent_llms import BaseLLM, get_llm_backend
 from agentlite.llm.LLMConfig import LLMConfig
-from agentlite.logging.terminal_logger import AgentLogger
+from agentlite.logging import BufferedAgentLogger
 
 class WikiSearchAgent(BaseAgent):
     """
     Agent to search Wikipedia content and answer questions.
     """
 
-    def __init__(self, llm: BaseLLM, agent_arch: str = "react", PROMPT_DEBUG_FLAG=False):
+    def __init__(self, llm: BaseLLM, agent_arch: str = "react", PROMPT_DEBUG_FLAG=False, multi_call=False):
         name = "wiki_search_agent"
         role = "Answer questions by searching Wikipedia content."
         constraint = "Generation should be simple and clear."
@@ -34,7 +34,8 @@ class WikiSearchAgent(BaseAgent):
             reasoning_type=reasoning_type,
             constraint=constraint,
             instruction=instruction, # common instruction will use default in agentlite.agent_prompts.prompt_utils.DEFAULT_PROMPT["agent_instruction"]
-            logger=AgentLogger(PROMPT_DEBUG_FLAG=PROMPT_DEBUG_FLAG)
+            logger=BufferedAgentLogger(PROMPT_DEBUG_FLAG=PROMPT_DEBUG_FLAG),
+            multi_call=multi_call, # independent searches of one step run in parallel
         )
         self.__build_examples__()
 
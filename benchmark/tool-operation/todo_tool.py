@@ -1,11 +1,14 @@
 import os
 import json
-import requests
+import sys
 from typing import List, Dict, Any, Union
 from copy import deepcopy
 from dotenv import load_dotenv
 import pdb
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.http_session import get_session
+
 load_dotenv()
 
 URLS = {
@@ -127,7 +130,7 @@ class todo_toolkits:
 
     @log_path
     def get_projects(self):
-        response = requests.get(URLS["get_projects"], headers=GET_HEADERS)
+        response = get_session().get(URLS["get_projects"], headers=GET_HEADERS)
         if response.status_code == 200:
             response = response.json()
             for project in response:
@@ -141,7 +144,7 @@ class todo_toolkits:
     @log_path
     def add_project(self, project=None):
         params = project
-        response = requests.post(URLS["add_projects"], headers=POST_HEADERS, params=params)
+        response = get_session().post(URLS["add_projects"], headers=POST_HEADERS, params=params)
         if response.status_code == 200:
             response = response.json()
             project = self._clean_project(response)
@@ -154,7 +157,7 @@ class todo_toolkits:
         params = {}
         if is_favorite is not None:
             params["is_favorite"] = is_favorite
-        response = requests.post(URLS["update_project"].format(project_id=project_id), headers=POST_HEADERS, params=params)
+        response = get_session().post(URLS["update_project"].format(project_id=project_id), headers=POST_HEADERS, params=params)
         if response.status_code == 200:
             response = response.json()
             project = self._clean_project(response)
@@ -171,7 +174,7 @@ class todo_toolkits:
         params = {
             "project_id": project_id
         }
-        response = requests.get(URLS["get_tasks"], headers=GET_HEADERS, params=params)
+        response = get_session().get(URLS["get_tasks"], headers=GET_HEADERS, params=params)
         if response.status_code == 200:
             response = response.json()
             for task in response:
@@ -182,7 +185,7 @@ class todo_toolkits:
 
     @log_path
     def get_task_description(self, task_id=None):
-        response = requests.get(URLS["get_task_by_id"].format(task_id=task_id), headers=GET_HEADERS)
+        response = get_session().get(URLS["get_task_by_id"].format(task_id=task_id), headers=GET_HEADERS)
         if response.status_code == 200:
             response = response.json()
             return_data = {
@@ -196,7 +199,7 @@ class todo_toolkits:
 
     @log_path
     def get_task_duration(self, task_id=None):
-        response = requests.get(URLS["get_task_by_id"].format(task_id=task_id), headers=GET_HEADERS)
+        response = get_session().get(URLS["get_task_by_id"].format(task_id=task_id), headers=GET_HEADERS)
         if response.status_code == 200:
             response = response.json()
             return_data = {
@@ -229,7 +232,7 @@ class todo_toolkits:
             "priority": priority
             # "labels": labels
         }
-        response = requests.post(URLS["add_tasks"], headers=POST_HEADERS, params=params)
+        response = get_session().post(URLS["add_tasks"], headers=POST_HEADERS, params=params)
         if response.status_code == 200:
             response = response.json()
             response = self._clean_task(response)
@@ -240,7 +243,7 @@ class todo_toolkits:
     @log_path
     def complete_task(self, task_id=None):
         # First, we should whether this task is exists
-        response = requests.get(URLS["get_task_by_id"].format(task_id=task_id), headers=GET_HEADERS)
+        response = get_session().get(URLS["get_task_by_id"].format(task_id=task_id), headers=GET_HEADERS)
         if response.status_code == 200:
             response = response.json()
             task = self._clean_task(response)
@@ -248,7 +251,7 @@ class todo_toolkits:
             return False, f"Task {task_id} is not exists."
 
         # Second, we should complete this task 
-        response = requests.post(URLS["complete_tasks"].format(task_id=task_id), headers=POST_HEADERS)
+        response = get_session().post(URLS["complete_tasks"].format(task_id=task_id), headers=POST_HEADERS)
         if response.status_code == 204:
             return_object = {}
             return_object["message"] = "Complete task successfully."
@@ -263,7 +266,7 @@ class todo_toolkits:
         params = {
             "due_date": due_date
         }
-        response = requests.post(URLS["update_tasks"].format(task_id=task_id), headers=POST_HEADERS, params=params)
+        response = get_session().post(URLS["update_tasks"].format(task_id=task_id), headers=POST_HEADERS, params=params)
         if response.status_code == 200:
             task = response.json()
             task = self._clean_task(task)
@@ -277,7 +280,7 @@ class todo_toolkits:
     @log_path
     def delete_project(self, project_id=None):
         # First, we should whether this project is exists
-        response = requests.get(URLS["get_project_by_id"].format(project_id=project_id), headers=GET_HEADERS)
+        response = get_session().get(URLS["get_project_by_id"].format(project_id=project_id), headers=GET_HEADERS)
         if response.status_code == 200:
             response = response.json()
             project = self._clean_project(response)
@@ -285,7 +288,7 @@ class todo_toolkits:
             return False, f"Project {project_id} is not exists."
         
         # Second, we should delete this project
-        response = requests.delete(URLS["delete_projects"].format(project_id=project_id), headers=POST_HEADERS)
+        response = get_session().delete(URLS["delete_projects"].format(project_id=project_id), headers=POST_HEADERS)
         # return response.json()
         if response.status_code == 204:
             return True, project
@@ -295,7 +298,7 @@ class todo_toolkits:
     @log_path
     def delete_task(self, task_id=None):
         # First, we should whether this task is exists
-        response = requests.get(URLS["get_task_by_id"].format(task_id=task_id), headers=GET_HEADERS)
+        response = get_session().get(URLS["get_task_by_id"].format(task_id=task_id), headers=GET_HEADERS)
         if response.status_code == 200:
             response = response.json()
             task = self._clean_task(response)
@@ -303,7 +306,7 @@ class todo_toolkits:
             return False, f"Task {task_id} is not exists."
 
         # Second, we should delete this task
-        response = requests.delete(URLS["delete_task"].format(task_id=task_id), headers=POST_HEADERS)
+        response = get_session().delete(URLS["delete_task"].format(task_id=task_id), headers=POST_HEADERS)
         if response.status_code == 204:
             returned_object = {}
             returned_object["message"] = "Delete the task successfully."
@@ -341,7 +344,7 @@ class todo_toolkits:
         return project
     
     def _get_all_projects(self):
-        response = requests.get(URLS["get_projects"], headers=GET_HEADERS)
+        response = get_session().get(URLS["get_projects"], headers=GET_HEADERS)
         if response.status_code == 200:
             response = response.json()
             for project in response:
@@ -353,7 +356,7 @@ class todo_toolkits:
             return False, response.text
 
     def _get_all_tasks(self):
-        # response = requests.get(URLS["get_tasks"], headers=GET_HEADERS)
+        # response = get_session().get(URLS["get_tasks"], headers=GET_HEADERS)
         # get project first 
         tasks = []
         _, projects = self._get_all_projects()
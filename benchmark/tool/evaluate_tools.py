@@ -1,5 +1,7 @@
 import argparse
 import os
+import sys
+from functools import partial
 
 from tool_utils import get_data
 from tool_agents import WeatherAgent, MovieAgent, AcademiaAgent
@@ -15,20 +17,24 @@ from agentlite.llm.agent_llms import BaseLLM, get_llm_backend
 from agentlite.llm.LLMConfig import LLMConfig
 from agentlite.logging.terminal_logger import AgentLogger
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.runner import run_parallel, seed_from_results_csv, write_results_csv
+
 LAM_URL = os.environ["LAM_URL"]
 
-def evaluate(data_name: str, idx: int, llm_name="gpt-4", agent_arch="react", PROMPT_DEBUG_FLAG=False):
+def evaluate(data_name: str, idx: int, llm_name="gpt-4", agent_arch="react", PROMPT_DEBUG_FLAG=False, llm_cache=None):
     if llm_name in ["xlam", "xlam_v2"]:
         llm_config = LLMConfig(
             {
                 "llm_name": llm_name, 
                 "temperature": 0.0, 
                 "base_url": LAM_URL,
-                "api_key": "EMPTY"
+                "api_key": "EMPTY",
+                "cache_path": llm_cache,
             }
         )
     else:
-        llm_config = LLMConfig({"llm_name": llm_name, "temperature": 0.0})
+        llm_config = LLMConfig({"llm_name": llm_name, "temperature": 0.0, "cache_path": llm_cache})
     llm = get_llm_backend(llm_config)
     dataset_i = get_data(idx, data_name)
     tool_type = dataset_i["tool"]
@@ -63,19 +69,6 @@ def evaluate(data_name: str, idx: int, llm_name="gpt-4", agent_arch="react", PRO
         print(f"Reward: {reward}")
         return reward, task, response
 
-# using this function to rerun the evaluation if breaks
-def get_runned_ids(file_path):
-    try:
-        with open(file_path, "r") as file:
-            runned_ids = [int(line.split()[0]) for line in file]
-        return runned_ids
-    except FileNotFoundError:
-        print("The file was not found.")
-        return None
-    except ValueError:
-        print("The last item in the last line is not a valid number.")
-        return None
-
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
         description="Test Search Agent on the webshop Benchmark"
@@ -104,25 +97,31 @@ if __name__ == "__main__":
         action='store_true',
         help="debug flag",
     )
+    parser.add_argument(
+        "--llm_cache",
+        type=str,
+        default=None,
+        help="SQLite file caching llm responses, makes reruns nearly free",
+    )
+    parser.add_argument(
+        "--num_workers",
+        type=int,
+        default=1,
+        help="number of worker processes running the tasks in parallel",
+    )
     args = parser.parse_args()
     rewards = []
     REWARD_LOG_FILE = f"{args.llm}_{args.agent_arch}_{args.data_name}_results_tools.csv"
     all_task_ids = list(range(0, 60))
-    finished_ids = get_runned_ids(REWARD_LOG_FILE)
-    if finished_ids is None:
-        evaluate_ids = all_task_ids
-    else:
-        evaluate_ids = [id for id in all_task_ids if id not in finished_ids]
+    # finished tasks are recorded in the shard folder, rerunning resumes the unfinished ones
+    evaluate_fn = partial(evaluate, args.data_name, llm_name=args.llm, agent_arch=args.agent_arch, PROMPT_DEBUG_FLAG=args.debug, llm_cache=args.llm_cache)
+    shard_dir = REWARD_LOG_FILE.replace(".csv", "_shards")
+    # the rows of a run started before the shard folder existed: reward, task, response
+    seed_from_results_csv(shard_dir, REWARD_LOG_FILE, lambda fields: [float(fields[2]), fields[1], "\t".join(fields[3:])])
+    results = run_parallel(evaluate_fn, all_task_ids, output_dir=shard_dir, num_workers=args.num_workers)
 
-    with open(REWARD_LOG_FILE, "a") as f:
-        for idx in evaluate_ids:
-            reward, task, response = evaluate(data_name=args.data_name, idx=idx, llm_name=args.llm, agent_arch=args.agent_arch, PROMPT_DEBUG_FLAG=args.debug)
-            print(f"Task: {task}")
-            print(f"Response: {response}")
-            print(f"Reward: {reward}")
-            print("=====================================")
-            reward_str = f"""{idx}\t{task}\t{reward}\t{response}\n"""
-            f.write(reward_str)
+    # rebuilt from all the recorded results, so resuming keeps the rows of the earlier runs
+    write_results_csv(REWARD_LOG_FILE, results, lambda idx, result: (idx, result[1], result[0], result[2]))
     
     # calculate the average reward
     # read the file and calculate the average reward
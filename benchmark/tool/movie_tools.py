@@ -1,10 +1,15 @@
-import requests
 import copy
 from copy import deepcopy
 from typing import List, Dict, Any, Union
 import os
+import sys
 from dotenv import load_dotenv
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.http_session import get_session
+
+from agentlite.actions.CachedAction import cached_call
+
 load_dotenv()
 
 url = 'https://api.themoviedb.org/3/search/movie'
@@ -34,6 +39,9 @@ params = {
     'page': '1'
 }
 
+# the movie database lookups are idempotent, successful responses are cached
+cache_lookup = cached_call(max_size=4096, method=True, cache_if=lambda result: result[0])
+
 headers = {
     'Authorization': 'Bearer {}'.format(os.environ["MOVIE_KEY"] if "MOVIE_KEY" in os.environ.keys() else ""),
 }
@@ -92,13 +100,14 @@ class movie_toolkits:
         pass
 
     @log_path
+    @cache_lookup
     def get_search_movie(self, movie_name=None):
         url = URLS['search']['movie']
         params['query'] = movie_name
         params['include_adult'] = 'false'
         params['language'] = 'en-US'
         params['page'] = '1'
-        response = requests.get(url, params=params, headers=headers)
+        response = get_session().get(url, params=params, headers=headers)
         if response.status_code == 200:
             data = response.json()
             # json.dump(data, open("search_movie.json", "w"), indent=4)
@@ -113,9 +122,10 @@ class movie_toolkits:
             return False, response.text
 
     @log_path
+    @cache_lookup
     def get_movie_details(self, movie_id=None):
         url = URLS['movies']['details'].format(movie_id=movie_id)
-        response = requests.get(url, headers=headers)
+        response = get_session().get(url, headers=headers)
         if response.status_code == 200:
             data = response.json()
             # json.dump(data, open("movie_details.json", "w"), indent=4)
@@ -134,9 +144,10 @@ class movie_toolkits:
             return False, response.text
 
     @log_path
+    @cache_lookup
     def get_movie_production_companies(self, movie_id=None):
         url = URLS['movies']['details'].format(movie_id=movie_id)
-        response = requests.get(url, headers=headers)
+        response = get_session().get(url, headers=headers)
         if response.status_code == 200:
             data = response.json()
             # json.dump(data, open("movie_details.json", "w"), indent=4)
@@ -148,9 +159,10 @@ class movie_toolkits:
             return False, response.text
     
     @log_path
+    @cache_lookup
     def get_movie_production_countries(self, movie_id=None):
         url = URLS['movies']['details'].format(movie_id=movie_id)
-        response = requests.get(url, headers=headers)
+        response = get_session().get(url, headers=headers)
         if response.status_code == 200:
             data = response.json()
             # json.dump(data, open("movie_details.json", "w"), indent=4)
@@ -162,9 +174,10 @@ class movie_toolkits:
             return False, response.text
 
     @log_path
+    @cache_lookup
     def get_movie_cast(self, movie_id=None):
         url = URLS['movies']['credits'].format(movie_id=movie_id)
-        response = requests.get(url, headers=headers)
+        response = get_session().get(url, headers=headers)
         if response.status_code == 200:
             data = response.json()
             
@@ -177,9 +190,10 @@ class movie_toolkits:
             return False, response.text
         
     @log_path
+    @cache_lookup
     def get_movie_crew(self, movie_id=None):
         url = URLS['movies']['credits'].format(movie_id=movie_id)
-        response = requests.get(url, headers=headers)
+        response = get_session().get(url, headers=headers)
         if response.status_code == 200:
             data = response.json()
             
@@ -202,9 +216,10 @@ class movie_toolkits:
             return False, response.text
 
     @log_path
+    @cache_lookup
     def get_movie_keywords(self, movie_id=None):
         url = URLS['movies']['keywords'].format(movie_id=movie_id)
-        response = requests.get(url, headers=headers)
+        response = get_session().get(url, headers=headers)
         if response.status_code == 200:
             data = response.json()
             # json.dump(data, open("movie_keywords.json", "w"), indent=4)
@@ -216,13 +231,14 @@ class movie_toolkits:
             return False, response.text
 
     @log_path
+    @cache_lookup
     def get_search_person(self, person_name=None):
         url = URLS['search']['person']
         params['query'] = person_name
         params['include_adult'] = 'false'
         params['language'] = 'en-US'
         params['page'] = '1'
-        response = requests.get(url, params=params, headers=headers)
+        response = get_session().get(url, params=params, headers=headers)
         if response.status_code == 200:
             data = response.json()
             # print(data)
@@ -240,9 +256,10 @@ class movie_toolkits:
             return False, response.text
 
     @log_path
+    @cache_lookup
     def get_person_details(self, person_id=None):
         url = URLS['people']['details'].format(person_id=person_id)
-        response = requests.get(url, headers=headers)
+        response = get_session().get(url, headers=headers)
         if response.status_code == 200:
             data = response.json()
             # json.dump(data, open("people_details.json", "w"), indent=4)
@@ -258,9 +275,10 @@ class movie_toolkits:
             return False, response.text
         
     @log_path
+    @cache_lookup
     def get_person_cast(self, person_id=None):
         url = URLS['people']['movie_credits'].format(person_id=person_id)
-        response = requests.get(url, headers=headers)
+        response = get_session().get(url, headers=headers)
         if response.status_code == 200:
             data = response.json()
             # json.dump(data, open("people_movie_credits.json", "w"), indent=4)
@@ -272,9 +290,10 @@ class movie_toolkits:
             return False, response.text
         
     @log_path
+    @cache_lookup
     def get_person_crew(self, person_id=None):
         url = URLS['people']['movie_credits'].format(person_id=person_id)
-        response = requests.get(url, headers=headers)
+        response = get_session().get(url, headers=headers)
         if response.status_code == 200:
             data = response.json()
             # json.dump(data, open("people_movie_credits.json", "w"), indent=4)
@@ -286,11 +305,12 @@ class movie_toolkits:
             return False, response.text
 
     @log_path
+    @cache_lookup
     def get_person_external_ids(self, person_id=None):
         url = URLS['people']['external_ids'].format(
             person_id=person_id
         )
-        response = requests.get(url, headers=headers)
+        response = get_session().get(url, headers=headers)
         if response.status_code == 200:
             data = response.json()
             # json.dump(data, open("people_external_ids.json", "w"), indent=4)            
@@ -305,11 +325,12 @@ class movie_toolkits:
             return False, response.text
 
     @log_path
+    @cache_lookup
     def get_movie_alternative_titles(self, movie_id=None):
         url = URLS['movies']['alternative_titles'].format(
             movie_id=movie_id
         )
-        response = requests.get(url, headers=headers)
+        response = get_session().get(url, headers=headers)
         if response.status_code == 200:
             data = response.json()
             # json.dump(data, open("movie_alternative_titles.json", "w"), indent=4, ensure_ascii=False)            
@@ -319,11 +340,12 @@ class movie_toolkits:
             return False, response.text
     
     @log_path
+    @cache_lookup
     def get_movie_translation(self, movie_id=None):
         url = URLS["movies"]["translation"].format(
             movie_id=movie_id
         )
-        response = requests.get(url, headers=headers)
+        response = get_session().get(url, headers=headers)
         if response.status_code == 200:
             data = response.json()
             # json.dump(data, open("movie_translation.json", "w"), indent=4, ensure_ascii=False)            
@@ -4,7 +4,7 @@ from agentlite.actions.InnerActions import INNER_ACT_KEY
 from agentlite.agents import ABCAgent, BaseAgent
 from agentlite.commons import AgentAct, TaskPackage
 from agentlite.llm.agent_llms import BaseLLM
-from agentlite.logging.terminal_logger import AgentLogger
+from agentlite.logging import BufferedAgentLogger
 
 class WeatherAgent(BaseAgent):
     def __init__(self, env, llm: BaseLLM, agent_arch: str = "react", PROMPT_DEBUG_FLAG=False):
@@ -15,7 +15,7 @@ class WeatherAgent(BaseAgent):
             role=role,
             llm=llm,
             actions=[],
-            logger=AgentLogger(PROMPT_DEBUG_FLAG=PROMPT_DEBUG_FLAG)
+            logger=BufferedAgentLogger(PROMPT_DEBUG_FLAG=PROMPT_DEBUG_FLAG)
         )
         self.agent_arch = agent_arch
         self.env = env
@@ -191,7 +191,7 @@ class AcademiaAgent(BaseAgent):
             role=role,
             llm=llm,
             actions=[],
-            logger=AgentLogger(PROMPT_DEBUG_FLAG=PROMPT_DEBUG_FLAG)
+            logger=BufferedAgentLogger(PROMPT_DEBUG_FLAG=PROMPT_DEBUG_FLAG)
         )
         self.agent_arch = agent_arch
         self.env = env
@@ -323,7 +323,7 @@ class MovieAgent(BaseAgent):
             role=role,
             llm=llm,
             actions=[],
-            logger=AgentLogger(PROMPT_DEBUG_FLAG=PROMPT_DEBUG_FLAG)
+            logger=BufferedAgentLogger(PROMPT_DEBUG_FLAG=PROMPT_DEBUG_FLAG)
         )
         self.agent_arch = agent_arch
         self.env = env
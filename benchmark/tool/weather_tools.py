@@ -1,10 +1,16 @@
-import requests
 import logging
+import os
+import sys
 from geopy.distance import geodesic
 from datetime import datetime
 from copy import deepcopy
 from datetime import datetime, timedelta
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.http_session import get_session
+
+from agentlite.actions.CachedAction import cached_call
+
 logging.basicConfig(
     format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
     datefmt="%Y-%m-%d %H:%M:%S",
@@ -77,6 +83,9 @@ def log_path(func):
             return func(*args, **kwargs)
     return wrapper
 
+# geocoding, elevation and zipcode lookups do not change over time, successful responses are cached
+cache_lookup = cached_call(max_size=4096, method=True, cache_if=lambda result: result[0])
+
 class weather_toolkits:
     def __init__(self, init_config=None):
         self.current_date = datetime.now().strftime("%Y-%m-%d")
@@ -137,7 +146,7 @@ class weather_toolkits:
             "timezone": "GMT",   # Use default timezone
             "daily": "temperature_2m_max,temperature_2m_min,temperature_2m_mean"
         }
-        response = requests.get(URLS["historical_weather"], params=params)
+        response = get_session().get(URLS["historical_weather"], params=params)
         if response.status_code == 200:
             return True, _clean( response.json() )
         else:
@@ -182,7 +191,7 @@ class weather_toolkits:
             "timezone": "GMT",   # Use default timezone
             "daily": "rain_sum"
         } 
-        response = requests.get(URLS["historical_weather"], params=params)
+        response = get_session().get(URLS["historical_weather"], params=params)
         if response.status_code == 200:
             return True, _clean( response.json() )
         else:
@@ -227,7 +236,7 @@ class weather_toolkits:
             "timezone": "GMT",   # Use default timezone
             "daily": "snowfall_sum"
         } 
-        response = requests.get(URLS["historical_weather"], params=params)
+        response = get_session().get(URLS["historical_weather"], params=params)
         if response.status_code == 200:
             return True, _clean( response.json() )
         else:
@@ -286,6 +295,7 @@ class weather_toolkits:
         return success, response
 
     @log_path
+    @cache_lookup
     def get_latitude_longitude(self, name=None):
         def _clean(response):
             for item in response["results"]:
@@ -322,7 +332,7 @@ class weather_toolkits:
             "format": "json"
         }
 
-        response = requests.get(URLS["geocoding"], params=params)
+        response = get_session().get(URLS["geocoding"], params=params)
         if response.status_code == 200:
             return True, _clean( response.json() )
         else:
@@ -336,19 +346,20 @@ class weather_toolkits:
             "hourly": "european_aqi_pm2_5"
             # "hourly": hourly
         }
-        response = requests.get(URLS["air_quality"], params=params)
+        response = get_session().get(URLS["air_quality"], params=params)
         if response.status_code == 200:
             return True, response.json()
         else:
             return False, response.text
 
     @log_path
+    @cache_lookup
     def get_elevation(self, latitude=None, longitude=None):
         params = {
             "latitude": latitude,
             "longitude": longitude
         }
-        response = requests.get(URLS["elevation"], params=params)
+        response = get_session().get(URLS["elevation"], params=params)
         if response.status_code == 200:
             return True, response.json()
         else:
@@ -495,7 +506,7 @@ class weather_toolkits:
             "timezone": "GMT",   # Use default timezone
             "hourly": "european_aqi_pm2_5"
         }
-        response = requests.get(URLS["air_quality"], params=params)
+        response = get_session().get(URLS["air_quality"], params=params)
         if response.status_code == 200:
             response = _clean( response.json() )
             response = _gather_data( response )
@@ -533,8 +544,9 @@ class weather_toolkits:
         return True, response
     
     @log_path
+    @cache_lookup
     def convert_zipcode_to_address(self, zipcode):
-        response = requests.get(URLS["zipcode"].format(zipcode=zipcode))
+        response = get_session().get(URLS["zipcode"].format(zipcode=zipcode))
         if response.status_code == 200:
             return True, response.json()
         else:
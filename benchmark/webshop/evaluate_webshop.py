@@ -1,7 +1,9 @@
 from typing import List
 
 import os
+import sys
 import argparse
+from functools import partial
 
 from webshop_agents import WebshopAgent
 from webshop_env import Webshop
@@ -15,6 +17,9 @@ from agentlite.llm.agent_llms import BaseLLM, get_llm_backend
 from agentlite.llm.LLMConfig import LLMConfig
 from agentlite.logging.terminal_logger import AgentLogger
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.runner import run_parallel, seed_from_results_csv, write_results_csv
+
 webshop_env = Webshop()
 # =============================== start of webshop agent designing =============================== #
 
@@ -50,19 +55,6 @@ def evaluate(idx: int, llm_name="gpt-3.5-turbo-16k-0613", agent_arch="react", PR
     sub_reward = webshop_env.sub_reward
     return reward, sub_reward, task
 
-# using this function to rerun the evaluation if breaks
-def get_runned_ids(file_path):
-    try:
-        with open(file_path, "r") as file:
-            runned_ids = [int(line.split()[0]) for line in file]
-        return runned_ids
-    except FileNotFoundError:
-        print("The file was not found.")
-        return None
-    except ValueError:
-        print("The last item in the last line is not a valid number.")
-        return None
-
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
         description="Test Search Agent on the webshop Benchmark"
@@ -85,31 +77,34 @@ if __name__ == "__main__":
         action='store_true',
         help="debug flag",
     )
+    parser.add_argument(
+        "--num_workers",
+        type=int,
+        default=1,
+        help="number of worker processes running the tasks in parallel",
+    )
     args = parser.parse_args()
     rewards = []
     all_task_ids = list(range(0, 251))
     REWARD_LOG_FILE = f"{args.llm}_{args.agent_arch}_results_webshop.csv"
-    runned_ids = get_runned_ids(REWARD_LOG_FILE)
-    if runned_ids is None:
-        evaluate_ids = all_task_ids
-    else:
-        evaluate_ids = [id for id in all_task_ids if id not in runned_ids]
-
-    # running webshop evaluation
-    with open(REWARD_LOG_FILE, "a") as f:
-        for i in evaluate_ids:
-            reward, subreward, task = evaluate(i, llm_name=args.llm, agent_arch=args.agent_arch, PROMPT_DEBUG_FLAG=args.debug)
-            rewards.append(reward)
-            reward_str = f"""{i}\t{task}\t{subreward}\t{reward}\n"""
-            f.write(reward_str)
+    # running webshop evaluation, finished tasks are recorded in the shard folder
+    # and rerunning resumes the unfinished ones
+    evaluate_fn = partial(evaluate, llm_name=args.llm, agent_arch=args.agent_arch, PROMPT_DEBUG_FLAG=args.debug)
+    shard_dir = REWARD_LOG_FILE.replace(".csv", "_shards")
+    # the rows of a run started before the shard folder existed: reward, subreward, task
+    seed_from_results_csv(shard_dir, REWARD_LOG_FILE, lambda fields: [float(fields[3]), fields[2], fields[1]])
+    results = run_parallel(evaluate_fn, all_task_ids, output_dir=shard_dir, num_workers=args.num_workers)
+    # rebuilt from all the recorded results, so resuming keeps the rows of the earlier runs
+    write_results_csv(REWARD_LOG_FILE, results, lambda i, result: (i, result[2], result[1], result[0]))
     
     # calculate the average reward
-    # read the file and calculate the average reward
-    with open(REWARD_LOG_FILE, "r") as f:
-        lines = f.readlines()
-        rewards = [float(line.split('\t')[3]) for line in lines]
-    
-    avg_reward = sum(rewards) / len(rewards)
+    # the rewards are keyed by task_id, the tasks which failed have no row
+    rewards = {task_id: float(result[0]) for task_id, result in results}
+    missing = [task_id for task_id in all_task_ids if task_id not in rewards]
+    if missing:
+        print(f"{len(missing)} tasks have no result, rerun to retry them: {missing}")
+
+    avg_reward = sum(rewards.values()) / len(rewards)
     print(f"The average reward is: {avg_reward}")
     
     with open("complexity.csv") as f:
@@ -118,6 +113,8 @@ if __name__ == "__main__":
     hard_reward = []
     easy_reward = []
     for i, c in enumerate(complexity):
+        if i not in rewards:
+            continue
         if c == "easy":
             easy_reward.append(rewards[i])
         elif c == "hard":
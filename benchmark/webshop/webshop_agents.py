@@ -7,7 +7,7 @@ from agentlite.agents import ABCAgent, BaseAgent
 from agentlite.commons import AgentAct, TaskPackage
 from agentlite.llm.agent_llms import BaseLLM, get_llm_backend
 from agentlite.llm.LLMConfig import LLMConfig
-from agentlite.logging.terminal_logger import AgentLogger
+from agentlite.logging import BufferedAgentLogger
 
 class WebshopAgent(BaseAgent):
     """
@@ -34,7 +34,7 @@ class WebshopAgent(BaseAgent):
                 SearchAction(session_idx=session_idx, env=env),
             ],
             reasoning_type=reasoning_type,
-            logger=AgentLogger(PROMPT_DEBUG_FLAG=PROMPT_DEBUG_FLAG)
+            logger=BufferedAgentLogger(PROMPT_DEBUG_FLAG=PROMPT_DEBUG_FLAG)
         )
         self.__build_examples__()
     
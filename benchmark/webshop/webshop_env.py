@@ -1,25 +1,22 @@
 import re
 import os
 import pdb
+import sys
 import yaml
-import requests
 import logging
-from bs4 import BeautifulSoup
-from bs4.element import Comment
 from pathlib import Path
 from difflib import get_close_matches
 from urllib.parse import quote_plus
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.http_session import get_session
+from webshop_html import extract_observation
+
 
 def clean_str(p):
     return p.encode("latin-1", errors="ignore").decode("latin-1")
 
 
-def tag_visible(element):
-    ignore = {"style", "script", "head", "title", "meta", "[document]"}
-    return element.parent.name not in ignore and not isinstance(element, Comment)
-
-
 ACTION_TO_TEMPLATE = {
     "Description": "description_page.html",
     "Features": "features_page.html",
@@ -29,8 +26,9 @@ ACTION_TO_TEMPLATE = {
 
 
 class Webshop:
-    def __init__(self, web_url="http://127.0.0.1:3000"):
+    def __init__(self, web_url="http://127.0.0.1:3000", http_session=None):
         self.sessions = {}
+        self.http_session = http_session  # None uses the shared session of common.http_session
         self.session = None
         self.web_url = web_url
         self.action_space = []
@@ -298,76 +296,14 @@ class Webshop:
         # Mark request URL
         request_id = "Resquest: " + url
         headers = {"X-Request-ID": request_id}
-        html = requests.get(url, headers=headers).text
-        html_obj = BeautifulSoup(html, "html.parser")
-        texts = html_obj.findAll(text=True)
-        visible_texts = list(filter(tag_visible, texts))
-        if False:
-            # For `simple` mode, return just [SEP] separators
-            return " [SEP] ".join(t.strip() for t in visible_texts if t != "\n")
-        else:
-            # Otherwise, return an observation with tags mapped to specific, unique separators
-            observation = ""
-            option_type = ""
-            options = {}
-            asins = []
-            cnt = 0
-            prod_cnt = 0
-            just_prod = 0
-            skip_counter = 0
-            for i, t in enumerate(visible_texts):
-                if skip_counter > 0:
-                    skip_counter -= 1
-                    continue  # progress score is invisible
-                if t == "\n":
-                    continue
-                if t.replace("\n", "").replace("\\n", "").replace(" ", "") == "":
-                    continue
-                if "Your progress score (min 0.0, max 1.0)" in t:
-                    skip_counter = 1  # skip twice
-                    self.reward = float(visible_texts[i + 1])
-                    if float(visible_texts[i + 1]) > self.sub_reward:
-                        self.sub_reward = float(visible_texts[i + 1])
-                    continue  # progress score is invisible
-                if t.parent.name == "button":  # button
-                    processed_t = f"\n[{t}] "
-                elif t.parent.name == "label":  # options
-                    if f"'{t}'" in url:
-                        processed_t = f"[[{t}]]"
-                    else:
-                        processed_t = f"[{t}]"
-                    options[str(t)] = option_type
-                elif t.parent.get("class") == ["product-link"]:  # product asins
-                    processed_t = f"\n[{t}] "
-                    if prod_cnt >= 3:
-                        processed_t = ""
-                    prod_cnt += 1
-                    asins.append(str(t))
-                    just_prod = 0
-                else:  # regular, unclickable text
-                    processed_t = "\n" + str(t) + " "
-                    if cnt < 2 and page_type != "init":
-                        processed_t = ""
-                    if just_prod <= 2 and prod_cnt >= 4:
-                        processed_t = ""
-                    option_type = str(t)
-                    cnt += 1
-                just_prod += 1
-                observation += processed_t
-            info = {}
-            if options:
-                info["option_types"] = options
-            if asins:
-                info["asins"] = asins
-            if "Your score (min 0.0, max 1.0)" in visible_texts:
-                idx = visible_texts.index("Your score (min 0.0, max 1.0)")
-                info["reward"] = float(visible_texts[idx + 1])
-                self.reward = info["reward"]
-                if float(visible_texts[idx + 1]) > self.sub_reward:
-                    self.sub_reward = float(visible_texts[idx + 1])
-                observation = (
-                    "Result: [Success]"
-                    if float(visible_texts[idx + 1]) == 1.0
-                    else "Result: [False]"
-                )
-            return clean_str(observation), info
+        html = (self.http_session or get_session()).get(url, headers=headers).text
+        observation, info, progress_scores = extract_observation(html, url, page_type)
+        for score in progress_scores:
+            self.reward = score
+            if score > self.sub_reward:
+                self.sub_reward = score
+        if "reward" in info:
+            self.reward = info["reward"]
+            if info["reward"] > self.sub_reward:
+                self.sub_reward = info["reward"]
+        return clean_str(observation), info
@@ -0,0 +1,113 @@
+"""
+HTML to observation extraction of the WebShop pages.
+
+The visible text nodes are collected in one walk over the parsed page and mapped to the
+observation in a single pass, with the parts joined once at the end. The output is the
+same as the former findAll(text=True) / tag_visible / `+=` pipeline of Webshop.webshop_text,
+which the golden pages in tests/webshop_pages pin down.
+
+The parser backend is lxml when it is installed, html.parser otherwise. Set the
+WEBSHOP_HTML_PARSER environment variable to force one.
+"""
+
+import os
+
+from bs4 import BeautifulSoup
+from bs4.element import Comment, NavigableString
+
+PROGRESS_SCORE_TEXT = "Your progress score (min 0.0, max 1.0)"
+SCORE_TEXT = "Your score (min 0.0, max 1.0)"
+INVISIBLE_TAGS = frozenset(["style", "script", "head", "title", "meta", "[document]"])
+
+
+def default_parser() -> str:
+    parser = os.environ.get("WEBSHOP_HTML_PARSER")
+    if parser:
+        return parser
+    try:
+        import lxml  # noqa: F401
+
+        return "lxml"
+    except ImportError:
+        return "html.parser"
+
+
+HTML_PARSER = default_parser()
+
+
+def visible_texts(html: str, parser: str = None) -> list:
+    """the visible text nodes of the page, in document order"""
+    soup = BeautifulSoup(html, parser or HTML_PARSER)
+    return [
+        node
+        for node in soup.descendants
+        if isinstance(node, NavigableString)
+        and node.parent.name not in INVISIBLE_TAGS
+        and not isinstance(node, Comment)
+    ]
+
+
+def extract_observation(
+    html: str, url: str, page_type: str, parser: str = None
+) -> tuple[str, dict, list]:
+    """map a WebShop page to the observation of the agent.
+    Buttons become `[text]`, options `[text]` or `[[text]]` when selected in url, and the
+    first three product asins `[asin]`. The progress scores are hidden from the observation.
+
+    :return: the observation, the info dict (option_types, asins and reward when present)
+        and the progress scores shown on the page
+    """
+    texts = visible_texts(html, parser)
+    parts = []
+    progress_scores = []
+    option_type = ""
+    options = {}
+    asins = []
+    cnt = 0
+    prod_cnt = 0
+    just_prod = 0
+    skip_next = False
+    for i, t in enumerate(texts):
+        if skip_next:  # the progress score value
+            skip_next = False
+            continue
+        if t == "\n":
+            continue
+        if t.replace("\n", "").replace("\\n", "").replace(" ", "") == "":
+            continue
+        if PROGRESS_SCORE_TEXT in t:
+            skip_next = True
+            progress_scores.append(float(texts[i + 1]))
+            continue
+        parent = t.parent
+        if parent.name == "button":  # button
+            parts.append(f"\n[{t}] ")
+        elif parent.name == "label":  # options
+            if f"'{t}'" in url:
+                parts.append(f"[[{t}]]")
+            else:
+                parts.append(f"[{t}]")
+            options[str(t)] = option_type
+        elif parent.get("class") == ["product-link"]:  # product asins
+            if prod_cnt < 3:
+                parts.append(f"\n[{t}] ")
+            prod_cnt += 1
+            asins.append(str(t))
+            just_prod = 0
+        else:  # regular, unclickable text
+            if (cnt >= 2 or page_type == "init") and not (just_prod <= 2 and prod_cnt >= 4):
+                parts.append("\n" + str(t) + " ")
+            option_type = str(t)
+            cnt += 1
+        just_prod += 1
+    observation = "".join(parts)
+    info = {}
+    if options:
+        info["option_types"] = options
+    if asins:
+        info["asins"] = asins
+    if SCORE_TEXT in texts:
+        idx = texts.index(SCORE_TEXT)
+        info["reward"] = float(texts[idx + 1])
+        observation = "Result: [Success]" if info["reward"] == 1.0 else "Result: [False]"
+    return observation, info, progress_scores
@@ -6,7 +6,7 @@ from agentlite.agents import ABCAgent, BaseAgent, ManagerAgent
 from agentlite.commons import AgentAct, TaskPackage
 from agentlite.llm.agent_llms import BaseLLM, get_llm_backend
 from agentlite.llm.LLMConfig import LLMConfig
-from agentlite.logging.terminal_logger import AgentLogger
+from agentlite.logging import BufferedAgentLogger
 
 class SearchAgent(BaseAgent):
     """
@@ -31,7 +31,7 @@ class SearchAgent(BaseAgent):
                 SearchAction(session_idx=session_idx, env=webshop_env),
             ],
             reasoning_type=reasoning_type,
-            logger=AgentLogger(PROMPT_DEBUG_FLAG=PROMPT_DEBUG_FLAG)
+            logger=BufferedAgentLogger(PROMPT_DEBUG_FLAG=PROMPT_DEBUG_FLAG)
         )
         self.max_exec_steps = 2
         self.__build_examples__()
@@ -126,7 +126,7 @@ class ClickAgent(BaseAgent):
                 ClickAction(session_idx=session_idx, env=webshop_env),
             ],
             reasoning_type=reasoning_type,
-            logger=AgentLogger(PROMPT_DEBUG_FLAG=PROMPT_DEBUG_FLAG)
+            logger=BufferedAgentLogger(PROMPT_DEBUG_FLAG=PROMPT_DEBUG_FLAG)
         )
         self.__build_examples__()
     
@@ -278,7 +278,7 @@ class bolaa_webagent_model:
             role="You are control search_agent and click_agent. Assign the task to a correct agent.",
             llm=llm,
             TeamAgents=[self.search_agent, self.click_agent],
-            logger=AgentLogger(PROMPT_DEBUG_FLAG=PROMPT_DEBUG_FLAG)
+            logger=BufferedAgentLogger(PROMPT_DEBUG_FLAG=PROMPT_DEBUG_FLAG)
         )
     
     def _reset(self, session_idx):
@@ -0,0 +1,42 @@
+import unittest
+
+from agentlite.agents.agent_utils import parse_action, parse_actions, repair_json
+
+
+class TestActionParser(unittest.TestCase):
+    def test_valid_action(self):
+        self.assertEqual(
+            parse_action('Search[{"query": "agents"}].'), ("Search", {"query": "agents"}, True)
+        )
+
+    def test_json_repair(self):
+        cases = {
+            "Search[{'query': 'it\\'s', 'page': 2,}]": {"query": "it's", "page": 2},
+            'Search[{query: "agents", exact: True, limit: None}]': {
+                "query": "agents",
+                "exact": True,
+                "limit": None,
+            },
+            "Search[{'query': 'say \"hi\"', 'tags': ['a', 'b',],}]": {
+                "query": 'say "hi"',
+                "tags": ["a", "b"],
+            },
+        }
+        for raw_action, params in cases.items():
+            self.assertEqual(parse_action(raw_action), ("Search", params, True), raw_action)
+        self.assertEqual(repair_json('{"a": [1, 2]}'), '{"a": [1, 2]}')
+
+    def test_first_valid_line(self):
+        raw_action = 'I should look it up first.\nAction: Search[{"query": "a]b"}]\nFinish[{}]'
+        self.assertEqual(parse_action(raw_action), ("Search", {"query": "a]b"}, True))
+
+    def test_invalid_action(self):
+        self.assertEqual(parse_action("Finish[done]\nmore"), ("Finish[done]", {}, False))
+
+    def test_multi_calls(self):
+        raw_action = "Let me ask both.\na[{'Task': 'x; y'}]; b[{\"Task\": \"[z]\"}]"
+        self.assertEqual(
+            parse_actions(raw_action),
+            [("a", {"Task": "x; y"}, True), ("b", {"Task": "[z]"}, True)],
+        )
+        self.assertEqual(parse_actions('a[{"Task": "x"}]; b[{"Task": }]')[0][2], False)
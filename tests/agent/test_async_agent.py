@@ -0,0 +1,61 @@
+import asyncio
+import json
+import time
+import unittest
+
+from agentlite.agents import BaseAgent
+from agentlite.commons import TaskPackage
+from agentlite.llm.agent_llms import BaseLLM
+from agentlite.llm.LLMConfig import LLMConfig
+from agentlite.logging.base import BaseAgentLogger
+
+
+class EchoLLM(BaseLLM):
+    """finish every task by echoing its instruction after a fixed latency"""
+
+    def __init__(self, latency: float = 0.0):
+        super().__init__(LLMConfig({}))
+        self.latency = latency
+
+    def __answer__(self, prompt: str) -> str:
+        instruction = prompt.split("Task:")[-1].split("\n")[0]
+        return f"Finish[{json.dumps({'response': instruction})}]"
+
+    def run(self, prompt: str):
+        time.sleep(self.latency)
+        return self.__answer__(prompt)
+
+    async def arun(self, prompt: str):
+        await asyncio.sleep(self.latency)
+        return self.__answer__(prompt)
+
+
+class TestAsyncAgent(unittest.TestCase):
+    def test_acall_matches_call(self):
+        agent = BaseAgent(
+            name="echo", role="echo", llm=EchoLLM(), actions=[], logger=BaseAgentLogger()
+        )
+        sync_res = agent(TaskPackage(instruction="hello", task_id="sync"))
+        async_res = asyncio.run(
+            agent.acall(TaskPackage(instruction="hello", task_id="async"))
+        )
+        self.assertEqual(sync_res, "hello")
+        self.assertEqual(async_res, sync_res)
+
+    def test_concurrent_tasks(self):
+        agent = BaseAgent(
+            name="echo",
+            role="echo",
+            llm=EchoLLM(latency=0.2),
+            actions=[],
+            logger=BaseAgentLogger(),
+        )
+        tasks = [TaskPackage(instruction=f"q{i}", task_id=f"t{i}") for i in range(10)]
+
+        async def serve():
+            return await asyncio.gather(*[agent.acall(task) for task in tasks])
+
+        start = time.perf_counter()
+        responses = asyncio.run(serve())
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertEqual(responses, [f"q{i}" for i in range(10)])
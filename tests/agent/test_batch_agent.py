@@ -0,0 +1,58 @@
+import json
+import unittest
+
+from agentlite.agents import BaseAgent
+from agentlite.commons import TaskPackage
+from agentlite.llm.agent_llms import BaseLLM
+from agentlite.llm.LLMConfig import LLMConfig
+from agentlite.logging.base import BaseAgentLogger
+
+
+class BatchRecordLLM(BaseLLM):
+    """think once, then finish with the instruction. Records the batch sizes."""
+
+    def __init__(self):
+        super().__init__(LLMConfig({}))
+        self.batch_sizes = []
+
+    def run(self, prompt: str):
+        if "Observation:" not in prompt.split("[Execution]")[-1]:
+            return 'Think[{"response": "let me think"}]'
+        instruction = prompt.split("Task:")[-1].split("\n")[0]
+        return f"Finish[{json.dumps({'response': instruction})}]"
+
+    def run_batch(self, prompts):
+        self.batch_sizes.append(len(prompts))
+        return super().run_batch(prompts)
+
+
+class TestRunBatch(unittest.TestCase):
+    def test_lockstep_batches(self):
+        llm = BatchRecordLLM()
+        agent = BaseAgent(name="batch", role="batch", llm=llm, actions=[], logger=BaseAgentLogger())
+        tasks = [TaskPackage(instruction=f"q{i}", task_id=f"t{i}") for i in range(5)]
+        responses = agent.run_batch(tasks, max_concurrency=2)
+        self.assertEqual(responses, [f"q{i}" for i in range(5)])
+        # two steps per task, at most two tasks per llm call
+        self.assertEqual(sum(llm.batch_sizes), 10)
+        self.assertLessEqual(max(llm.batch_sizes), 2)
+        self.assertEqual(len(agent.short_term_memory.get_action_chain(tasks[3])), 2)
+
+    def test_on_finish(self):
+        agent = BaseAgent(
+            name="batch", role="batch", llm=BatchRecordLLM(), actions=[], logger=BaseAgentLogger()
+        )
+        tasks = [TaskPackage(instruction=f"q{i}", task_id=f"t{i}") for i in range(3)]
+        finished = []
+        agent.run_batch(
+            tasks, max_concurrency=2, on_finish=lambda task, response: finished.append(response)
+        )
+        self.assertEqual(sorted(finished), ["q0", "q1", "q2"])
+
+    def test_duplicate_task_ids(self):
+        agent = BaseAgent(
+            name="batch", role="batch", llm=BatchRecordLLM(), actions=[], logger=BaseAgentLogger()
+        )
+        tasks = [TaskPackage(instruction="q", task_id="same") for _ in range(2)]
+        with self.assertRaises(ValueError):
+            agent.run_batch(tasks)
@@ -0,0 +1,73 @@
+import unittest
+
+from agentlite.actions import BaseAction
+from agentlite.agents import BaseAgent, ManagerAgent
+from agentlite.agents.agent_utils import (
+    ACION_NOT_FOUND_MESS,
+    CloseMatcher,
+    NormalizedMatcher,
+)
+from agentlite.commons import AgentAct, TaskPackage
+from agentlite.llm.agent_llms import BaseLLM
+from agentlite.llm.LLMConfig import LLMConfig
+from agentlite.logging.base import BaseAgentLogger
+
+
+class EchoAction(BaseAction):
+    def __init__(self, name: str):
+        super().__init__(
+            action_name=name,
+            action_desc="echo the name of the action",
+            params_doc={"query": "anything"},
+        )
+
+    def __call__(self, query: str):
+        return self.action_name
+
+
+def build_agent(**kwargs) -> BaseAgent:
+    return BaseAgent(
+        name="tools",
+        role="tools",
+        llm=BaseLLM(LLMConfig({})),
+        actions=[EchoAction(f"tool_{idx}") for idx in range(20)],
+        logger=BaseAgentLogger(),
+        **kwargs,
+    )
+
+
+class TestDispatch(unittest.TestCase):
+    def setUp(self):
+        self.task = TaskPackage(instruction="use a tool", task_id="tool")
+
+    def call(self, agent: BaseAgent, name: str) -> str:
+        return agent.forward(self.task, AgentAct(name=name, params={"query": ""}))
+
+    def test_exact_dispatch(self):
+        agent = build_agent()
+        self.assertEqual(self.call(agent, "tool_7"), "tool_7")
+        self.assertEqual(self.call(agent, "Tool 7"), ACION_NOT_FOUND_MESS)
+        agent.add_action(EchoAction("late_tool"))
+        self.assertEqual(self.call(agent, "late_tool"), "late_tool")
+        agent.actions.append(EchoAction("appended_tool"))
+        self.assertTrue(agent.__check_action__("appended_tool"))
+
+    def test_fuzzy_dispatch(self):
+        agent = build_agent(fuzzy_matcher=NormalizedMatcher())
+        self.assertEqual(self.call(agent, "Tool 7"), "tool_7")
+        agent = build_agent(fuzzy_matcher=CloseMatcher())
+        self.assertEqual(self.call(agent, "tool_07"), "tool_7")
+        self.assertEqual(self.call(agent, "search"), ACION_NOT_FOUND_MESS)
+
+    def test_member_index_follows_add_member(self):
+        manager = ManagerAgent(
+            llm=BaseLLM(LLMConfig({})), TeamAgents=[], logger=BaseAgentLogger()
+        )
+        member = build_agent()
+        self.assertIsNone(manager.__find_member__("tools"))
+        manager.add_member(member)
+        self.assertIs(manager.__find_member__("tools"), member)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import asyncio
+import json
+import time
+import unittest
+
+from agentlite.agents import BaseAgent, ManagerAgent
+from agentlite.commons import TaskPackage
+from agentlite.llm.agent_llms import BaseLLM
+from agentlite.llm.LLMConfig import LLMConfig
+from agentlite.logging.base import BaseAgentLogger
+
+
+class SleepyLLM(BaseLLM):
+    """labor agent llm: finish with the agent name after a fixed latency"""
+
+    def __init__(self, answer: str, latency: float):
+        super().__init__(LLMConfig({}))
+        self.answer = answer
+        self.latency = latency
+
+    def run(self, prompt: str):
+        time.sleep(self.latency)
+        return f"Finish[{json.dumps({'response': self.answer})}]"
+
+
+class ScriptedLLM(BaseLLM):
+    """return the scripted outputs one by one"""
+
+    def __init__(self, outputs: list):
+        super().__init__(LLMConfig({}))
+        self.outputs = list(outputs)
+
+    def run(self, prompt: str):
+        return self.outputs.pop(0)
+
+
+def build_manager(latency: float = 0.3) -> ManagerAgent:
+    team = [
+        BaseAgent(
+            name=name,
+            role=f"{name} role",
+            llm=SleepyLLM(f"{name} says hi", latency),
+            actions=[],
+            logger=BaseAgentLogger(),
+        )
+        for name in ["a", "b", "c"]
+    ]
+    calls = "; ".join(f'{name}[{{"Task": "greet"}}]' for name in ["a", "b", "c"])
+    return ManagerAgent(
+        llm=ScriptedLLM([calls, 'Finish[{"response": "done"}]']),
+        TeamAgents=team,
+        logger=BaseAgentLogger(),
+        multi_call=True,
+    )
+
+
+class TestManagerMultiCall(unittest.TestCase):
+    def test_parallel_fan_out(self):
+        manager = build_manager()
+        task = TaskPackage(instruction="greet everyone", task_id="fan_out")
+        start = time.perf_counter()
+        self.assertEqual(manager(task), "done")
+        self.assertLess(time.perf_counter() - start, 0.8)
+        chain = manager.short_term_memory.get_action_chain(task)
+        self.assertEqual([act.name for act, _ in chain], ["a", "b", "c", "Finish"])
+        self.assertEqual(
+            [obs for _, obs in chain[:3]], ["a says hi", "b says hi", "c says hi"]
+        )
+
+    def test_async_fan_out(self):
+        manager = build_manager(latency=0.0)
+        task = TaskPackage(instruction="greet everyone", task_id="async_fan_out")
+        self.assertEqual(asyncio.run(manager.acall(task)), "done")
+        chain = manager.short_term_memory.get_action_chain(task)
+        self.assertEqual(chain[1][1], "b says hi")
+
+    def test_multi_call_prompt(self):
+        manager = build_manager()
+        prompt = manager.__action_prompt__(TaskPackage(instruction="x"), [])
+        self.assertIn("separating the calls with ';'", prompt)
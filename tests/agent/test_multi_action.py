@@ -0,0 +1,89 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from agentlite.actions import BaseAction
+from agentlite.agents import BaseAgent
+from agentlite.commons import TaskPackage
+from agentlite.llm.MockLLM import MockLLM
+from agentlite.logging.base import BaseAgentLogger
+
+
+class SlowSearch(BaseAction):
+    parallel_safe = True
+
+    def __init__(self, latency: float = 0.3) -> None:
+        super().__init__("Search", "search a query", {"query": "the query"})
+        self.latency = latency
+
+    def __call__(self, query):
+        time.sleep(self.latency)
+        return f"about {query}"
+
+
+class Counter(BaseAction):
+    """not parallel safe, records the threads it runs in"""
+
+    def __init__(self) -> None:
+        super().__init__("Count", "count the calls", {"step": "the step"})
+        self.threads = []
+
+    def __call__(self, step):
+        self.threads.append(threading.get_ident())
+        return f"count {len(self.threads)}"
+
+
+CALLS = 'Search[{"query": "Urysohn"}]; Count[{"step": 1}]; Search[{"query": "Levin"}]'
+
+
+def build_agent(multi_call: bool = True) -> BaseAgent:
+    return BaseAgent(
+        name="searcher",
+        role="search",
+        llm=MockLLM([CALLS, 'Finish[{"response": "done"}]']),
+        actions=[SlowSearch(), Counter()],
+        logger=BaseAgentLogger(),
+        multi_call=multi_call,
+    )
+
+
+class TestMultiAction(unittest.TestCase):
+    def check_chain(self, agent: BaseAgent, task: TaskPackage):
+        chain = agent.short_term_memory.get_action_chain(task)
+        self.assertEqual(
+            [(act.name, obs) for act, obs in chain],
+            [
+                ("Search", "about Urysohn"),
+                ("Count", "count 1"),
+                ("Search", "about Levin"),
+                ("Finish", "done"),
+            ],
+        )
+
+    def test_parallel_step(self):
+        agent = build_agent()
+        task = TaskPackage(instruction="compare", task_id="multi")
+        start = time.perf_counter()
+        self.assertEqual(agent(task), "done")
+        self.assertLess(time.perf_counter() - start, 0.55)
+        self.check_chain(agent, task)
+        counter = agent.__find_action__("Count")
+        self.assertEqual(counter.threads, [threading.get_ident()])
+
+    def test_async_parallel_step(self):
+        agent = build_agent()
+        task = TaskPackage(instruction="compare", task_id="amulti")
+        start = time.perf_counter()
+        self.assertEqual(asyncio.run(agent.acall(task)), "done")
+        self.assertLess(time.perf_counter() - start, 0.55)
+        self.check_chain(agent, task)
+
+    def test_prompt_and_single_call(self):
+        agent = build_agent()
+        prompt = agent.__action_prompt__(TaskPackage(instruction="x"), [])
+        self.assertIn("several independent actions", prompt)
+        single = build_agent(multi_call=False)
+        self.assertEqual(len(single.__acts_parser__(CALLS)), 1)
+        prompt = single.__action_prompt__(TaskPackage(instruction="x"), [])
+        self.assertNotIn("several independent actions", prompt)
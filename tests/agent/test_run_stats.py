@@ -0,0 +1,118 @@
+import json
+import time
+import unittest
+
+from agentlite.actions import BaseAction
+from agentlite.agents import BaseAgent, ManagerAgent
+from agentlite.commons import RunStats, TaskPackage
+from agentlite.llm.agent_llms import BaseLLM
+from agentlite.llm.LLMConfig import LLMConfig
+from agentlite.logging.base import BaseAgentLogger
+
+
+class ScriptedLLM(BaseLLM):
+    """return the scripted outputs one by one"""
+
+    def __init__(self, outputs: list):
+        super().__init__(LLMConfig({}))
+        self.outputs = list(outputs)
+
+    def run(self, prompt: str):
+        return self.outputs.pop(0)
+
+
+class SlowSearch(BaseAction):
+    def __init__(self) -> None:
+        super().__init__(
+            action_name="Search",
+            action_desc="search the web",
+            params_doc={"query": "the search query"},
+        )
+
+    def __call__(self, query: str):
+        time.sleep(0.05)
+        return f"results of {query}"
+
+
+def finish(response: str) -> str:
+    return f"Finish[{json.dumps({'response': response})}]"
+
+
+class TestRunStats(unittest.TestCase):
+    def test_agent_run_stats(self):
+        agent = BaseAgent(
+            name="searcher",
+            role="search the web",
+            llm=ScriptedLLM(['Search[{"query": "agents"}]', finish("done")]),
+            actions=[SlowSearch()],
+            logger=BaseAgentLogger(),
+        )
+        finished = []
+        agent.add_stats_hook(finished.append)
+        task = TaskPackage(instruction="find agents", task_id="stats")
+        agent(task)
+        stats = agent.get_run_stats(task)
+        self.assertEqual(finished, [stats])
+        self.assertEqual(stats.steps, 2)
+        self.assertEqual(stats.llm_calls, 2)
+        self.assertGreater(stats.prompt_tokens, 0)
+        self.assertEqual(stats.action_calls["Search"], 1)
+        self.assertGreaterEqual(stats.action_time["Search"], 0.05)
+        self.assertGreaterEqual(stats.phase_time["action"], stats.action_time["Search"])
+        self.assertLessEqual(sum(stats.phase_time.values()), stats.wall_time)
+        self.assertEqual(agent.stats.tasks, 1)
+        self.assertEqual(agent.stats.llm_calls, 2)
+
+    def test_member_time(self):
+        labor = BaseAgent(
+            name="searcher",
+            role="search the web",
+            llm=ScriptedLLM(['Search[{"query": "agents"}]', finish("found")]),
+            actions=[SlowSearch()],
+            logger=BaseAgentLogger(),
+        )
+        manager = ManagerAgent(
+            llm=ScriptedLLM(['searcher[{"Task": "find agents"}]', finish("done")]),
+            TeamAgents=[labor],
+            logger=BaseAgentLogger(),
+        )
+        task = TaskPackage(instruction="find agents", task_id="manager_stats")
+        manager(task)
+        stats = manager.get_run_stats(task)
+        self.assertEqual(stats.action_calls["searcher"], 1)
+        self.assertGreaterEqual(stats.action_time["searcher"], 0.05)
+        self.assertEqual(labor.stats.tasks, 1)
+
+    def test_merge(self):
+        total = RunStats(agent_name="agent")
+        for task_id in ["a", "b"]:
+            stats = RunStats(task_id=task_id)
+            stats.steps = 3
+            stats.add_llm_call(10, 5, 3, 2)
+            stats.add_action("Search", 0.5)
+            stats.finish()
+            total.merge(stats)
+        record = total.as_dict()
+        self.assertEqual(record["tasks"], 2)
+        self.assertEqual(record["steps"], 6)
+        self.assertEqual(record["prompt_tokens"], 6)
+        self.assertEqual(record["action.Search.calls"], 2)
+        self.assertAlmostEqual(record["action.Search.time"], 1.0)
+
+
+class TestRunStatsEviction(unittest.TestCase):
+    def test_batch_larger_than_cap(self):
+        agent = BaseAgent(
+            name="batcher",
+            role="answer",
+            llm=ScriptedLLM([finish(str(idx)) for idx in range(10)]),
+            actions=[],
+            logger=BaseAgentLogger(),
+        )
+        agent.MAX_RUN_STATS = 4
+        tasks = [TaskPackage(instruction=f"task {idx}", task_id=str(idx)) for idx in range(10)]
+        self.assertEqual(agent.run_batch(tasks), [str(idx) for idx in range(10)])
+        self.assertEqual(agent.stats.tasks, 10)
+        self.assertEqual(len(agent.run_stats), 4)
+        self.assertIsNone(agent.get_run_stats(tasks[0]))
+        self.assertEqual(agent.get_run_stats(tasks[-1]).llm_calls, 1)
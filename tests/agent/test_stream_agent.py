@@ -0,0 +1,88 @@
+import asyncio
+import json
+import unittest
+
+from agentlite.agents import BaseAgent
+from agentlite.agents.action_parser import parse_action
+from agentlite.agents.agent_utils import stream_until_action
+from agentlite.commons import TaskPackage
+from agentlite.llm.agent_llms import BaseLLM
+from agentlite.llm.LLMConfig import LLMConfig
+from agentlite.logging.base import BaseAgentLogger
+
+
+class RamblingLLM(BaseLLM):
+    """stream a finish action token by token, followed by a long ramble"""
+
+    def __init__(self):
+        super().__init__(LLMConfig({}))
+        self.consumed = 0
+
+    def __tokens__(self, prompt: str):
+        instruction = prompt.split("Task:")[-1].split("\n")[0]
+        action = f"Finish[{json.dumps({'response': instruction})}]"
+        return [action[:5], action[5:]] + [" and more"] * 50
+
+    def run(self, prompt: str):
+        return "".join(self.__tokens__(prompt))
+
+    def stream(self, prompt: str):
+        for token in self.__tokens__(prompt):
+            self.consumed += 1
+            yield token
+
+    async def astream(self, prompt: str):
+        for token in self.__tokens__(prompt):
+            self.consumed += 1
+            yield token
+
+
+class ThinkingLLM(RamblingLLM):
+    """stream a thought line before the finish action"""
+
+    def __tokens__(self, prompt: str):
+        return ["I should ", "finish\n"] + super().__tokens__(prompt)
+
+
+class TestStreamAgent(unittest.TestCase):
+    def make_agent(self, llm):
+        return BaseAgent(
+            name="stream",
+            role="stream",
+            llm=llm,
+            actions=[],
+            logger=BaseAgentLogger(),
+            stream_action=True,
+        )
+
+    def test_stream_stops_at_action(self):
+        llm = RamblingLLM()
+        response = self.make_agent(llm)(TaskPackage(instruction="hello", task_id="sync"))
+        self.assertEqual(response, "hello")
+        self.assertEqual(llm.consumed, 2)
+
+    def test_astream_stops_at_action(self):
+        llm = RamblingLLM()
+        agent = self.make_agent(llm)
+        response = asyncio.run(agent.acall(TaskPackage(instruction="hello", task_id="async")))
+        self.assertEqual(response, "hello")
+        self.assertEqual(llm.consumed, 2)
+
+    def test_stream_reads_past_first_line(self):
+        llm = ThinkingLLM()
+        response = self.make_agent(llm)(TaskPackage(instruction="hello", task_id="multi"))
+        self.assertEqual(response, "hello")
+        self.assertEqual(llm.consumed, 4)
+
+    def test_stream_until_action_multi_line(self):
+        def complete(text):
+            return parse_action(text)[2]
+
+        chunks = iter(["I should search\n", 'Search[{"query": ', '"foo"}]', "\nmore", " ramble"])
+        text = stream_until_action(chunks, complete)
+        self.assertEqual(text, 'I should search\nSearch[{"query": "foo"}]')
+        self.assertEqual(parse_action(text)[:2], ("Search", {"query": "foo"}))
+
+
+if __name__ == "__main__":
+    unittest.main()
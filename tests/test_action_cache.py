@@ -0,0 +1,95 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+
+from agentlite.actions import BaseAction, cacheable_action, cached_call
+
+
+def build_lookup(**cache_kwargs):
+    @cacheable_action(**cache_kwargs)
+    class Lookup(BaseAction):
+        def __init__(self) -> None:
+            super().__init__("Lookup", "look a key up", {"key": "the key", "lang": "the language"})
+            self.calls = 0
+
+        def __call__(self, key, lang="en"):
+            self.calls += 1
+            return f"{key}:{lang}"
+
+    return Lookup
+
+
+class TestActionCache(unittest.TestCase):
+    def test_hits_ignore_param_order(self):
+        lookup = build_lookup()()
+        self.assertEqual(lookup(key="a", lang="fr"), "a:fr")
+        self.assertEqual(lookup(lang="fr", key="a"), "a:fr")
+        self.assertEqual(lookup(key="b", lang="fr"), "b:fr")
+        self.assertEqual(lookup.calls, 2)
+        self.assertEqual(lookup.cache_stats.as_dict()["hits"], 1)
+        self.assertEqual(list(lookup.__get_kwargs__().parameters), ["key", "lang"])
+
+    def test_async_shares_entries(self):
+        lookup = build_lookup()()
+        lookup(key="a")
+        self.assertEqual(asyncio.run(lookup.__acall__(key="a")), "a:en")
+        self.assertEqual(lookup.calls, 1)
+
+    def test_lru_and_ttl(self):
+        lookup = build_lookup(max_size=1, ttl=0.05)()
+        lookup(key="a")
+        lookup(key="b")  # evicts a
+        lookup(key="a")
+        self.assertEqual(lookup.calls, 3)
+        time.sleep(0.1)
+        lookup(key="a")
+        self.assertEqual(lookup.calls, 4)
+
+    def test_persistent_cache(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "actions.db")
+            first = build_lookup(cache_path=path)()
+            first(key="a")
+            second = build_lookup(cache_path=path)()  # e.g. a new benchmark run
+            self.assertEqual(second(key="a"), "a:en")
+            self.assertEqual(second.calls, 0)
+            first.cache_store.close()
+            second.cache_store.close()
+
+    def test_cached_call_skips_failures(self):
+        calls = []
+
+        class Toolkit:
+            @cached_call(method=True, cache_if=lambda result: result[0])
+            def get(self, name=None):
+                calls.append(name)
+                return name != "bad", name
+
+        self.assertEqual(Toolkit().get(name="x"), (True, "x"))
+        Toolkit().get(name="x")
+        Toolkit().get(name="bad")
+        Toolkit().get(name="bad")
+        self.assertEqual(calls, ["x", "bad", "bad"])
+
+    def test_hits_return_copies(self):
+        class Toolkit:
+            @cached_call(method=True)
+            def get(self, name=None):
+                return {"name": name, "tags": ["a"]}
+
+        @cacheable_action()
+        class Profile(BaseAction):
+            def __init__(self) -> None:
+                super().__init__("Profile", "get a profile", {"name": "the name"})
+
+            def __call__(self, name):
+                return {"name": name, "tags": ["a"]}
+
+        for get in [Toolkit().get, Profile()]:
+            first = get(name="x")
+            first["tags"].append("mutated on miss")
+            second = get(name="x")
+            second["tags"].append("mutated on hit")
+            self.assertEqual(get(name="x"), {"name": "x", "tags": ["a"]})
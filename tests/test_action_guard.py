@@ -0,0 +1,133 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from agentlite.actions import BaseAction
+from agentlite.agents import BaseAgent
+from agentlite.commons import AgentAct, CircuitBreaker, TaskPackage
+from agentlite.llm.MockLLM import MockLLM
+from agentlite.logging.base import BaseAgentLogger
+
+
+class HangingAction(BaseAction):
+    timeout = 0.05
+    max_retries = 1
+
+    def __init__(self, hang_calls: int = 100) -> None:
+        super().__init__("Lookup", "look a key up", {"key": "the key"})
+        self.hang_calls = hang_calls
+        self.calls = 0
+        self.release = threading.Event()
+
+    def __call__(self, key):
+        self.calls += 1
+        if self.calls <= self.hang_calls:
+            self.release.wait(1.0)
+        return f"value of {key}"
+
+
+class FailingAction(BaseAction):
+    failure_threshold = 2
+    reset_timeout = 0.1
+
+    def __init__(self) -> None:
+        super().__init__("Flaky", "a failing tool", {"key": "the key"})
+        self.calls = 0
+        self.fail = True
+
+    def __call__(self, key):
+        self.calls += 1
+        if self.fail:
+            raise ConnectionError("tool down")
+        return "ok"
+
+
+def build_agent(action: BaseAction) -> BaseAgent:
+    return BaseAgent(
+        name="guarded",
+        role="look up",
+        llm=MockLLM(['Finish[{"response": "done"}]']),
+        actions=[action],
+        logger=BaseAgentLogger(),
+    )
+
+
+class TestActionGuard(unittest.TestCase):
+    def test_timeout_observation(self):
+        action = HangingAction()
+        agent = build_agent(action)
+        task = TaskPackage(instruction="look up")
+        start = time.perf_counter()
+        observation = agent.forward(task, AgentAct(name="Lookup", params={"key": "a"}))
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertTrue(observation.startswith("ActionTimeout: Lookup"))
+        self.assertIn("2 attempt(s)", observation)
+        action.release.set()
+
+    def test_retry_after_timeout(self):
+        action = HangingAction(hang_calls=1)
+        agent = build_agent(action)
+        act = AgentAct(name="Lookup", params={"key": "a"})
+        observation = agent.forward(TaskPackage(instruction="x"), act)
+        self.assertEqual(observation, "value of a")
+        action.release.set()
+
+    def test_async_timeout(self):
+        action = HangingAction()
+        agent = build_agent(action)
+        act = AgentAct(name="Lookup", params={"key": "a"})
+        observation = asyncio.run(agent.aforward(TaskPackage(instruction="x"), act))
+        self.assertTrue(observation.startswith("ActionTimeout"))
+        action.release.set()
+
+    def test_circuit_breaker(self):
+        action = FailingAction()
+        agent = build_agent(action)
+        task = TaskPackage(instruction="x")
+        act = AgentAct(name="Flaky", params={"key": "a"})
+        for _ in range(2):
+            observation = agent.forward(task, act)
+            self.assertTrue(observation.startswith("ActionError: Flaky failed with ConnectionError"))
+        observation = agent.forward(task, act)
+        self.assertTrue(observation.startswith("ActionUnavailable: Flaky"))
+        self.assertEqual(action.calls, 2)
+        time.sleep(0.15)
+        action.fail = False
+        self.assertEqual(agent.forward(task, act), "ok")
+        self.assertEqual(action.circuit_breaker.state, "closed")
+
+    def test_deterministic_errors_are_not_retried(self):
+        class StrictAction(FailingAction):
+            max_retries = 2
+
+            def __call__(self, key):
+                self.calls += 1
+                if key == "slow":
+                    raise TimeoutError("the tool's own deadline")
+                raise ValueError(f"unknown key {key}")
+
+        action = StrictAction()
+        agent = build_agent(action)
+        task = TaskPackage(instruction="x")
+        for _ in range(3):
+            observation = agent.forward(task, AgentAct(name="Flaky", params={"key": "a"}))
+            self.assertTrue(observation.startswith("ActionError: Flaky failed with ValueError"))
+        observation = agent.forward(task, AgentAct(name="Flaky", params={"key": "slow"}))
+        self.assertTrue(observation.startswith("ActionError: Flaky failed with TimeoutError"))
+        observation = asyncio.run(
+            agent.aforward(task, AgentAct(name="Flaky", params={"key": "a"}))
+        )
+        self.assertTrue(observation.startswith("ActionError"))
+        self.assertEqual(action.calls, 5)
+        self.assertEqual(action.circuit_breaker.state, "closed")
+
+    def test_half_open_failure_reopens(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        breaker.record_failure()
+        self.assertFalse(breaker.allow())
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())  # a single trial call
+        breaker.record_failure()
+        self.assertEqual(breaker.state, "open")
@@ -0,0 +1,36 @@
+import unittest
+
+from agentlite.agent_prompts.prompt_utils import act_obs_format
+from agentlite.commons import AgentAct, AgentActLite
+from agentlite.commons.AgentAct import to_act_lite, to_agent_act
+
+
+class TestAgentActLite(unittest.TestCase):
+    def test_same_format_as_agent_act(self):
+        params = {"query": "agents", "page": 2}
+        act = AgentAct(name="Search", params=params)
+        lite = AgentActLite(name="Search", params=params)
+        self.assertEqual(act_obs_format(lite, "obs"), act_obs_format(act, "obs"))
+        self.assertEqual(lite, act)
+        self.assertIs(lite.params_str, lite.params_str)
+
+    def test_format_without_params_str(self):
+        class PlainAct:
+            def __init__(self, name, params):
+                self.name = name
+                self.params = params
+
+        plain = PlainAct("Search", {"query": "agents"})
+        act = AgentAct(name="Search", params={"query": "agents"})
+        self.assertEqual(act_obs_format(plain, "obs"), act_obs_format(act, "obs"))
+
+    def test_conversion(self):
+        lite = AgentActLite(name="Finish", params={"response": "done"})
+        act = to_agent_act(lite)
+        self.assertIsInstance(act, AgentAct)
+        self.assertEqual(act.params, {"response": "done"})
+        self.assertIs(to_agent_act(act), act)
+        self.assertEqual(to_act_lite(act), lite)
+        self.assertIs(to_act_lite(lite), lite)
+        with self.assertRaises(AttributeError):
+            lite.other = 1
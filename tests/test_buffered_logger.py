@@ -0,0 +1,89 @@
+import os
+import tempfile
+import unittest
+
+from agentlite.commons import TaskPackage
+from agentlite.logging import BufferedAgentLogger
+from agentlite.logging.buffered_logger import BackgroundLogWriter, get_log_writer
+
+
+class FullDisk:
+    def write(self, text):
+        raise OSError(28, "No space left on device")
+
+    def close(self):
+        pass
+
+
+class TestBufferedLogger(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.log_file = os.path.join(self.tmp_dir.name, "agent.log")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_lines_written_without_color(self):
+        logger = BufferedAgentLogger(log_file_name=self.log_file, FLAG_PRINT=False)
+        logger.receive_task(TaskPackage(instruction="hello", task_id="t1"), "echo")
+        logger.get_obs("world")
+        logger.flush()
+        with open(self.log_file) as f:
+            log = f.read()
+        self.assertIn("Agent echo receives", log)
+        self.assertIn("Observation: world\n", log)
+        self.assertNotIn("\x1b", log)
+        logger.writer.close()
+
+    def test_rotation(self):
+        writer = BackgroundLogWriter(self.log_file, max_bytes=100, backup_count=2)
+        for idx in range(50):
+            writer.write(f"line {idx:02d} " + "x" * 20)
+            writer.flush()
+        writer.close()
+        self.assertTrue(os.path.exists(self.log_file + ".1"))
+        self.assertTrue(os.path.exists(self.log_file + ".2"))
+        self.assertFalse(os.path.exists(self.log_file + ".3"))
+        with open(self.log_file) as f:
+            self.assertIn("line 49", f.read())
+
+    def test_full_queue_drops(self):
+        writer = BackgroundLogWriter(self.log_file, max_queue=1, policy="drop")
+        for idx in range(1000):
+            writer.write(f"line {idx}")
+        writer.close()
+        with open(self.log_file) as f:
+            written = len(f.readlines())
+        self.assertEqual(written + writer.dropped, 1000)
+
+    def test_writer_errors_are_raised(self):
+        writer = BackgroundLogWriter(self.log_file, flush_interval=0.01)
+        writer.file.close()
+        writer.file = FullDisk()
+        writer.write("lost line")
+        with self.assertRaises(OSError):
+            writer.flush(timeout=1.0)
+        writer.write("dropped line")
+        self.assertEqual(writer.dropped, 1)
+        with self.assertRaises(OSError):
+            writer.close()
+
+    def test_flush_timeout(self):
+        writer = BackgroundLogWriter(self.log_file, flush_interval=0.01)
+        writer.queue.unfinished_tasks += 1  # a line the thread never acknowledges
+        with self.assertRaises(TimeoutError):
+            writer.flush(timeout=0.05)
+        writer.queue.unfinished_tasks -= 1
+        writer.close()
+
+    def test_shared_writer_rejects_other_kwargs(self):
+        writer = get_log_writer(self.log_file, policy="block")
+        self.assertIs(get_log_writer(self.log_file), writer)
+        self.assertIs(get_log_writer(self.log_file, policy="block"), writer)
+        with self.assertRaises(ValueError):
+            get_log_writer(self.log_file, policy="drop")
+        writer.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
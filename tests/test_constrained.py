@@ -0,0 +1,127 @@
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from agentlite.actions import BaseAction
+from agentlite.agents import BaseAgent, ManagerAgent
+from agentlite.agents.agent_utils import ActionConstraint, parse_action, parse_actions
+from agentlite.commons import TaskPackage
+from agentlite.llm.agent_llms import LangchainLLM
+from agentlite.llm.LLMConfig import LLMConfig
+from agentlite.llm.MockLLM import MockLLM
+from agentlite.logging.base import BaseAgentLogger
+
+
+class Search(BaseAction):
+    def __init__(self) -> None:
+        super().__init__(
+            action_name="Search",
+            action_desc="search the web",
+            params_doc={"query": "the query", "page": "the result page"},
+        )
+
+    def __call__(self, query: str, page: int):
+        return f"results of {query}"
+
+
+class CompletionHandler(BaseHTTPRequestHandler):
+    """an OpenAI compatible completion server recording the request bodies"""
+
+    bodies = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        CompletionHandler.bodies.append(body)
+        response = json.dumps(
+            {
+                "id": "cmpl",
+                "object": "text_completion",
+                "created": 0,
+                "model": body["model"],
+                "choices": [
+                    {
+                        "text": 'Finish[{"response": "done"}]',
+                        "index": 0,
+                        "finish_reason": "stop",
+                        "logprobs": None,
+                    }
+                ],
+                "usage": {"prompt_tokens": 1, "completion_tokens": 5, "total_tokens": 6},
+            }
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestActionConstraint(unittest.TestCase):
+    def test_regex(self):
+        constraint = ActionConstraint({"Search": ["query", "page"], "Finish": ["response"]})
+        self.assertTrue(constraint.matches('Search[{"query": "say \\"hi\\"", "page": 2}]'))
+        self.assertTrue(constraint.matches('Finish[{"response": "done"}]'))
+        self.assertFalse(constraint.matches('Search[{"query": "agents"}]'))
+        self.assertFalse(constraint.matches('Lookup[{"query": "agents"}]'))
+        self.assertTrue(parse_action(constraint.example())[2])
+        self.assertEqual(constraint.example(), 'Search[{"query": "", "page": ""}]')
+        reordered = ActionConstraint(
+            {"Finish": ["response"], "Think": ["response"], "Search": ["query"]}
+        )
+        self.assertEqual(reordered.example(), 'Search[{"query": ""}]')
+        multi = ActionConstraint({"a": ["Task"], "b": ["Task"]}, multi_call=True)
+        output = 'a[{"Task": "x"}]; b[{"Task": "y"}]'
+        self.assertTrue(multi.matches(output))
+        self.assertEqual(len(parse_actions(output)), 2)
+
+    def test_agent_output_always_parses(self):
+        llm = MockLLM(["I think I should search", 'Finish[{"response": "done"}]'])
+        agent = BaseAgent(
+            name="searcher",
+            role="search",
+            llm=llm,
+            actions=[Search()],
+            logger=BaseAgentLogger(),
+            reasoning_type="act",
+            constrained_decoding=True,
+        )
+        self.assertEqual(sorted(agent.__action_params__()), ["Finish", "Search"])
+        task = TaskPackage(instruction="find agents")
+        self.assertEqual(agent(task), "done")
+        self.assertEqual(llm.num_repaired, 1)
+        act, obs = agent.short_term_memory.get_action_chain(task)[0]
+        self.assertEqual(act.name, "Search")
+
+    def test_manager_constraint_has_team(self):
+        labor = BaseAgent(name="labor", role="work", llm=MockLLM(["x"]), actions=[])
+        manager = ManagerAgent(llm=MockLLM(["x"]), TeamAgents=[labor], multi_call=True)
+        constraint = manager.__action_constraint__()
+        self.assertEqual(constraint.action_params["labor"], ["Task"])
+        self.assertTrue(constraint.matches('labor[{"Task": "x"}]; Finish[{"response": "y"}]'))
+        manager.add_member(BaseAgent(name="other", role="work", llm=MockLLM(["x"]), actions=[]))
+        self.assertIn("other", manager.__action_constraint__().action_params)
+
+    def test_guided_regex_request(self):
+        server = HTTPServer(("127.0.0.1", 0), CompletionHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            llm = LangchainLLM(
+                LLMConfig(
+                    {
+                        "llm_name": "local-model",
+                        "base_url": f"http://127.0.0.1:{server.server_port}/v1",
+                        "api_key": "EMPTY",
+                        "guided_decoding": True,
+                        "max_retries": 0,
+                    }
+                )
+            )
+            constraint = ActionConstraint({"Finish": ["response"]})
+            self.assertEqual(llm.run_constrained("Action:", constraint), 'Finish[{"response": "done"}]')
+            self.assertEqual(CompletionHandler.bodies[-1]["guided_regex"], constraint.regex)
+        finally:
+            server.shutdown()
@@ -0,0 +1,70 @@
+import unittest
+
+from agentlite.actions import FinishAct, ThinkAct
+from agentlite.agents import BaseAgent
+from agentlite.agent_prompts import BasePromptGen, ContextManager
+from agentlite.agent_prompts.ContextManager import ELIDED_OBS, TRUNCATED_MARK
+from agentlite.commons import AgentAct, TaskPackage
+
+
+class TestContextManager(unittest.TestCase):
+    def setUp(self):
+        self.actions = [ThinkAct, FinishAct]
+        self.task = TaskPackage(instruction="read the pages", task_id="pages")
+        self.action_chain = [
+            (AgentAct(name="Search", params={"query": f"page {idx}"}), "x" * 2000)
+            for idx in range(5)
+        ]
+
+    def build_prompt(self, context_manager):
+        return BasePromptGen(agent_role="reader").action_prompt(
+            task=self.task,
+            actions=self.actions,
+            action_chain=self.action_chain,
+            context_manager=context_manager,
+        )
+
+    def test_prompt_within_budget(self):
+        for policy in ["truncate", "elide", "summarize"]:
+            manager = ContextManager(
+                context_len=2048,
+                max_tokens=256,
+                policy=policy,
+                summarizer=lambda obs: "a page of x",
+            )
+            prompt = self.build_prompt(manager)
+            self.assertLessEqual(manager.count(prompt), manager.budget)
+            # the latest observation is kept as it is
+            self.assertIn("Observation: " + "x" * 2000, prompt)
+        self.assertIn(TRUNCATED_MARK, self.build_prompt(ContextManager(2048, policy="truncate")))
+        self.assertIn(ELIDED_OBS, self.build_prompt(ContextManager(2048, policy="elide")))
+
+    def test_oldest_steps_dropped_when_shortening_is_not_enough(self):
+        self.action_chain = [
+            (AgentAct(name="Search", params={"query": f"page {idx}"}), "x" * 2000)
+            for idx in range(40)
+        ]
+        manager = ContextManager(context_len=1600, max_tokens=256, policy="elide")
+        prompt = self.build_prompt(manager)
+        self.assertLessEqual(manager.count(prompt), manager.budget)
+        self.assertNotIn('"page 0"', prompt)
+        self.assertIn(ELIDED_OBS, prompt)
+        self.assertIn('"page 39"', prompt)
+
+    def test_chain_within_budget_unchanged(self):
+        manager = ContextManager(context_len=100000)
+        self.assertIs(manager.fit(100, self.action_chain), self.action_chain)
+        self.assertEqual(self.build_prompt(manager), self.build_prompt(None))
+
+    def test_agent_uses_llm_context_len(self):
+        class LimitedLLM:
+            llm_name = "limited"
+            context_len = 4096
+            max_tokens = 256
+
+        agent = BaseAgent(name="reader", role="reader", llm=LimitedLLM(), actions=[])
+        self.assertEqual(agent.context_manager.budget, 3840)
+
+
+if __name__ == "__main__":
+    unittest.main()
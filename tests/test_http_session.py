@@ -0,0 +1,60 @@
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmark.common import http_session
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    connections = set()
+    failures = 0
+
+    def do_GET(self):
+        StandInHandler.connections.add(self.client_address)
+        if self.path == "/flaky" and StandInHandler.failures < 1:
+            StandInHandler.failures += 1
+            status, body = 503, b"busy"
+        else:
+            status, body = 200, b"ok"
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestHTTPSession(unittest.TestCase):
+    def setUp(self):
+        StandInHandler.connections = set()
+        StandInHandler.failures = 0
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.previous = http_session.set_session(http_session.build_session(backoff_factor=0))
+
+    def tearDown(self):
+        http_session.get_session().close()
+        http_session.set_session(self.previous)
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_keep_alive(self):
+        session = http_session.get_session()
+        for _ in range(5):
+            self.assertEqual(session.get(f"{self.url}/page").text, "ok")
+        self.assertEqual(len(StandInHandler.connections), 1)
+
+    def test_retry_and_default_timeout(self):
+        session = http_session.get_session()
+        self.assertEqual(session.get(f"{self.url}/flaky").status_code, 200)
+        self.assertEqual(session.timeout, http_session.DEFAULT_TIMEOUT)
+
+    def test_injected_session(self):
+        injected = http_session.build_session(pool_size=2)
+        previous = http_session.set_session(injected)
+        self.assertIs(http_session.get_session(), injected)
+        http_session.set_session(previous)
+        injected.close()
@@ -0,0 +1,58 @@
+import threading
+import time
+import unittest
+
+from agentlite.llm.agent_llms import OpenAIChatLLM, clear_llm_backends, get_llm_backend
+from agentlite.llm.http_client import get_http_client
+from agentlite.llm.LLMConfig import LLMConfig
+
+
+class TestLLMBackend(unittest.TestCase):
+    def tearDown(self):
+        clear_llm_backends()
+
+    def test_backend_reused_for_equal_config(self):
+        llm = get_llm_backend(LLMConfig({"llm_name": "gpt-4", "api_key": "EMPTY"}))
+        same = get_llm_backend(LLMConfig({"llm_name": "gpt-4", "api_key": "EMPTY"}))
+        other = get_llm_backend(
+            LLMConfig({"llm_name": "gpt-4", "api_key": "EMPTY", "temperature": 0.0})
+        )
+        self.assertIs(llm, same)
+        self.assertIsNot(llm, other)
+        self.assertIsNot(llm, get_llm_backend(LLMConfig({"llm_name": "gpt-4"}), reuse=False))
+
+    def test_backends_share_http_pool(self):
+        chat = get_llm_backend(LLMConfig({"llm_name": "gpt-4", "api_key": "EMPTY"}))
+        completion = get_llm_backend(
+            LLMConfig({"llm_name": "text-davinci-003", "api_key": "EMPTY"})
+        )
+        pool = get_http_client(16, 60.0)
+        self.assertIs(chat.llm.client._client._client, pool)
+        self.assertIs(completion.llm.client._client._client, pool)
+        self.assertEqual(chat.llm.client._client.max_retries, 3)
+
+    def test_chat_batch_concurrency_is_bounded(self):
+        class SlowChatLLM(OpenAIChatLLM):
+            def __init__(self, llm_config):
+                super().__init__(llm_config)
+                self.running = 0
+                self.peak = 0
+                self.lock = threading.Lock()
+
+            def run(self, prompt: str):
+                with self.lock:
+                    self.running += 1
+                    self.peak = max(self.peak, self.running)
+                time.sleep(0.02)
+                with self.lock:
+                    self.running -= 1
+                return prompt.upper()
+
+        llm = SlowChatLLM(LLMConfig({"api_key": "EMPTY", "max_concurrency": 3}))
+        prompts = [str(idx) for idx in range(12)]
+        self.assertEqual(llm.run_batch(prompts), prompts)
+        self.assertEqual(llm.peak, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import os
+import tempfile
+import unittest
+
+from agentlite.llm.agent_llms import BaseLLM
+from agentlite.llm.CachedLLM import CachedLLM
+from agentlite.llm.LLMConfig import LLMConfig
+
+
+class CountingLLM(BaseLLM):
+    def __init__(self, temperature: float = 0.0):
+        super().__init__(LLMConfig({"temperature": temperature}))
+        self.calls = []
+
+    def run(self, prompt: str):
+        self.calls.append(prompt)
+        return prompt.upper()
+
+
+class TestCachedLLM(unittest.TestCase):
+    def test_memory_hits(self):
+        llm = CachedLLM(CountingLLM())
+        self.assertEqual(llm("abc"), "ABC")
+        self.assertEqual(llm("abc"), "ABC")
+        self.assertEqual(llm.llm.calls, ["abc"])
+        self.assertEqual(llm.stats.as_dict(), {"hits": 1, "misses": 1, "bytes_saved": 3})
+
+    def test_key_includes_sampling_params(self):
+        cold, hot = CountingLLM(0.0), CountingLLM(0.9)
+        self.assertNotEqual(CachedLLM(cold).cache_key("abc"), CachedLLM(hot).cache_key("abc"))
+
+    def test_lru_eviction(self):
+        llm = CachedLLM(CountingLLM(), max_size=1)
+        llm("a"), llm("b"), llm("a")
+        self.assertEqual(llm.llm.calls, ["a", "b", "a"])
+
+    def test_disk_persistence_and_batch(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_path = os.path.join(tmp_dir, "llm_cache.sqlite")
+            CachedLLM(CountingLLM(), cache_path=cache_path).run("a")
+            llm = CachedLLM(CountingLLM(), cache_path=cache_path)
+            self.assertEqual(llm.run_batch(["a", "b"]), ["A", "B"])
+            self.assertEqual(llm.llm.calls, ["b"])
+            self.assertEqual(llm.stats.hits, 1)
+            llm.disk_cache.close()
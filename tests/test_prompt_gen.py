@@ -0,0 +1,117 @@
+import unittest
+
+from agentlite.actions import FinishAct, ThinkAct
+from agentlite.agent_prompts import BasePromptGen, ManagerPromptGen
+from agentlite.agent_prompts.prompt_utils import (
+    PROMPT_TOKENS,
+    format_act_params_example,
+    task_chain_format,
+)
+from agentlite.commons import AgentAct, TaskPackage
+
+
+def full_prompt(prompt_gen: BasePromptGen, task, actions, action_chain) -> str:
+    """the action prompt built from scratch, as before prompts were cached"""
+    prompt = f"""{prompt_gen.instruction}\n{prompt_gen.__role_prompt__(prompt_gen.agent_role)}\n"""
+    prompt += f"""{prompt_gen.__constraint_prompt__()}\n"""
+    prompt += f"""{prompt_gen.__act_doc_prompt__(actions=actions, params_doc_flag=True)}\n"""
+    examples = prompt_gen.__get_examples__("action")
+    if examples:
+        prompt += prompt_gen.__prompt_example__(examples)
+    else:
+        prompt += prompt_gen.__act_format_example__(format_act_params_example(actions))
+    prompt += f"""{PROMPT_TOKENS["execution"]['begin']}\n{task_chain_format(task, action_chain)}\n"""
+    return prompt + "Action:"
+
+
+class TestIncrementalPrompt(unittest.TestCase):
+    def setUp(self):
+        self.actions = [ThinkAct, FinishAct]
+        self.prompt_gen = BasePromptGen(agent_role="tester")
+        self.task = TaskPackage(instruction="count to three", task_id="count")
+
+    def test_prompt_matches_full_rebuild(self):
+        action_chain = []
+        for step in range(4):
+            prompt = self.prompt_gen.action_prompt(
+                task=self.task, actions=self.actions, action_chain=action_chain
+            )
+            self.assertEqual(
+                prompt, full_prompt(self.prompt_gen, self.task, self.actions, action_chain)
+            )
+            act = AgentAct(name="Think", params={"response": f"step {step}"})
+            action_chain.append((act, "OK"))
+
+    def test_add_example_invalidates_prefix(self):
+        self.prompt_gen.action_prompt(task=self.task, actions=self.actions, action_chain=[])
+        example_chain = [(AgentAct(name="Finish", params={"response": "1 2 3"}), "1 2 3")]
+        self.prompt_gen.add_example(TaskPackage(instruction="count"), example_chain)
+        prompt = self.prompt_gen.action_prompt(
+            task=self.task, actions=self.actions, action_chain=[]
+        )
+        self.assertIn("[Example]", prompt)
+        self.assertEqual(prompt, full_prompt(self.prompt_gen, self.task, self.actions, []))
+
+    def test_new_chain_object_rebuilds_history(self):
+        chain = [(AgentAct(name="Think", params={"response": "a"}), "OK")]
+        self.prompt_gen.action_prompt(task=self.task, actions=self.actions, action_chain=chain)
+        other_chain = [(AgentAct(name="Think", params={"response": "b"}), "OK")]
+        prompt = self.prompt_gen.action_prompt(
+            task=self.task, actions=self.actions, action_chain=other_chain
+        )
+        self.assertIn('{"response": "b"}', prompt)
+        self.assertNotIn('{"response": "a"}', prompt)
+        # only the formatted history is cached, the chains are not kept alive
+        for value in self.prompt_gen.history_cache[self.task.task_id]:
+            self.assertIsNot(value, other_chain)
+
+    def test_manager_prefix_follows_team(self):
+        prompt_gen = ManagerPromptGen(agent_role="manager")
+        prompt_a = prompt_gen.action_prompt(
+            task=self.task, actions=self.actions, action_chain=[], labor_agents_doc={"a": "A"}
+        )
+        prompt_b = prompt_gen.action_prompt(
+            task=self.task, actions=self.actions, action_chain=[], labor_agents_doc={"b": "B"}
+        )
+        self.assertIn("'a': 'A'", prompt_a)
+        self.assertIn("'b': 'B'", prompt_b)
+
+
+class TestExampleRetrieval(unittest.TestCase):
+    def test_top_k_examples(self):
+        prompt_gen = BasePromptGen(agent_role="tester")
+        topics = ["buy a red shirt", "search the weather in paris", "count to ten"]
+        for topic in topics:
+            example_task = TaskPackage(instruction=topic)
+            chain = [(AgentAct(name="Finish", params={"response": topic}), topic)]
+            prompt_gen.add_example(example_task, chain)
+        prompt_gen.set_example_retrieval(top_k=1)
+        task = TaskPackage(instruction="what is the weather in paris", task_id="weather")
+        prompt = prompt_gen.action_prompt(task=task, actions=[FinishAct], action_chain=[])
+        self.assertIn("search the weather in paris", prompt)
+        self.assertNotIn("buy a red shirt", prompt)
+        self.assertNotIn("count to ten", prompt)
+        # examples added later are indexed too
+        prompt_gen.add_example(
+            TaskPackage(instruction="buy blue shoes"),
+            [(AgentAct(name="Finish", params={"response": "shoes"}), "shoes")],
+        )
+        task = TaskPackage(instruction="buy shoes in blue", task_id="shoes")
+        prompt = prompt_gen.action_prompt(task=task, actions=[FinishAct], action_chain=[])
+        self.assertIn("buy blue shoes", prompt)
+        self.assertNotIn("weather", prompt.split("Task:buy shoes in blue")[0])
+
+    def test_retrieval_keeps_one_static_prefix(self):
+        prompt_gen = BasePromptGen(agent_role="tester", max_cached_prefixes=2)
+        for idx in range(12):
+            prompt_gen.add_example(
+                TaskPackage(instruction=f"topic {idx}"),
+                [(AgentAct(name="Finish", params={"response": str(idx)}), str(idx))],
+            )
+        prompt_gen.set_example_retrieval(top_k=2)
+        for idx in range(12):
+            task = TaskPackage(instruction=f"about topic {idx}", task_id=f"task {idx}")
+            prompt_gen.action_prompt(task=task, actions=[FinishAct], action_chain=[])
+        self.assertEqual(prompt_gen.max_cached_prefixes, 2)
+        self.assertEqual(len(prompt_gen.prefix_cache), 1)
+        self.assertGreater(len(prompt_gen.examples_cache), 1)
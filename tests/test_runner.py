@@ -0,0 +1,81 @@
+import os
+import tempfile
+import unittest
+
+from benchmark.common.runner import (
+    load_manifest,
+    run_parallel,
+    seed_from_results_csv,
+    write_results_csv,
+)
+
+INTERRUPTED = set()
+
+
+def evaluate(task_id: int):
+    if task_id in INTERRUPTED:
+        raise RuntimeError("interrupted")
+    return [task_id / 10, f"task {task_id}", "done"]
+
+
+def csv_row(task_id, result):
+    reward, task, response = result
+    return task_id, task, reward, response
+
+
+class TestResume(unittest.TestCase):
+    def tearDown(self):
+        INTERRUPTED.clear()
+
+    def test_resumed_run_keeps_earlier_rows(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            shard_dir = os.path.join(tmp_dir, "shards")
+            csv_path = os.path.join(tmp_dir, "results.csv")
+            INTERRUPTED.update([2, 3])
+            results = run_parallel(evaluate, list(range(5)), output_dir=shard_dir)
+            self.assertEqual(write_results_csv(csv_path, results, csv_row), 3)
+            INTERRUPTED.clear()
+            calls = []
+            resumed = run_parallel(
+                lambda task_id: calls.append(task_id) or evaluate(task_id),
+                list(range(5)),
+                output_dir=shard_dir,
+            )
+            write_results_csv(csv_path, resumed, csv_row)
+            self.assertEqual(calls, [2, 3])
+            self.assertEqual(sorted(load_manifest(shard_dir)), list(range(5)))
+            with open(csv_path, "r") as f:
+                rows = [line.rstrip("\n").split("\t") for line in f]
+            self.assertEqual(
+                rows, [[str(idx), f"task {idx}", str(idx / 10), "done"] for idx in range(5)]
+            )
+            self.assertFalse(os.path.exists(csv_path + ".tmp"))
+
+    def test_legacy_results_are_imported(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            shard_dir = os.path.join(tmp_dir, "shards")
+            csv_path = os.path.join(tmp_dir, "results.csv")
+            with open(csv_path, "w") as f:  # appended by the former evaluators
+                f.write("0\ttask 0\t0.0\tdone\n1\ttask 1\t0.1\tfirst line\nsecond line\n")
+
+            def row_result(fields):
+                return [float(fields[2]), fields[1], fields[3]]
+
+            self.assertEqual(seed_from_results_csv(shard_dir, csv_path, row_result), 2)
+            calls = []
+            results = run_parallel(
+                lambda task_id: calls.append(task_id) or evaluate(task_id),
+                list(range(3)),
+                output_dir=shard_dir,
+            )
+            self.assertEqual(calls, [2])
+            self.assertEqual(results[1], (1, [0.1, "task 1", "first line\nsecond line"]))
+            write_results_csv(csv_path, results, csv_row)
+            # the manifest exists now, the rebuilt file is not imported again
+            self.assertEqual(seed_from_results_csv(shard_dir, csv_path, row_result), 0)
+            with open(csv_path, "r") as f:
+                self.assertEqual(f.read().count("\t"), 9)
+
+
+if __name__ == "__main__":
+    unittest.main()
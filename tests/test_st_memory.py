@@ -0,0 +1,93 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from agentlite.agents import BaseAgent
+from agentlite.commons import AgentAct, TaskPackage
+from agentlite.llm.agent_llms import BaseLLM
+from agentlite.llm.LLMConfig import LLMConfig
+from agentlite.logging.base import BaseAgentLogger
+from agentlite.memory.AgentSTMemory import BoundedAgentSTMemory
+
+
+class FinishLLM(BaseLLM):
+    def __init__(self):
+        super().__init__(LLMConfig({}))
+
+    def run(self, prompt: str):
+        return f"Finish[{json.dumps({'response': 'done'})}]"
+
+
+def run_task(memory: BoundedAgentSTMemory, task_id: str, completion: str = "completed"):
+    task = TaskPackage(instruction=f"task {task_id}", task_id=task_id)
+    memory.add_new_task(task)
+    memory.add_act_obs(task, AgentAct(name="Search", params={"query": task_id}), "x" * 100)
+    task.completion = completion
+    memory.add_act_obs(task, AgentAct(name="Finish", params={"response": "done"}), "done")
+    return task
+
+
+class TestBoundedSTMemory(unittest.TestCase):
+    def test_lru_eviction(self):
+        memory = BoundedAgentSTMemory("agent", max_tasks=2)
+        running = TaskPackage(instruction="running", task_id="running")
+        memory.add_new_task(running)
+        tasks = [run_task(memory, str(idx)) for idx in range(4)]
+        memory.get_action_chain(tasks[2])  # tasks[3] becomes the least recently used
+        memory.add_new_task(TaskPackage(instruction="new", task_id="new"))
+        self.assertEqual(len(memory), 4)
+        self.assertIn("running", memory)
+        self.assertIn("2", memory)
+        self.assertIn("3", memory)
+        self.assertNotIn("0", memory)
+        with self.assertRaises(KeyError):
+            memory.get_action_chain(tasks[0])
+
+    def test_ttl(self):
+        memory = BoundedAgentSTMemory("agent", max_tasks=10, ttl=0.05)
+        run_task(memory, "old")
+        time.sleep(0.1)
+        run_task(memory, "new")
+        self.assertNotIn("old", memory)
+        self.assertIn("new", memory)
+
+    def test_spill(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            memory = BoundedAgentSTMemory(
+                "agent", max_tasks=1, spill_path=os.path.join(tmp_dir, "memory.db")
+            )
+            tasks = [run_task(memory, str(idx)) for idx in range(5)]
+            self.assertEqual(len(memory), 1)
+            self.assertIn("0", memory)
+            chain = memory.get_action_chain(tasks[0])
+            self.assertEqual([act.name for act, obs in chain], ["Search", "Finish"])
+            self.assertEqual(chain[0][0].params, {"query": "0"})
+            self.assertEqual(chain[0][1], "x" * 100)
+            self.assertEqual(memory.get_task("0").completion, "completed")
+            self.assertEqual(len(memory), 1)
+            memory.close()
+
+    def test_rerun_task_is_not_evicted(self):
+        memory = BoundedAgentSTMemory("agent", max_tasks=1)
+        task_a = TaskPackage(instruction="a", task_id="a")
+        task_b = TaskPackage(instruction="b", task_id="b")
+        memory.add_new_task(task_a)
+        memory.end_task(task_a)  # stopped unfinished
+        memory.add_new_task(task_a)  # run again
+        memory.add_new_task(task_b)
+        memory.end_task(task_b)
+        self.assertEqual(memory.get_action_chain(task_a), [])
+        self.assertIn("b", memory)
+
+    def test_ended_tasks_are_evicted(self):
+        agent = BaseAgent(
+            name="finisher", role="finish", llm=FinishLLM(), actions=[], logger=BaseAgentLogger()
+        )
+        agent.max_exec_steps = 0  # every task stops unfinished
+        agent.__add_st_memory__(BoundedAgentSTMemory(agent.id, max_tasks=1))
+        for idx in range(3):
+            agent(TaskPackage(instruction="finish", task_id=str(idx)))
+        self.assertEqual(len(agent.short_term_memory), 1)
+        self.assertIn("2", agent.short_term_memory)
@@ -0,0 +1,144 @@
+import json
+import unittest
+
+from agentlite.agents import BaseAgent, ManagerAgent
+from agentlite.commons import TaskPackage, TaskRegistry
+from agentlite.llm.agent_llms import BaseLLM
+from agentlite.llm.LLMConfig import LLMConfig
+from agentlite.logging.base import BaseAgentLogger
+
+
+class FinishLLM(BaseLLM):
+    def __init__(self, outputs: list = None):
+        super().__init__(LLMConfig({}))
+        self.outputs = list(outputs or [])
+
+    def run(self, prompt: str):
+        if self.outputs:
+            return self.outputs.pop(0)
+        return f"Finish[{json.dumps({'response': 'done'})}]"
+
+
+class TestTaskIdentity(unittest.TestCase):
+    def test_default_ids_are_unique(self):
+        tasks = [TaskPackage(instruction=f"task {idx}") for idx in range(1000)]
+        self.assertEqual(len({task.task_id for task in tasks}), len(tasks))
+        self.assertEqual([task.task_id for task in tasks], sorted(task.task_id for task in tasks))
+        self.assertIsInstance(tasks[0].timestamp, str)
+
+    def test_default_ids_keep_separate_chains(self):
+        agent = BaseAgent(
+            name="finisher", role="finish", llm=FinishLLM(), actions=[], logger=BaseAgentLogger()
+        )
+        first = TaskPackage(instruction="first")
+        second = TaskPackage(instruction="second")
+        agent(first)
+        agent(second)
+        self.assertEqual(len(agent.short_term_memory.get_action_chain(first)), 1)
+        self.assertEqual(len(agent.short_term_memory.get_action_chain(second)), 1)
+
+
+class TestTaskRegistry(unittest.TestCase):
+    def test_indexes(self):
+        registry = TaskRegistry()
+        tasks = [
+            TaskPackage(instruction=str(idx), creator="manager", executor=f"labor_{idx % 2}")
+            for idx in range(4)
+        ]
+        for task in tasks:
+            registry.register(task)
+        self.assertEqual(len(registry.get_by_creator("manager")), 4)
+        self.assertEqual(len(registry.get_by_executor("labor_0")), 2)
+        self.assertEqual(len(registry.active_tasks()), 4)
+        tasks[0].completion = "completed"
+        registry.update(tasks[0])
+        self.assertEqual(registry.get_by_status("completed"), [tasks[0]])
+        self.assertEqual(len(registry.active_tasks()), 3)
+        registry.remove(tasks[1].task_id)
+        self.assertNotIn(tasks[1].task_id, registry)
+        self.assertEqual(len(registry.get_by_executor("labor_1")), 1)
+
+    def test_tasks_are_not_kept_alive(self):
+        registry = TaskRegistry()
+        task = TaskPackage(instruction="dropped", creator="manager")
+        task_id = task.task_id
+        registry.register(task)
+        task.completion = "completed"
+        registry.update(task)
+        del task
+        self.assertIsNone(registry.get(task_id))
+        self.assertEqual(registry.get_by_creator("manager"), [])
+        self.assertEqual(registry.get_record(task_id).status, "completed")
+        self.assertIn(task_id, registry)
+
+    def test_finished_tasks_are_bounded(self):
+        registry = TaskRegistry(max_finished=2)
+        running = TaskPackage(instruction="running")
+        registry.register(running)
+        for idx in range(5):
+            registry.register(TaskPackage(instruction=str(idx), completion="completed"))
+        self.assertEqual(len(registry), 3)
+        self.assertIn(running.task_id, registry)
+
+    def test_agents_register_tasks(self):
+        registry = TaskRegistry()
+        labor = BaseAgent(
+            name="labor", role="finish", llm=FinishLLM(), actions=[], logger=BaseAgentLogger()
+        )
+        manager = ManagerAgent(
+            llm=FinishLLM(['labor[{"Task": "finish it"}]']),
+            TeamAgents=[labor],
+            logger=BaseAgentLogger(),
+        )
+        labor.task_registry = registry
+        manager.task_registry = registry
+        task = TaskPackage(instruction="delegate")
+        manager(task)
+        sub_tasks = registry.get_by_creator(manager.id)
+        self.assertEqual(len(sub_tasks), 1)
+        self.assertEqual(sub_tasks[0].executor, labor.id)
+        self.assertNotEqual(sub_tasks[0].task_id, task.task_id)
+        self.assertEqual(len(registry.get_by_status("completed")), 2)
+
+    def test_active_tasks_are_bounded(self):
+        registry = TaskRegistry(max_active=2)
+        tasks = [TaskPackage(instruction=str(idx)) for idx in range(4)]
+        for task in tasks:
+            registry.register(task)
+        active = sorted(task.task_id for task in registry.active_tasks())
+        self.assertEqual(active, [task.task_id for task in tasks[2:]])
+
+    def test_unfinished_runs_are_terminal(self):
+        class FailingLLM(BaseLLM):
+            def __init__(self):
+                super().__init__(LLMConfig({}))
+
+            def run(self, prompt: str):
+                raise RuntimeError("llm down")
+
+        registry = TaskRegistry()
+        agent = BaseAgent(
+            name="looper",
+            role="loop",
+            llm=FinishLLM(["Think[{}]"] * 3),
+            actions=[],
+            logger=BaseAgentLogger(),
+        )
+        agent.max_exec_steps = 2
+        agent.task_registry = registry
+        stopped = TaskPackage(instruction="loop")
+        agent(stopped)
+        self.assertEqual(registry.get_by_status("incomplete"), [stopped])
+        self.assertEqual(stopped.completion, "active")
+        agent.llm = FailingLLM()
+        failed = TaskPackage(instruction="fail")
+        with self.assertRaises(RuntimeError):
+            agent(failed)
+        batch_failed = TaskPackage(instruction="fail in batch")
+        with self.assertRaises(RuntimeError):
+            agent.run_batch([batch_failed])
+        self.assertEqual(
+            sorted(task.task_id for task in registry.get_by_status("failed")),
+            [failed.task_id, batch_failed.task_id],
+        )
+        self.assertEqual(registry.active_tasks(), [])
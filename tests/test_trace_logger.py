@@ -0,0 +1,129 @@
+import gzip
+import json
+import os
+import tempfile
+import unittest
+
+from agentlite.agents import BaseAgent, ManagerAgent
+from agentlite.commons import TaskPackage
+from agentlite.llm.agent_llms import BaseLLM
+from agentlite.llm.LLMConfig import LLMConfig
+from agentlite.logging import JSONLTraceSink, TraceLogger
+from agentlite.logging.base import BaseAgentLogger
+
+
+class ScriptedLLM(BaseLLM):
+    """return the scripted outputs one by one"""
+
+    def __init__(self, outputs: list):
+        super().__init__(LLMConfig({}))
+        self.outputs = list(outputs)
+
+    def run(self, prompt: str):
+        return self.outputs.pop(0)
+
+
+class TestTraceLogger(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def run_manager(self, sink: JSONLTraceSink):
+        logger = TraceLogger(sink=sink)
+        member = BaseAgent(
+            name="helper",
+            role="helper role",
+            llm=ScriptedLLM(['Finish[{"response": "hi"}]']),
+            actions=[],
+            logger=logger,
+        )
+        manager = ManagerAgent(
+            llm=ScriptedLLM(
+                ['helper[{"Task": "greet"}]', 'Finish[{"response": "done"}]']
+            ),
+            TeamAgents=[member],
+            logger=logger,
+        )
+        manager(TaskPackage(instruction="greet", task_id="root"))
+        sink.close()
+        return manager, member
+
+    def test_records_link_sub_tasks(self):
+        path = os.path.join(self.tmp_dir.name, "trace.jsonl")
+        manager, member = self.run_manager(JSONLTraceSink(path))
+        with open(path) as f:
+            records = [json.loads(line) for line in f]
+        created = [r for r in records if r["event"] == "create_task"]
+        self.assertEqual(len(created), 1)
+        self.assertEqual(created[0]["parent_task_id"], "root")
+        self.assertEqual(created[0]["creator"], manager.id)
+        self.assertEqual(created[0]["executor"], member.id)
+        child_id = created[0]["task_id"]
+        self.assertNotEqual(child_id, "root")
+        child_events = [r["event"] for r in records if r["task_id"] == child_id]
+        self.assertIn("get_llm_output", child_events)
+        prompts = [
+            r for r in records if r["event"] == "get_prompt" and r["task_id"] == "root"
+        ]
+        self.assertEqual([r["step"] for r in prompts], [0, 1])
+        self.assertTrue(all(r["prompt_chars"] > 0 for r in prompts))
+        timestamps = [r["ts"] for r in records]
+        self.assertEqual(timestamps, sorted(timestamps))
+
+    def test_gzip_sink(self):
+        path = os.path.join(self.tmp_dir.name, "trace.jsonl.gz")
+        self.run_manager(JSONLTraceSink(path))
+        with gzip.open(path, "rt") as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(records[-1]["event"], "end_execute")
+        self.assertEqual(records[-1]["completion"], "completed")
+
+    def test_loggers_with_old_hook_signatures(self):
+        class OldLogger(BaseAgentLogger):
+            """hooks written before they took the task context"""
+
+            def __init__(self):
+                super().__init__()
+                self.events = []
+
+            def take_action(self, action, agent_name: str, step_idx: int):
+                self.events.append(("take_action", action.name, step_idx))
+
+            def get_obs(self, obs: str):
+                self.events.append(("get_obs", obs))
+
+            def get_prompt(self, prompt):
+                self.events.append(("get_prompt",))
+
+            def get_llm_output(self, output: str):
+                self.events.append(("get_llm_output", output))
+
+        old_logger = OldLogger()
+        path = os.path.join(self.tmp_dir.name, "trace.jsonl")
+        sink = JSONLTraceSink(path)
+        for logger in [old_logger, TraceLogger(sink=sink, logger=old_logger)]:
+            agent = BaseAgent(
+                name="finisher",
+                role="finish",
+                llm=ScriptedLLM(['Finish[{"response": "hi"}]']),
+                actions=[],
+                logger=logger,
+            )
+            self.assertEqual(agent(TaskPackage(instruction="greet")), "hi")
+        sink.close()
+        self.assertEqual(old_logger.events[:4], old_logger.events[4:])
+        self.assertEqual(
+            old_logger.events[:4],
+            [
+                ("get_prompt",),
+                ("get_llm_output", 'Finish[{"response": "hi"}]'),
+                ("take_action", "Finish", 0),
+                ("get_obs", "hi"),
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+from agentlite.agents import BaseAgent, ManagerAgent
+from agentlite.commons import TaskPackage
+from agentlite.llm.agent_llms import BaseLLM
+from agentlite.llm.LLMConfig import LLMConfig
+from agentlite.logging.base import BaseAgentLogger
+from agentlite.tracing import InMemorySpanCollector, JSONLSpanExporter, Tracer
+
+
+class ScriptedLLM(BaseLLM):
+    """return the scripted outputs one by one"""
+
+    def __init__(self, outputs: list):
+        super().__init__(LLMConfig({}))
+        self.outputs = list(outputs)
+
+    def run(self, prompt: str):
+        return self.outputs.pop(0)
+
+
+def finish(response: str) -> str:
+    return f"Finish[{json.dumps({'response': response})}]"
+
+
+def build_manager(tracer: Tracer) -> ManagerAgent:
+    team = [
+        BaseAgent(
+            name=name,
+            role=f"{name} role",
+            llm=ScriptedLLM([finish(f"{name} says hi")]),
+            actions=[],
+            logger=BaseAgentLogger(),
+            tracer=tracer,
+        )
+        for name in ["a", "b"]
+    ]
+    return ManagerAgent(
+        llm=ScriptedLLM(['a[{"Task": "greet"}]; b[{"Task": "greet"}]', finish("done")]),
+        TeamAgents=team,
+        logger=BaseAgentLogger(),
+        multi_call=True,
+        tracer=tracer,
+    )
+
+
+class TestTracing(unittest.TestCase):
+    def check_hierarchy(self, collector: InMemorySpanCollector, manager: ManagerAgent):
+        roots = collector.roots()
+        self.assertEqual(len(roots), 1)
+        manager_run = roots[0]
+        self.assertEqual(manager_run.name, "agent-run")
+        self.assertEqual(manager_run.attributes["agent"], manager.name)
+        self.assertEqual(manager_run.attributes["steps"], 2)
+        steps = collector.children(manager_run)
+        self.assertEqual([step.name for step in steps], ["step", "step"])
+        names = sorted(span.name for span in collector.children(steps[0]))
+        self.assertEqual(names, ["action-call", "action-call", "llm-call"])
+        for member in manager.team:
+            call = collector.get_spans("action-call", action=member.name)[0]
+            self.assertEqual(call.parent_id, steps[0].span_id)
+            member_run = collector.children(call)[0]
+            self.assertEqual(member_run.name, "agent-run")
+            self.assertEqual(member_run.attributes["creator"], manager.id)
+            self.assertEqual(member_run.attributes["executor"], member.id)
+            self.assertEqual(member_run.attributes["task_id"], call.attributes["member_task_id"])
+        self.assertEqual({span.trace_id for span in collector.get_spans()}, {manager_run.trace_id})
+
+    def test_manager_labor_nesting(self):
+        collector = InMemorySpanCollector()
+        manager = build_manager(Tracer([collector]))
+        manager(TaskPackage(instruction="greet everyone", task_id="trace"))
+        self.check_hierarchy(collector, manager)
+
+    def test_async_nesting(self):
+        collector = InMemorySpanCollector()
+        manager = build_manager(Tracer([collector]))
+        asyncio.run(manager.acall(TaskPackage(instruction="greet everyone", task_id="atrace")))
+        self.check_hierarchy(collector, manager)
+
+    def test_batch_spans(self):
+        collector = InMemorySpanCollector()
+        agent = BaseAgent(
+            name="batcher",
+            role="answer",
+            llm=ScriptedLLM([finish("1"), finish("2")]),
+            actions=[],
+            logger=BaseAgentLogger(),
+            tracer=Tracer([collector]),
+        )
+        tasks = [TaskPackage(instruction=f"task {idx}", task_id=str(idx)) for idx in range(2)]
+        agent.run_batch(tasks)
+        for task in tasks:
+            run = collector.get_spans("agent-run", task_id=task.task_id)[0]
+            self.assertIsNone(run.parent_id)
+            step = collector.children(run)[0]
+            names = [span.name for span in collector.children(step)]
+            self.assertEqual(sorted(names), ["action-call", "llm-call"])
+
+    def test_failed_batch_spans(self):
+        collector = InMemorySpanCollector()
+        stats = []
+        agent = BaseAgent(
+            name="batcher",
+            role="answer",
+            llm=ScriptedLLM([]),
+            actions=[],
+            logger=BaseAgentLogger(),
+            tracer=Tracer([collector]),
+        )
+        agent.add_stats_hook(stats.append)
+        tasks = [TaskPackage(instruction=f"task {idx}", task_id=str(idx)) for idx in range(3)]
+        with self.assertRaises(IndexError):
+            agent.run_batch(tasks, max_concurrency=2)
+        spans = collector.get_spans()
+        names = sorted(span.name for span in spans)
+        self.assertEqual(names, ["agent-run"] * 2 + ["llm-call"] * 2 + ["step"] * 2)
+        self.assertEqual({span.status for span in spans}, {"error"})
+        self.assertEqual(sorted(run.task_id for run in stats), ["0", "1"])
+
+    def test_file_exporter(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "spans.jsonl")
+            tracer = Tracer([JSONLSpanExporter(path)])
+            with tracer.span("agent-run", attributes={"agent": "a"}) as run:
+                with tracer.span("step"):
+                    pass
+            tracer.shutdown()
+            with open(path) as f:
+                records = [json.loads(line) for line in f]
+        self.assertEqual([record["name"] for record in records], ["step", "agent-run"])
+        self.assertEqual(records[0]["parent_id"], run.span_id)
+        self.assertEqual(records[1]["attributes"], {"agent": "a"})
+        self.assertGreaterEqual(records[1]["duration"], records[0]["duration"])
@@ -0,0 +1,78 @@
+import json
+import os
+import sys
+import unittest
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "webshop_pages")
+sys.path.append(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "benchmark", "webshop")
+)
+
+from webshop_env import Webshop  # noqa: E402
+from webshop_html import extract_observation  # noqa: E402
+
+
+def read_page(name: str) -> str:
+    with open(os.path.join(PAGES_DIR, f"{name}.html"), encoding="utf-8") as f:
+        return f.read()
+
+
+class PageResponse:
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+
+class PageSession:
+    """stand-in http session serving a saved page and recording the requested urls"""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.urls = []
+
+    def get(self, url, headers=None):
+        self.urls.append(url)
+        return PageResponse(read_page(self.name))
+
+
+def available_parsers() -> list:
+    parsers = ["html.parser"]
+    try:
+        import lxml  # noqa: F401
+
+        parsers.append("lxml")
+    except ImportError:
+        pass
+    return parsers
+
+
+class TestWebshopHTML(unittest.TestCase):
+    """the observations must stay byte-identical to the golden outputs of the former
+    BeautifulSoup findAll pipeline"""
+
+    @classmethod
+    def setUpClass(cls):
+        with open(os.path.join(PAGES_DIR, "golden.json"), encoding="utf-8") as f:
+            cls.golden = json.load(f)
+
+    def test_webshop_text(self):
+        for name, expected in self.golden.items():
+            with self.subTest(page=name):
+                env = Webshop(http_session=PageSession(name))
+                observation, info = env.webshop_text(session="fixed_0", **expected["kwargs"])
+                self.assertEqual(observation, expected["observation"])
+                self.assertEqual(info, expected["info"])
+                self.assertEqual(env.reward, expected["reward"])
+                self.assertEqual(env.sub_reward, expected["sub_reward"])
+
+    def test_parser_backends(self):
+        for parser in available_parsers():
+            for name, expected in self.golden.items():
+                with self.subTest(parser=parser, page=name):
+                    session = PageSession(name)
+                    env = Webshop(http_session=session)
+                    env.webshop_text(session="fixed_0", **expected["kwargs"])
+                    observation, info, _ = extract_observation(
+                        read_page(name), session.urls[0], expected["kwargs"]["page_type"], parser
+                    )
+                    self.assertEqual(observation, expected["observation"])
+                    self.assertEqual(info, expected["info"])